@@ -1,139 +1,69 @@
 import os
-import boto3
-import requests
-import re
+import click
+import csv
 import json
-from bs4 import BeautifulSoup
+import logging
 from dotenv import load_dotenv
-from flask import Flask, request, jsonify, send_from_directory
-from flask_cors import CORS
-from flask_migrate import Migrate
-from flask_sqlalchemy import SQLAlchemy
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token
-from werkzeug.utils import secure_filename
+from flask import Blueprint, Flask, Response, current_app, request, jsonify, send_from_directory, stream_with_context
+from flask.cli import with_appcontext
 from datetime import datetime
 from uuid import UUID
-from huggingface_hub import InferenceClient
+from config import engine_options, env_bool
 
 
-# Load env
+# Load env before the local modules below read their settings from it.
 load_dotenv()
-GOOGLE_CLIENT_ID = os.environ.get("GOOGLE_CLIENT_ID")
 
-# Flask App Setup
-app = Flask(__name__)
-app.secret_key = os.environ.get("FLASK_SECRET_KEY")
+from extensions import (
+    db, cors, new_hf_client, get_s3_client, get_google_request, get_token_counter, get_page_fetcher,
+)
+from models import User, JobApplication, Resume, ResumeText
+from pagination import CursorError, parse_limit, parse_datetime_param, keyset_page
+from search import search_applications
+from dedupe import index_applications, remove_applications, touches_content, find_duplicates, duplicate_clusters, rebuild_signatures
+from insights import rollup_buckets, record_change, record_changes, get_insights, rebuild_rollups
+from timeline import record_status_changes, timeline_page, application_timeline, timeline_summary
+from parse_cache import parse_cache, url_key, text_key
+from listing_cache import listing_cache
+from log_config import configure_logging
+from metrics import init_app as init_metrics, outbound
+from llm_extraction import ExtractionService, empty_fields, LLM_TIMEOUT_SECONDS
+from parse_tasks import ParseTaskQueue, QueueFull
+from auth import UserCache, issue_session_token, load_session_token, SESSION_TOKEN_MAX_AGE
+from bulk_io import (
+    ImportFormatError, detect_format, iter_upload_rows, import_applications, export_applications, validate_update,
+)
+from resume_index import ResumeIndexer, backfill as backfill_resume_index, clear_resume_index, index_terms, match_resumes
+from resume_uploads import (
+    SignedUrlCache, UploadError, resume_key, resume_url, load_upload_token, start_upload, complete_upload, abort_upload,
+)
 
-CORS(app, supports_credentials=True, resources={r"/*": {"origins": [
-    "http://localhost:3000",
-    "http://35.175.218.182:3000",
-    "https://careervaultapp.com"
-]}}, allow_headers=["Content-Type", "Authorization", "X-User-Email"])
-
-HF_TOKEN = os.environ.get("API_TOKEN")
 HF_CHAT_MODEL = "meta-llama/Llama-3.1-8B-Instruct"  # use latest model name!
-HF_CLIENT = InferenceClient(provider="hf-inference", api_key=HF_TOKEN)
-
-print("HF chat client ready:", bool(HF_TOKEN))
 
-# DB Setup
-app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get("DATABASE_URL")
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db = SQLAlchemy(app)
-migrate = Migrate(app, db)
-
-from models import User, JobApplication, Resume
+log = logging.getLogger(__name__)
+api = Blueprint("api", __name__)
+llm_extraction = ExtractionService(HF_CHAT_MODEL)
 
 
 def extract_job_posting_fields(text: str) -> dict:
-    """Send job post text to LLaMA 3 chat model and extract structured fields."""
+    """Extract structured fields from job post text with the chat model; empty fields on failure."""
     try:
-        prompt = f"""
-        You are a job posting parser.
-
-        Extract the following fields from this job post and RETURN THEM AS VALID JSON ONLY:
-
-        - title
-        - company
-        - location (if multiple return as single string)
-        - job_type (Full-Time, Part-Time, Contract, Internship)
-        - description (as a single string — include Responsibilities, Requirements, Qualifications as separate, organized sections in the text)
-
-        RULES:
-
-        - DO NOT return any explanations.
-        - DO NOT write any code.
-        - DO NOT wrap in triple backticks.
-        - JUST return the JSON object.
-
-        ### Example Outputs:
-
-        {{
-            "title": "Software Engineer",
-            "company": "Amazon",
-            "location": "San Francisco, CA, USA; Bellevue, WA, USA; San Diego, CA, USA",
-            "job_type": "Full-Time",
-            "description": "Responsibilities:\\n- Develop and maintain web applications\\n- Collaborate with cross-functional teams\\n\\nRequirements:\\n- 3+ years experience in software development\\n- Proficiency in Python and JavaScript\\n\\nQualifications:\\n- Bachelor's degree in Computer Science or related field"
-        }}
-        
-        {{
-            "title": "Software Developer",
-            "company": "CompanyName",
-            "location": "San Diego, CA, USA",
-            "job_type": "Internship",
-            "description": "Responsibilities:\\n- Develop and maintain web applications\\n- Collaborate with cross-functional teams\\n\\nRequirements:\\n- 3+ years experience in software development\\n- Proficiency in Python and JavaScript\\n\\nQualifications:\\n- Bachelor's degree in Computer Science or related field"
-        }}
-
-        Now here is the job post text to parse:
-
-        ---
-        {text}
-        ---
-        """
-
-        completion = HF_CLIENT.chat.completions.create(
-            model=HF_CHAT_MODEL,
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-        )
-
-        response_text = completion.choices[0].message.content
-        print("LLAMA-3 raw response:", response_text)
-
-        # Extract JSON block safely (handle ```json or plain)
-        json_match = re.search(r"```json\s*(\{.*?\})\s*```", response_text, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(1)
-        else:
-            # fallback: try to parse entire response if no code block
-            json_str = response_text.strip()
-
-        print("Extracted JSON string:", json_str)
-
-        # Parse JSON
-        parsed = json.loads(json_str)
-        return parsed
-
+        return llm_extraction.extract(new_hf_client, text)
     except Exception as e:
-        print("LLaMA extraction error:", e)
-        return {
-            "title": None,
-            "company": None,
-            "location": None,
-            "job_type": None,
-            "description": None,
-        }
+        log.warning("LLM extraction failed", extra={"error": str(e)})
+        return empty_fields()
 
 
 def clean_text(text):
     return ' '.join(text.split())
 
 
+parse_tasks = ParseTaskQueue()
+user_cache = UserCache()
+signed_urls = SignedUrlCache()
+resume_indexer = ResumeIndexer()
+
+
 # Helpers
 
 def get_user_by_email(email):
@@ -150,31 +80,112 @@ def get_or_create_user_by_email(email, name=None, profile_pic=None):
 
 
 def get_current_user():
+    """Resolve the caller from a session token, or else from X-User-Email.
+
+    A valid "Authorization: Bearer <session token>" needs no DB lookup; the
+    header path is served from user_cache when possible. A token that has
+    expired (or was signed with a rotated FLASK_SECRET_KEY) is a 401, never
+    a fallback to the header: clients get a new one from /api/session-token.
+    """
+    auth_header = request.headers.get("Authorization", "")
+    if auth_header.startswith("Bearer ") and current_app.secret_key:
+        user = load_session_token(current_app.secret_key, auth_header[len("Bearer "):].strip())
+        if user:
+            return user, None, None
+        return None, jsonify({"error": "Invalid or expired session token"}), 401
+
     user_email = request.headers.get("X-User-Email")
     if not user_email:
         return None, jsonify({"error": "Missing X-User-Email header"}), 400
 
+    user = user_cache.get(user_email)
+    if user:
+        return user, None, None
+
     user = get_user_by_email(user_email)
     if not user:
         return None, jsonify({"error": "User not found"}), 401
 
-    return user, None, None
+    return user_cache.set(user_email, user), None, None
+
+
+APPLICATION_SORT_COLUMNS = {
+    "applied_at": JobApplication.applied_at,
+    "updated_at": JobApplication.updated_at,
+}
+
+
+def serialize_application(app):
+    return {
+        "id": app.id,
+        "title": app.title,
+        "company": app.company_name,
+        "job_type": app.job_type,
+        "location": app.location,
+        "status": app.status,
+        "applied_at": app.applied_at.isoformat() + "Z",
+        "application_url": app.application_url,
+        "resume_used": str(app.resume_used) if app.resume_used else None,
+        "application_method": app.application_method
+    }
+
+
+def serialize_duplicates(duplicates):
+    """[(id, similarity, reason)] -> JSON rows with enough context to show the user."""
+    if not duplicates:
+        return []
+    apps = {
+        row.id: row for row in db.session.query(
+            JobApplication.id, JobApplication.title, JobApplication.company_name, JobApplication.applied_at,
+        ).filter(JobApplication.id.in_([d[0] for d in duplicates]))
+    }
+    return [
+        {
+            "id": app_id,
+            "title": apps[app_id].title,
+            "company": apps[app_id].company_name,
+            "applied_at": apps[app_id].applied_at.isoformat() + "Z",
+            "similarity": round(score, 2),
+            "reason": reason,
+        }
+        for app_id, score, reason in duplicates if app_id in apps
+    ]
+
+
+def update_application(app, data):
+    """Apply PATCH-style field updates from a request body to an application."""
+    app.title = data.get("title", app.title)
+    app.company_name = data.get("company") or data.get("company_name") or app.company_name
+    app.job_type = data.get("job_type", app.job_type)
+    app.location = data.get("location", app.location)
+    app.application_url = data.get("application_url", app.application_url)
+    app.description = data.get("description", app.description)
+    app.status = data.get("status", app.status)
+    app.resume_used = data.get("resume_used", app.resume_used)
+    app.application_method = data.get("application_method", app.application_method)
+
+
+def filter_applications(query, args):
+    """Apply the status/job_type/company/date-range filters from the query string."""
+    if args.get("status"):
+        query = query.filter(JobApplication.status.in_(args.getlist("status")))
+    if args.get("job_type"):
+        query = query.filter(JobApplication.job_type.in_(args.getlist("job_type")))
+    if args.get("company"):
+        query = query.filter(db.func.lower(JobApplication.company_name) == args["company"].strip().lower())
+
+    applied_after = parse_datetime_param(args.get("applied_after"))
+    applied_before = parse_datetime_param(args.get("applied_before"))
+    if applied_after:
+        query = query.filter(JobApplication.applied_at >= applied_after)
+    if applied_before:
+        query = query.filter(JobApplication.applied_at < applied_before)
+    return query
 
 
 # Routes
 
-# Load AWS keys from .env
-AWS_ACCESS_KEY_ID = os.environ.get("AWS_ACCESS_KEY_ID")
-AWS_SECRET_ACCESS_KEY = os.environ.get("AWS_SECRET_ACCESS_KEY")
-AWS_S3_BUCKET = os.environ.get("AWS_S3_BUCKET")
-
-s3_client = boto3.client("s3",
-                         aws_access_key_id=AWS_ACCESS_KEY_ID,
-                         aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-                         )
-
-
-@app.route("/api/resumes", methods=["POST"])
+@api.route("/api/resumes", methods=["POST"])
 def upload_resume_to_s3():
     user, error, status_code = get_current_user()
     if error:
@@ -187,22 +198,24 @@ def upload_resume_to_s3():
     if not file.filename.endswith(".pdf"):
         return jsonify({"error": "Only PDF files allowed"}), 400
 
-    filename = secure_filename(f"{user.id}_{datetime.utcnow().timestamp()}_{file.filename}")
-    s3_key = f"resumes/{filename}"
+    s3_key = resume_key(user.id, file.filename)
+    bucket = current_app.config["AWS_S3_BUCKET"]
 
     try:
-        s3_client.upload_fileobj(
+        get_s3_client().upload_fileobj(
             file,
-            AWS_S3_BUCKET,
+            bucket,
             s3_key,
             ExtraArgs={"ContentType": "application/pdf"}
         )
-        file_url = f"https://{AWS_S3_BUCKET}.s3.amazonaws.com/{s3_key}"
+        file_url = resume_url(bucket, s3_key)
 
         # Save to database
         resume = Resume(user_id=user.id, filename=file.filename, s3_key=s3_key, file_url=file_url)
         db.session.add(resume)
         db.session.commit()
+        listing_cache.invalidate(user.id, "resumes")
+        resume_indexer.submit(current_app._get_current_object(), resume.id)
 
         return jsonify({
             "message": "Resume uploaded",
@@ -214,29 +227,146 @@ def upload_resume_to_s3():
         })
 
     except Exception as e:
-        print("S3 upload error:", e)
+        log.exception("S3 upload failed")
         return jsonify({"error": "Failed to upload to S3"}), 500
 
 
-@app.route("/api/resumes", methods=["GET"])
+def serialize_resume(resume):
+    return {
+        "id": resume.id,
+        "filename": resume.filename,
+        "file_url": resume.file_url,
+        "uploaded_at": resume.uploaded_at.isoformat() + "Z",
+    }
+
+
+@api.route("/api/resumes/uploads", methods=["POST"])
+def start_resume_upload():
+    """Issue presigned S3 upload credentials so the file bypasses this server.
+
+    Body: {"filename": "cv.pdf", "size": <bytes>}. The client uploads to S3
+    (a POST form, or one PUT per part for multipart) and then calls
+    /api/resumes/uploads/complete with the returned upload_token.
+    """
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
+    if not current_app.secret_key:
+        return jsonify({"error": "Direct uploads are not configured"}), 503
+
+    data = request.json or {}
+    try:
+        upload = start_upload(
+            get_s3_client(), current_app.config["AWS_S3_BUCKET"], current_app.secret_key,
+            user.id, data.get("filename"), data.get("size"),
+        )
+    except UploadError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        log.exception("S3 presign failed")
+        return jsonify({"error": "Failed to start upload"}), 500
+
+    return jsonify(upload), 201
+
+
+@api.route("/api/resumes/uploads/complete", methods=["POST"])
+def complete_resume_upload():
+    """Record the Resume once its object exists in S3.
+
+    Body: {"upload_token": ..., "parts": [{"part_number": 1, "etag": "..."}]};
+    parts are only needed for multipart uploads. Completing twice returns the
+    same resume.
+    """
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
+    if not current_app.secret_key:
+        return jsonify({"error": "Direct uploads are not configured"}), 503
+
+    data = request.json or {}
+    bucket = current_app.config["AWS_S3_BUCKET"]
+    try:
+        ticket = load_upload_token(current_app.secret_key, data.get("upload_token"), user.id)
+        resume = Resume.query.filter_by(user_id=user.id, s3_key=ticket["key"]).first()
+        if resume is None:
+            complete_upload(get_s3_client(), bucket, ticket, data.get("parts"))
+            resume = Resume(user_id=user.id, filename=ticket["filename"], s3_key=ticket["key"],
+                            file_url=resume_url(bucket, ticket["key"]))
+            db.session.add(resume)
+            db.session.commit()
+            listing_cache.invalidate(user.id, "resumes")
+            resume_indexer.submit(current_app._get_current_object(), resume.id)
+    except UploadError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        log.exception("S3 complete upload failed")
+        return jsonify({"error": "Failed to complete upload"}), 500
+
+    return jsonify({"message": "Resume uploaded", "resume": serialize_resume(resume)}), 201
+
+
+@api.route("/api/resumes/uploads", methods=["DELETE"])
+def abort_resume_upload():
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
+    if not current_app.secret_key:
+        return jsonify({"error": "Direct uploads are not configured"}), 503
+
+    try:
+        ticket = load_upload_token(current_app.secret_key, (request.json or {}).get("upload_token"), user.id)
+    except UploadError as e:
+        return jsonify({"error": str(e)}), 400
+    if Resume.query.filter_by(user_id=user.id, s3_key=ticket["key"]).first():
+        return jsonify({"error": "Upload already completed"}), 409
+
+    abort_upload(get_s3_client(), current_app.config["AWS_S3_BUCKET"], ticket)
+    return jsonify({"message": "Upload aborted."})
+
+
+@api.route("/api/resumes", methods=["GET"])
 def get_resumes():
     user, error, status_code = get_current_user()
     if error:
         return error, status_code
 
-    resumes = Resume.query.filter_by(user_id=user.id).order_by(Resume.uploaded_at.desc()).all()
-    return jsonify([
-        {
-            "id": r.id,
-            "filename": r.filename,
-            "file_url": r.file_url,
-            "uploaded_at": r.uploaded_at.isoformat() + "Z"
-        }
-        for r in resumes
-    ])
+    def build():
+        resumes = Resume.query.filter_by(user_id=user.id).order_by(Resume.uploaded_at.desc()).all()
+        return jsonify([serialize_resume(r) for r in resumes])
 
+    return listing_cache.respond(user.id, "resumes", build)
 
-@app.route("/api/resumes/<uuid:resume_id>", methods=["DELETE"])
+
+@api.route("/api/resumes/search", methods=["GET"])
+def search_resumes():
+    """Rank the user's resumes by keyword overlap with ?q=, using the resume term index."""
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
+
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"error": "Missing search query"}), 400
+    try:
+        limit = parse_limit(request.args.get("limit"), default=20, maximum=100)
+    except CursorError as e:
+        return jsonify({"error": str(e)}), 400
+
+    terms = set(index_terms(q))
+    matches = match_resumes(user.id, terms, limit)
+    filenames = dict(
+        db.session.query(Resume.id, Resume.filename).filter(Resume.id.in_([m[0] for m in matches])).all()
+    ) if matches else {}
+    return jsonify({
+        "query_terms": sorted(terms),
+        "results": [
+            {"id": resume_id, "filename": filenames.get(resume_id), "matched_terms": matched, "occurrences": occurrences}
+            for resume_id, matched, occurrences in matches
+        ],
+    })
+
+
+@api.route("/api/resumes/<uuid:resume_id>", methods=["DELETE"])
 def delete_resume(resume_id):
     user, error, status_code = get_current_user()
     if error:
@@ -247,93 +377,190 @@ def delete_resume(resume_id):
         return jsonify({"error": "Unauthorized"}), 403
 
     try:
-        s3_client.delete_object(Bucket=AWS_S3_BUCKET, Key=resume.s3_key)
+        get_s3_client().delete_object(Bucket=current_app.config["AWS_S3_BUCKET"], Key=resume.s3_key)
     except Exception as e:
-        print("S3 delete error:", e)
+        log.warning("S3 delete failed", extra={"key": resume.s3_key, "error": str(e)})
+    signed_urls.invalidate(resume.s3_key)
 
+    clear_resume_index(resume.id)
     db.session.delete(resume)
     db.session.commit()
+    listing_cache.invalidate(user.id, "resumes")
     return jsonify({"message": "Resume deleted successfully."})
 
 
-@app.route("/api/resumes/<uuid:resume_id>/signed-url", methods=["GET"])
+@api.route("/api/resumes/<uuid:resume_id>/signed-url", methods=["GET"])
 def get_signed_resume_url(resume_id):
     user, error, status_code = get_current_user()
     if error:
         return error, status_code
 
-    resume = Resume.query.get_or_404(resume_id)
+    resume = db.session.query(Resume.user_id, Resume.s3_key).filter(Resume.id == resume_id).first()
+    if resume is None:
+        return jsonify({"error": "Not found"}), 404
     if resume.user_id != user.id:
         return jsonify({"error": "Unauthorized"}), 403
 
-    s3_key = resume.file_url.split(f"{AWS_S3_BUCKET}.s3.amazonaws.com/")[-1]
+    signed_url, expires_in = signed_urls.get(get_s3_client(), current_app.config["AWS_S3_BUCKET"], resume.s3_key)
+    return jsonify({"signed_url": signed_url, "expires_in": expires_in})
 
-    signed_url = s3_client.generate_presigned_url(
-        "get_object",
-        Params={"Bucket": AWS_S3_BUCKET, "Key": s3_key},
-        ExpiresIn=300  # 5 minutes
-    )
 
-    return jsonify({"signed_url": signed_url})
+MAX_SIGNED_URL_BATCH = 200
+
 
+@api.route("/api/resumes/signed-urls", methods=["GET"])
+def get_signed_resume_urls():
+    """Signed preview URLs for many resumes in one call.
 
-@app.route("/uploads/<path:filename>")
+    ?ids=<id>,<id>... (or repeated ids=) selects up to MAX_SIGNED_URL_BATCH
+    resumes; without ids, the user's first MAX_SIGNED_URL_BATCH are returned.
+    Unknown or foreign ids are left out.
+    """
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
+
+    raw_ids = [i for value in request.args.getlist("ids") for i in value.split(",") if i.strip()]
+    if len(raw_ids) > MAX_SIGNED_URL_BATCH:
+        return jsonify({"error": f"At most {MAX_SIGNED_URL_BATCH} ids per request"}), 400
+    try:
+        ids = {UUID(i.strip()) for i in raw_ids}
+    except ValueError:
+        return jsonify({"error": "Invalid resume id"}), 400
+
+    query = db.session.query(Resume.id, Resume.s3_key).filter(Resume.user_id == user.id)
+    if raw_ids:
+        query = query.filter(Resume.id.in_(ids))
+
+    s3 = get_s3_client()
+    bucket = current_app.config["AWS_S3_BUCKET"]
+    results = {}
+    expires_in = signed_urls.expires_in
+    for resume_id, s3_key in query.limit(MAX_SIGNED_URL_BATCH):
+        results[str(resume_id)], remaining = signed_urls.get(s3, bucket, s3_key)
+        expires_in = min(expires_in, remaining)
+
+    return jsonify({"signed_urls": results, "expires_in": expires_in})
+
+
+@api.route("/uploads/<path:filename>")
 def serve_uploaded_file(filename):
     return send_from_directory("uploads", filename)
 
 
-@app.route('/api/verify-google-token', methods=['POST'])
+def verify_google_id_token(token):
+    """Claims of a Google ID token issued to this app; raises if it doesn't verify."""
+    from google.oauth2 import id_token
+
+    with outbound("google", "verify_token"):
+        return id_token.verify_oauth2_token(token, get_google_request(), current_app.config["GOOGLE_CLIENT_ID"])
+
+
+@api.route('/api/verify-google-token', methods=['POST'])
 def verify_google_token():
     data = request.get_json()
     token = data.get('token')
-    print("Received token from frontend:", token)
-
     if not token:
         return jsonify({'status': 'error', 'message': 'Missing token'}), 400
 
     try:
-
-        idinfo = id_token.verify_oauth2_token(token, google_requests.Request(), GOOGLE_CLIENT_ID)
-        print("Token decoded:", idinfo)
+        idinfo = verify_google_id_token(token)
+        log.info("Google sign-in", extra={"email": idinfo.get("email")})
 
         user = get_or_create_user_by_email(
             email=idinfo['email'],
             name=idinfo.get('name'),
             profile_pic=idinfo.get('picture')
         )
-        return jsonify({
+        response = {
             'status': 'success',
             'user': {
                 'email': idinfo['email'],
                 'name': idinfo.get('name'),
                 'picture': idinfo.get('picture')
             }
-        })
+        }
+        if user and current_app.secret_key:
+            response['session_token'] = issue_session_token(current_app.secret_key, user)
+            response['expires_in'] = SESSION_TOKEN_MAX_AGE
+        return jsonify(response)
     except Exception as e:
-        print("Google token validation error:", e)
+        log.info("Google token rejected", extra={"error": str(e)})
         return jsonify({'status': 'error', 'message': str(e)}), 401
 
 
-@app.route('/api/applications', methods=['GET', 'POST'])
+def list_applications(user):
+    try:
+        query = filter_applications(JobApplication.query.filter_by(user_id=user.id), request.args)
+
+        sort = request.args.get("sort", "-applied_at")
+        if sort.lstrip("-") not in APPLICATION_SORT_COLUMNS:
+            return jsonify({"error": f"Unsupported sort: {sort}"}), 400
+        key_column = APPLICATION_SORT_COLUMNS[sort.lstrip("-")]
+        descending = sort.startswith("-")
+
+        # Without paging params, keep returning the full (filtered) list
+        # as a bare array for existing clients.
+        if "limit" not in request.args and "cursor" not in request.args:
+            order = (key_column.desc(), JobApplication.id.desc()) if descending else (key_column, JobApplication.id)
+            return jsonify([serialize_application(a) for a in query.order_by(*order).all()])
+
+        apps, next_cursor = keyset_page(
+            query, key_column, JobApplication.id, sort, descending,
+            cursor=request.args.get("cursor"),
+            limit=parse_limit(request.args.get("limit")),
+        )
+    except CursorError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "applications": [serialize_application(a) for a in apps],
+        "next_cursor": next_cursor,
+    })
+
+
+@api.route('/api/session-token', methods=['POST'])
+def refresh_session_token():
+    """Issue a new session token, e.g. before the current one expires.
+
+    The caller proves who they are with a session token that is still valid
+    (Authorization: Bearer) or a Google ID token in the body ({"token": ...});
+    X-User-Email alone never gets a token.
+    """
+    if not current_app.secret_key:
+        return jsonify({"error": "Session tokens are not enabled"}), 404
+
+    user = None
+    auth_header = request.headers.get("Authorization", "")
+    if auth_header.startswith("Bearer "):
+        user = load_session_token(current_app.secret_key, auth_header[len("Bearer "):].strip())
+    google_token = (request.get_json(silent=True) or {}).get("token")
+    if user is None and google_token:
+        try:
+            idinfo = verify_google_id_token(google_token)
+        except Exception as e:
+            log.info("Google token rejected", extra={"error": str(e)})
+            return jsonify({"error": "Invalid Google ID token"}), 401
+        user = get_user_by_email(idinfo.get("email"))
+        if not user:
+            return jsonify({"error": "User not found"}), 401
+    if user is None:
+        return jsonify({"error": "A valid session token or Google ID token is required"}), 401
+
+    return jsonify({
+        "session_token": issue_session_token(current_app.secret_key, user),
+        "expires_in": SESSION_TOKEN_MAX_AGE,
+    })
+
+
+@api.route('/api/applications', methods=['GET', 'POST'])
 def handle_applications():
     user, error, status_code = get_current_user()
     if error:
         return error, status_code
 
     if request.method == 'GET':
-        apps = JobApplication.query.filter_by(user_id=user.id).all()
-        return jsonify([{
-            "id": app.id,
-            "title": app.title,
-            "company": app.company_name,
-            "job_type": app.job_type,
-            "location": app.location,
-            "status": app.status,
-            "applied_at": app.applied_at.isoformat() + "Z",
-            "application_url": app.application_url,
-            "resume_used": str(app.resume_used) if app.resume_used else None,
-            "application_method": app.application_method
-        } for app in apps])
+        return listing_cache.respond(user.id, "applications", lambda: list_applications(user))
 
     elif request.method == 'POST':
         data = request.json
@@ -350,11 +577,261 @@ def handle_applications():
             application_method=data.get("application_method")
         )
         db.session.add(app_entry)
+        db.session.flush()
+        record_change(user.id, after=rollup_buckets(app_entry))
+        record_status_changes(user.id, [(app_entry.id, None, app_entry.status, app_entry.applied_at)])
+        index_applications(user.id, [app_entry])
+        duplicates = find_duplicates(user.id, app_entry.id)
         db.session.commit()
-        return jsonify({"message": "Application added successfully."}), 201
+        listing_cache.invalidate(user.id, "applications")
+        return jsonify({
+            "message": "Application added successfully.",
+            "id": app_entry.id,
+            "possible_duplicates": serialize_duplicates(duplicates),
+        }), 201
+
+
+@api.route('/api/applications/search', methods=['GET'])
+def search_applications_route():
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
+
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"error": "Missing search query"}), 400
+
+    try:
+        limit = parse_limit(request.args.get("limit"), default=20, maximum=100)
+        offset = max(0, int(request.args.get("offset", 0)))
+        base = JobApplication.query.filter_by(user_id=user.id)
+        query = filter_applications(base, request.args)
+    except (CursorError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    results, has_more = search_applications(user.id, q, query, query is not base, limit, offset)
+    return jsonify({
+        "results": results,
+        "next_offset": offset + limit if has_more else None,
+    })
+
+
+@api.route('/api/applications/import', methods=['POST'])
+def import_applications_route():
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
+
+    if "file" not in request.files:
+        return jsonify({"error": "No file uploaded"}), 400
+
+    file = request.files["file"]
+    try:
+        fmt = detect_format(file.filename or "", request.args.get("format"))
+    except ImportFormatError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        report = import_applications(user.id, iter_upload_rows(file.stream, fmt))
+    except (UnicodeDecodeError, csv.Error) as e:
+        db.session.rollback()
+        return jsonify({"error": f"Could not read upload: {e}"}), 400
+
+    listing_cache.invalidate(user.id, "applications")
+    return jsonify(report), 201 if report["imported"] else 200
+
+
+@api.route('/api/applications/export', methods=['GET'])
+def export_applications_route():
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
+
+    fmt = request.args.get("format", "csv").lower()
+    if fmt not in ("csv", "ndjson"):
+        return jsonify({"error": "format must be csv or ndjson"}), 400
+
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return Response(
+        stream_with_context(export_applications(user.id, fmt)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=applications.{fmt}"},
+    )
+
+
+MAX_BATCH_OPERATIONS = 500
+
+
+@api.route('/api/applications/batch', methods=['POST'])
+def batch_update_applications():
+    """Apply many updates/deletes in one transaction.
+
+    Body: {"operations": [{"op": "update", "id": ..., "status": ...}, {"op": "delete", "id": ...}]}
+    Update operations accept the same fields as PATCH /api/applications/<id> and are
+    validated the same way; an invalid operation is reported as an error on its own.
+    """
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
+
+    operations = (request.json or {}).get("operations")
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"error": "operations must be a non-empty list"}), 400
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return jsonify({"error": f"At most {MAX_BATCH_OPERATIONS} operations per batch"}), 400
+
+    operations = [op if isinstance(op, dict) else {} for op in operations]
+    parsed_ids = []
+    for op in operations:
+        try:
+            parsed_ids.append(UUID(str(op.get("id"))))
+        except ValueError:
+            parsed_ids.append(None)
+
+    # One IN query covers every ownership check.
+    apps = {
+        a.id: a for a in
+        JobApplication.query.filter(JobApplication.id.in_({i for i in parsed_ids if i})).all()
+    }
+
+    results = []
+    changes = []
+    status_changes = []
+    reindexed = []
+    deleted = set()
+    for op, app_id in zip(operations, parsed_ids):
+        kind = op.get("op")
+        result = {"id": op.get("id"), "op": kind}
+        app = apps.get(app_id)
+        invalid = validate_update(op) if kind == "update" else None
+
+        if kind not in ("update", "delete"):
+            result.update(status="error", error="op must be update or delete")
+        elif app_id is None:
+            result.update(status="error", error="Invalid id")
+        elif app is None or app_id in deleted:
+            result.update(status="error", error="Not found")
+        elif app.user_id != user.id:
+            result.update(status="error", error="Unauthorized access.")
+        elif invalid:
+            result.update(status="error", error=invalid)
+        elif kind == "update":
+            old_status = app.status
+            before = rollup_buckets(app)
+            update_application(app, op)
+            changes.append((before, rollup_buckets(app)))
+            status_changes.append((app.id, old_status, app.status, None))
+            if touches_content(op):
+                reindexed.append(app)
+            result["status"] = "ok"
+        else:
+            changes.append((rollup_buckets(app), None))
+            status_changes.append((app.id, app.status, None, None))
+            deleted.add(app_id)
+            result["status"] = "ok"
+        results.append(result)
+
+    if deleted:
+        remove_applications(deleted)
+        JobApplication.query.filter(JobApplication.id.in_(deleted)).delete(synchronize_session=False)
+    index_applications(user.id, [a for a in reindexed if a.id not in deleted])
+    record_changes(user.id, changes)
+    record_status_changes(user.id, status_changes)
+    db.session.commit()
+    listing_cache.invalidate(user.id, "applications")
+
+    succeeded = sum(1 for r in results if r["status"] == "ok")
+    return jsonify({"results": results, "succeeded": succeeded, "failed": len(results) - succeeded})
+
+
+@api.route('/api/applications/duplicates', methods=['GET'])
+def list_duplicate_applications():
+    """Clusters of the user's applications that look like the same posting."""
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
+
+    clusters = duplicate_clusters(user.id)
+    ids = [app_id for members, _ in clusters for app_id in members]
+    apps = {}
+    for start in range(0, len(ids), 500):
+        apps.update(
+            (a.id, a) for a in JobApplication.query.filter(JobApplication.id.in_(ids[start:start + 500]))
+        )
+
+    result = []
+    for members, score in sorted(clusters, key=lambda c: (-len(c[0]), -c[1])):
+        rows = sorted((apps[i] for i in members if i in apps), key=lambda a: (a.applied_at, str(a.id)))
+        if len(rows) > 1:
+            result.append({"similarity": round(score, 2), "applications": [serialize_application(a) for a in rows]})
+    return jsonify({"clusters": result})
+
+
+MAX_MATCH_IDS = 5000
+
+
+@api.route('/api/applications/resume-match', methods=['GET'])
+def bulk_resume_match():
+    """Best-fitting resumes for many applications, scored in one batch.
+
+    ?ids=<id>,<id>... limits the applications (default: all of the user's);
+    ?top=N returns the N best resumes per application (default 1, max 10).
+    """
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
 
+    raw_ids = [i for value in request.args.getlist("ids") for i in value.split(",") if i.strip()]
+    if len(raw_ids) > MAX_MATCH_IDS:
+        return jsonify({"error": f"At most {MAX_MATCH_IDS} ids per request"}), 400
+    try:
+        ids = [UUID(i.strip()) for i in raw_ids] or None
+        top = parse_limit(request.args.get("top"), default=1, maximum=10)
+    except (CursorError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    from resume_match import resume_matcher  # numpy; loaded on first use
+
+    matches = resume_matcher.top_matches(user.id, ids, top)
+    filenames = dict(db.session.query(Resume.id, Resume.filename).filter(Resume.user_id == user.id).all())
+    return jsonify({
+        "matches": {
+            str(app_id): [
+                {"resume_id": resume_id, "filename": filenames.get(resume_id), "score": score}
+                for resume_id, score in ranked
+            ]
+            for app_id, ranked in matches
+        },
+    })
+
+
+@api.route('/api/applications/<uuid:app_id>/resume-match', methods=['GET'])
+def application_resume_match(app_id: UUID):
+    """Score every indexed resume against one application's title and description (0-100)."""
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
+
+    owner = db.session.query(JobApplication.user_id).filter(JobApplication.id == app_id).scalar()
+    if owner is None:
+        return jsonify({"error": "Not found"}), 404
+    if owner != user.id:
+        return jsonify({"error": "Unauthorized access."}), 403
+
+    from resume_match import resume_matcher  # numpy; loaded on first use
 
-@app.route('/api/applications/<uuid:app_id>', methods=['GET', 'PATCH', 'DELETE'])
+    ((_, ranked),) = resume_matcher.top_matches(user.id, [app_id], top=MAX_MATCH_IDS)
+    filenames = dict(db.session.query(Resume.id, Resume.filename).filter(Resume.user_id == user.id).all())
+    return jsonify({
+        "application_id": app_id,
+        "matches": [
+            {"resume_id": resume_id, "filename": filenames.get(resume_id), "score": score}
+            for resume_id, score in ranked
+        ],
+    })
+
+
+@api.route('/api/applications/<uuid:app_id>', methods=['GET', 'PATCH', 'DELETE'])
 def handle_application_by_id(app_id: UUID):
     user, error, status_code = get_current_user()
     if error:
@@ -380,142 +857,356 @@ def handle_application_by_id(app_id: UUID):
 
     elif request.method == 'PATCH':
         data = request.json
-        app.title = data.get("title", app.title)
-        app.company_name = data.get("company") or data.get("company_name") or app.company_name
-        app.job_type = data.get("job_type", app.job_type)
-        app.location = data.get("location", app.location)
-        app.application_url = data.get("application_url", app.application_url)
-        app.description = data.get("description", app.description)
-        app.status = data.get("status", app.status)
-        app.resume_used = data.get("resume_used", app.resume_used)
-        app.application_method = data.get("application_method", app.application_method)
+        if not isinstance(data, dict):
+            return jsonify({"error": "Expected a JSON object"}), 400
+        invalid = validate_update(data)
+        if invalid:
+            return jsonify({"error": invalid}), 400
+        old_status = app.status
+        before = rollup_buckets(app)
+        update_application(app, data)
+        record_change(user.id, before=before, after=rollup_buckets(app))
+        record_status_changes(user.id, [(app.id, old_status, app.status, None)])
+        if touches_content(data):
+            index_applications(user.id, [app])
         db.session.commit()
+        listing_cache.invalidate(user.id, "applications")
         return jsonify({"message": "Application updated successfully."})
 
     elif request.method == 'DELETE':
+        record_change(user.id, before=rollup_buckets(app))
+        record_status_changes(user.id, [(app.id, app.status, None, None)])
+        remove_applications([app.id])
         db.session.delete(app)
         db.session.commit()
+        listing_cache.invalidate(user.id, "applications")
         return jsonify({"message": "Application deleted."})
 
 
-@app.route("/api/parse-url", methods=["POST"])
-def parse_job_url():
-    url = request.json.get("url")
-    if not url:
-        return jsonify({"error": "No URL provided."}), 400
+@api.route('/api/applications/timeline', methods=['GET'])
+def get_timeline():
+    """The user's status changes, newest first: ?limit=&cursor=, optionally ?status=<to status>."""
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
 
     try:
-        response = requests.get(url, timeout=10)
-        if response.status_code != 200:
-            return jsonify({"error": f"Failed to fetch URL: status {response.status_code}"}), 400
+        events, next_cursor = timeline_page(
+            user.id, request.args.getlist("status"), request.args.get("cursor"), parse_limit(request.args.get("limit")),
+        )
+    except CursorError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"events": events, "next_cursor": next_cursor})
 
-        soup = BeautifulSoup(response.text, "html.parser")
 
-        # Extract title
-        title = soup.find("h1") or soup.find("title")
-        title_text = title.get_text(strip=True) if title else "Job Title Not Found"
+@api.route('/api/applications/timeline/summary', methods=['GET'])
+def get_timeline_summary():
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
 
-        # Extract company
-        company = (
-            soup.find("meta", {"property": "og:site_name"}) or
-            soup.find("meta", {"name": "author"}) or
-            soup.find("header")
-        )
-        company_text = company.get("content", "Unknown Company") if company and company.has_attr("content") else (
-            company.get_text(strip=True) if company else "Company Not Found"
-        )
+    return listing_cache.respond(user.id, "timeline_summary", lambda: jsonify(timeline_summary(user.id)))
 
-        # Extract all visible paragraphs
-        all_paragraphs = soup.find_all(["p", "li"])
-        paragraph_texts = [p.get_text(strip=True) for p in all_paragraphs]
-        full_visible_text = "\n".join(paragraph_texts)
-        full_visible_text = clean_text(full_visible_text)
 
-        # Section targeting and keyword scoring
+@api.route('/api/applications/<uuid:app_id>/timeline', methods=['GET'])
+def get_application_timeline(app_id: UUID):
+    """One application's status history with time spent in each stage; still served after it's deleted."""
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
 
-        KEYWORDS = [
-            "responsibilities", "requirements", "qualifications", "skills", "experience",
-            "job", "position", "team", "opportunity", "expectations", "tasks", "desired"
-        ]
+    owner, events = application_timeline(app_id)
+    if owner is None:
+        return jsonify({"error": "Not found"}), 404
+    if owner != user.id:
+        return jsonify({"error": "Unauthorized access."}), 403
+    return jsonify({"application_id": app_id, "events": events})
 
-        candidate_sections = []
-        for tag in ["section", "article", "div", "main"]:
-            containers = soup.find_all(tag)
-            for container in containers:
-                section_text = " ".join(p.get_text(strip=True) for p in container.find_all(["p", "li"]))
-                word_count = len(section_text.split())
-                keyword_hits = sum(1 for kw in KEYWORDS if kw in section_text.lower())
 
-                if word_count >= 100 and keyword_hits > 0:
-                    candidate_sections.append((keyword_hits, section_text))
+@api.route('/api/insights', methods=['GET'])
+def get_application_insights():
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
 
-        # Pick best section
-        candidate_sections.sort(reverse=True, key=lambda x: x[0])
-        best_section_text = candidate_sections[0][1] if candidate_sections else ""
+    return jsonify(get_insights(user.id))
+
+
+@click.command("rebuild-insights")
+@click.option("--email", default=None, help="Only rebuild rollups for this user.")
+@with_appcontext
+def rebuild_insights_command(email):
+    """Recompute application_rollups from job_applications."""
+    user_id = None
+    if email:
+        user = get_user_by_email(email)
+        if not user:
+            raise click.ClickException(f"No user with email {email}")
+        user_id = user.id
+    count = rebuild_rollups(user_id)
+    click.echo(f"Rebuilt {count} rollup rows.")
+
+
+@click.command("rebuild-signatures")
+@click.option("--email", default=None, help="Only rebuild signatures for this user.")
+@with_appcontext
+def rebuild_signatures_command(email):
+    """Recompute duplicate-detection signatures and LSH buckets."""
+    user_id = None
+    if email:
+        user = get_user_by_email(email)
+        if not user:
+            raise click.ClickException(f"No user with email {email}")
+        user_id = user.id
+    count = rebuild_signatures(user_id)
+    click.echo(f"Indexed {count} applications.")
+
+
+@click.command("index-resumes")
+@click.option("--all", "reindex_all", is_flag=True, help="Re-extract resumes that are already indexed.")
+@click.option("--email", default=None, help="Only index this user's resumes.")
+@click.option("--workers", default=None, type=int, help="Worker processes (default: one per CPU).")
+@with_appcontext
+def index_resumes_command(reindex_all, email, workers):
+    """Extract and index resume text from S3 with a process pool."""
+    query = db.session.query(Resume.id, Resume.user_id, Resume.s3_key)
+    if not reindex_all:
+        indexed = db.session.query(ResumeText.resume_id).filter(ResumeText.status == "indexed")
+        query = query.filter(~Resume.id.in_(indexed))
+    if email:
+        user = get_user_by_email(email)
+        if not user:
+            raise click.ClickException(f"No user with email {email}")
+        query = query.filter(Resume.user_id == user.id)
+
+    resumes = query.all()
+    config = current_app.config
+    indexed, failed = backfill_resume_index(resumes, config["AWS_S3_BUCKET"], {
+        "aws_access_key_id": config["AWS_ACCESS_KEY_ID"],
+        "aws_secret_access_key": config["AWS_SECRET_ACCESS_KEY"],
+        "endpoint_url": config["AWS_S3_ENDPOINT_URL"],
+    }, workers=workers)
+    click.echo(f"Indexed {indexed} resumes, {failed} failed.")
+
+
+def run_parse_task(task, flask_app, url, use_cache):
+    """Fetch a job posting and extract its fields, reporting progress on task."""
+    # Only the parser needs requests and lxml; import them on its first run.
+    from job_extractor import extract_page
+    from page_fetch import FetchError
+    from prompt_compaction import compact_posting
+
+    with flask_app.app_context():
+        try:
+            task.update(status="fetching")
+            try:
+                with outbound("job_page", "fetch"):
+                    fetched = get_page_fetcher().fetch(url)
+            except FetchError as e:
+                task.update(status="failed", error=f"Failed to fetch URL: {e}")
+                return
+            if fetched.status != 200:
+                task.update(status="failed", error=f"Failed to fetch URL: status {fetched.status}")
+                return
+            if fetched.not_modified:
+                log.info("Job page not modified, reusing cached body", extra={"url": url})
+            elif fetched.truncated:
+                log.info("Job page cut off", extra={"url": url, "bytes": len(fetched.body)})
+
+            page = extract_page(fetched.body)
+            title_text, company_text = page.title, page.company
+            task.update(partial={"title": title_text, "company": company_text})
+
+            # schema.org JobPosting metadata already has every field; skip the LLM.
+            if page.job_posting:
+                result = dict(page.job_posting)
+                result["title"] = result.get("title") or title_text
+                result["company"] = result.get("company") or company_text
+                parse_cache.set(url_key(url), result)
+                task.update(status="done", result=result)
+                return
+
+            if page.best_section:
+                log.info("Using best section", extra={"keyword_hits": page.best_section_hits})
+            else:
+                log.info("No strong section found, compacting the whole page")
+
+            # Fit the posting into the model's input token budget, by section priority
+            counter = get_token_counter()
+            compacted = compact_posting(page.blocks, counter)
+            prioritized_text = compacted.text
+            log.info("Compacted job text", extra={
+                "tokens": compacted.tokens,
+                "baseline_tokens": compacted.baseline_tokens,
+                "boilerplate_removed": compacted.boilerplate_removed,
+                "duplicates_removed": compacted.duplicates_removed,
+                "blocks_over_budget": len(compacted.blocks_dropped),
+            })
 
-        # Build prioritized text
+            # If too small, fallback
+            if len(prioritized_text.split()) < 50:
+                task.update(status="done", result={
+                    "title": title_text,
+                    "company": company_text,
+                    "job_type": "Unknown",
+                    "location": "Unknown",
+                    "description": "Couldn't extract content (too small)"
+                })
+                return
+
+            # Run extraction with LLaMa
+            task.update(status="extracting")
+
+            # Keyed on the page before learned-boilerplate removal, which
+            # differs between processes, so every worker finds the same entry.
+            prioritized_key = text_key(compacted.source_text)
+            extracted_fields = parse_cache.get(prioritized_key) if use_cache else None
+            if extracted_fields is None:
+                prompt_tokens, saved = llm_extraction.record_prompt(counter, compacted)
+                log.info("Prompt built", extra={"prompt_tokens": prompt_tokens, "prompt_tokens_saved": saved})
+                extracted_fields = extract_job_posting_fields(prioritized_text)
+                extracted = any(extracted_fields.values())
+                if extracted:
+                    parse_cache.set(prioritized_key, extracted_fields)
+            else:
+                extracted = True
+
+            # Fallbacks for title & company
+            extracted_fields["title"] = extracted_fields.get("title") or title_text
+            extracted_fields["company"] = extracted_fields.get("company") or company_text
+
+            if extracted:
+                parse_cache.set(url_key(url), extracted_fields)
+
+            task.update(status="done", result=extracted_fields)
+
+        except Exception as e:
+            log.exception("URL parsing failed", extra={"url": url})
+            task.update(status="failed", error=f"Failed to parse job URL: {str(e)}")
+
+
+@api.route("/api/parse-url", methods=["POST"])
+def parse_job_url():
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
 
-        MAX_VISIBLE_CHARS = 6000
-        prioritized_text = ""
+    data = request.json
+    url = data.get("url")
+    if not url:
+        return jsonify({"error": "No URL provided."}), 400
 
-        if best_section_text:
-            print(f"Using best section (keyword hits: {candidate_sections[0][0]})")
-            prioritized_text = best_section_text
-        else:
-            print("No strong section found — prioritizing keyword paragraphs")
-            # Rank paragraphs by keyword hits
-            ranked_paragraphs = sorted(
-                paragraph_texts,
-                key=lambda para: sum(1 for kw in KEYWORDS if kw in para.lower()),
-                reverse=True
-            )
-            # Add paragraphs until we hit char limit
-            selected_paragraphs = []
-            current_length = 0
-            for para in ranked_paragraphs:
-                para_length = len(para)
-                if current_length + para_length + 1 > MAX_VISIBLE_CHARS:
-                    break
-                selected_paragraphs.append(para)
-                current_length += para_length + 1  # +1 for newline
-            prioritized_text = "\n".join(selected_paragraphs)
-
-        # Truncate if still too long
-        if len(prioritized_text) > MAX_VISIBLE_CHARS:
-            prioritized_text = prioritized_text[:MAX_VISIBLE_CHARS]
-
-        final_char_count = len(prioritized_text)
-        print(f"Final selected text char count: {final_char_count}")
-
-        # If too small, fallback
-        if len(prioritized_text.split()) < 50:
-            return jsonify({
-                "title": title_text,
-                "company": company_text,
-                "job_type": "Unknown",
-                "location": "Unknown",
-                "description": "Couldn't extract content (too small)"
-            })
+    # "refresh": true (or Cache-Control: no-cache) skips cache reads; the
+    # fresh result still replaces whatever was cached.
+    use_cache = not (data.get("refresh") or "no-cache" in request.headers.get("Cache-Control", ""))
+    if use_cache:
+        cached = parse_cache.get(url_key(url))
+        if cached is not None:
+            task = parse_tasks.create(owner=user.id)
+            task.update(status="done", result=cached)
+            return jsonify(task.to_dict())
 
-        # Run extraction with LLaMa
+    try:
+        task = parse_tasks.submit(run_parse_task, current_app._get_current_object(), url, use_cache, owner=user.id)
+    except QueueFull:
+        return jsonify({"error": "Parser is busy, try again shortly."}), 503, {"Retry-After": "5"}
+
+    return jsonify(task.to_dict()), 202, {"Location": f"/api/parse-url/{task.id}"}
 
-        extracted_fields = extract_job_posting_fields(prioritized_text)
 
-        # Fallbacks for title & company
-        extracted_fields["title"] = extracted_fields.get("title") or title_text
-        extracted_fields["company"] = extracted_fields.get("company") or company_text
+@api.route("/api/parse-url/<task_id>", methods=["GET"])
+def get_parse_task(task_id):
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
 
-        return jsonify(extracted_fields)
+    task = parse_tasks.get(task_id)
+    if not task or task.owner != user.id:
+        return jsonify({"error": "Unknown or expired task"}), 404
 
-    except Exception as e:
-        print("URL parsing error:", e)
-        return jsonify({"error": f"Failed to parse job URL: {str(e)}"}), 500
+    if request.args.get("stream") or "text/event-stream" in request.headers.get("Accept", ""):
+        return Response(stream_parse_task(task), mimetype="text/event-stream", headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        })
+
+    return jsonify(task.to_dict())
 
 
+def stream_parse_task(task, heartbeat_seconds=15):
+    """Yield an SSE event for every task update until it finishes."""
+    version = -1
+    while True:
+        current = task.wait(version, timeout=heartbeat_seconds)
+        if current == version:
+            yield ": keep-alive\n\n"
+            continue
+        version = current
+        yield f"event: {task.status}\ndata: {json.dumps(task.to_dict(), default=str)}\n\n"
+        if task.finished:
+            return
 
 
+@api.route("/api/parse-url/cache-stats", methods=["GET"])
+def parse_cache_stats():
+    user, error, status_code = get_current_user()
+    if error:
+        return error, status_code
 
+    return jsonify(dict(parse_cache.snapshot(), extraction=llm_extraction.snapshot(),
+                        fetch=get_page_fetcher().snapshot()))
+
+
+def create_app(test_config=None):
+    configure_logging()
+    app = Flask(__name__)
+    app.config.from_mapping(
+        SECRET_KEY=os.environ.get("FLASK_SECRET_KEY"),
+        SQLALCHEMY_DATABASE_URI=os.environ.get("DATABASE_URL"),
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        GOOGLE_CLIENT_ID=os.environ.get("GOOGLE_CLIENT_ID"),
+        HF_TOKEN=os.environ.get("API_TOKEN"),
+        HF_TIMEOUT=LLM_TIMEOUT_SECONDS,
+        # Send chat completions to an OpenAI-compatible server instead (e.g. benchmarks/fake_inference.py).
+        HF_INFERENCE_URL=os.environ.get("HF_INFERENCE_URL"),
+        # Hub model id or local tokenizer.json used to count prompt tokens.
+        LLM_TOKENIZER=os.environ.get("LLM_TOKENIZER", HF_CHAT_MODEL),
+        # Let the job-page fetcher reach private and loopback addresses (local fixture servers only).
+        FETCH_ALLOW_PRIVATE=env_bool("FETCH_ALLOW_PRIVATE", False),
+        # X-Profile: <token> profiles that request with cProfile; unset disables profiling.
+        PROFILE_TOKEN=os.environ.get("PROFILE_TOKEN"),
+        # Require "Authorization: Bearer <token>" on /metrics when set.
+        METRICS_TOKEN=os.environ.get("METRICS_TOKEN"),
+        AWS_ACCESS_KEY_ID=os.environ.get("AWS_ACCESS_KEY_ID"),
+        AWS_SECRET_ACCESS_KEY=os.environ.get("AWS_SECRET_ACCESS_KEY"),
+        AWS_S3_BUCKET=os.environ.get("AWS_S3_BUCKET"),
+        # Point S3 at a local stand-in (moto server, MinIO, LocalStack) when set.
+        AWS_S3_ENDPOINT_URL=os.environ.get("AWS_S3_ENDPOINT_URL"),
+    )
+    if test_config:
+        app.config.update(test_config)
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config["SQLALCHEMY_DATABASE_URI"]))
+
+    cors.init_app(app, supports_credentials=True, resources={r"/*": {"origins": [
+        "http://localhost:3000",
+        "http://35.175.218.182:3000",
+        "https://careervaultapp.com"
+    ]}}, allow_headers=["Content-Type", "Authorization", "X-User-Email"])
+    db.init_app(app)
+    init_metrics(app)
+
+    # Flask-Migrate imports alembic (~0.1s) and only the `flask db` commands
+    # use it, so only wire it up when the app is loaded by the flask CLI.
+    if click.get_current_context(silent=True) is not None:
+        from flask_migrate import Migrate
+        Migrate(app, db)
+
+    app.register_blueprint(api)
+    app.cli.add_command(rebuild_insights_command)
+    app.cli.add_command(index_resumes_command)
+    app.cli.add_command(rebuild_signatures_command)
+    return app
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
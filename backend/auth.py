@@ -0,0 +1,113 @@
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+from uuid import UUID
+
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+
+SESSION_TOKEN_MAX_AGE = int(os.environ.get("SESSION_TOKEN_MAX_AGE", 7 * 24 * 3600))
+USER_CACHE_TTL_SECONDS = int(os.environ.get("USER_CACHE_TTL_SECONDS", 60))
+
+# What route handlers get back from get_current_user(): enough to scope
+# queries without loading the User row.
+CurrentUser = namedtuple("CurrentUser", ["id", "email"])
+
+
+# Session tokens
+
+def _serializer(secret_key):
+    return URLSafeTimedSerializer(secret_key, salt="careervault-session")
+
+
+def issue_session_token(secret_key, user):
+    return _serializer(secret_key).dumps({"uid": str(user.id), "email": user.email})
+
+
+def load_session_token(secret_key, token, max_age=SESSION_TOKEN_MAX_AGE):
+    """Return the CurrentUser a token was issued for, or None if it is invalid or expired."""
+    try:
+        payload = _serializer(secret_key).loads(token, max_age=max_age)
+        return CurrentUser(id=UUID(payload["uid"]), email=payload["email"])
+    except (BadSignature, KeyError, TypeError, ValueError):
+        return None
+
+
+# Google certificate caching
+
+class CachingGoogleRequest:
+    """google.auth transport that keeps one pooled session and caches GET
+    responses (Google's signing certs) for their Cache-Control max-age.
+
+    verify_oauth2_token() fetches the certs on every call; with this it only
+    goes to the network when Google's advertised lifetime has passed.
+    """
+
+    def __init__(self, default_ttl=300):
+        import requests
+        from google.auth.transport import requests as google_requests
+
+        self.default_ttl = default_ttl
+        self._request = google_requests.Request(session=requests.Session())
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, url, method="GET", body=None, headers=None, timeout=None, **kwargs):
+        if method != "GET":
+            return self._request(url, method=method, body=body, headers=headers, timeout=timeout, **kwargs)
+
+        with self._lock:
+            cached = self._cache.get(url)
+        if cached and cached[1] > time.time():
+            return cached[0]
+
+        response = self._request(url, method=method, headers=headers, timeout=timeout, **kwargs)
+        if response.status == 200:
+            ttl = _max_age(response.headers.get("cache-control", ""), self.default_ttl)
+            with self._lock:
+                self._cache[url] = (response, time.time() + ttl)
+        return response
+
+
+def _max_age(cache_control, default):
+    match = re.search(r"max-age=(\d+)", cache_control or "")
+    return int(match.group(1)) if match else default
+
+
+# Header-based lookups
+
+class UserCache:
+    """Small TTL cache of email -> CurrentUser for X-User-Email requests."""
+
+    def __init__(self, ttl_seconds=USER_CACHE_TTL_SECONDS, max_entries=10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, email):
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._entries[email]
+                return None
+            return entry[0]
+
+    def set(self, email, user):
+        identity = CurrentUser(id=user.id, email=user.email)
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                now = time.time()
+                self._entries = {k: v for k, v in self._entries.items() if v[1] > now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[email] = (identity, time.time() + self.ttl_seconds)
+        return identity
+
+    def invalidate(self, email):
+        with self._lock:
+            self._entries.pop(email, None)
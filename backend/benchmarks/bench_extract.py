@@ -0,0 +1,96 @@
+"""Compare the legacy BeautifulSoup section scorer with job_extractor.extract_page.
+
+Usage (from backend/):
+    python benchmarks/bench_extract.py [--iterations 20] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from job_extractor import KEYWORDS, extract_page  # noqa: E402
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def legacy_extract(html):
+    """The section-scoring loop parse_job_url used before extract_page."""
+    soup = BeautifulSoup(html, "html.parser")
+
+    title = soup.find("h1") or soup.find("title")
+    title_text = title.get_text(strip=True) if title else "Job Title Not Found"
+
+    all_paragraphs = soup.find_all(["p", "li"])
+    paragraph_texts = [p.get_text(strip=True) for p in all_paragraphs]
+
+    candidate_sections = []
+    for tag in ["section", "article", "div", "main"]:
+        containers = soup.find_all(tag)
+        for container in containers:
+            section_text = " ".join(p.get_text(strip=True) for p in container.find_all(["p", "li"]))
+            word_count = len(section_text.split())
+            keyword_hits = sum(1 for kw in KEYWORDS if kw in section_text.lower())
+
+            if word_count >= 100 and keyword_hits > 0:
+                candidate_sections.append((keyword_hits, section_text))
+
+    candidate_sections.sort(reverse=True, key=lambda x: x[0])
+    best_section_text = candidate_sections[0][1] if candidate_sections else ""
+    return title_text, paragraph_texts, best_section_text
+
+
+def time_it(fn, arg, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(arg)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    results = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        if not name.endswith(".html"):
+            continue
+        with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+            html = f.read()
+
+        _, legacy_paragraphs, legacy_best = legacy_extract(html)
+        page = extract_page(html)
+
+        results.append({
+            "fixture": name,
+            "bytes": len(html),
+            "legacy_ms": round(time_it(legacy_extract, html, args.iterations), 3),
+            "new_ms": round(time_it(extract_page, html, args.iterations), 3),
+            "same_best_section": legacy_best == page.best_section,
+            "same_paragraphs": legacy_paragraphs == page.paragraphs,
+            "json_ld_fast_path": page.job_posting is not None,
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'fixture':<26}{'bytes':>8}{'legacy ms':>12}{'new ms':>10}{'speedup':>9}  same section  json-ld")
+    for r in results:
+        speedup = r["legacy_ms"] / r["new_ms"] if r["new_ms"] else float("inf")
+        print(f"{r['fixture']:<26}{r['bytes']:>8}{r['legacy_ms']:>12.2f}{r['new_ms']:>10.2f}{speedup:>8.1f}x"
+              f"  {str(r['same_best_section']):<13} {r['json_ld_fast_path']}")
+
+
+if __name__ == "__main__":
+    main()
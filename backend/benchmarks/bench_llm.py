@@ -0,0 +1,133 @@
+"""Load-test LLM extraction against the local fake inference server.
+
+Fires --requests parses drawn from --distinct job texts at once and compares
+calling the model directly per request (the old behaviour) with
+ExtractionService on threads, buffered and streamed. The fake model "generates" a chunk every --token-delay
+seconds and adds a prose note after the JSON, which a stream stops before.
+Reports inference calls actually made, peak concurrency seen by the
+server (for streams this includes handlers that haven't yet noticed the
+client hung up), latency and wall time.
+
+Usage (from backend/):
+    python benchmarks/bench_llm.py [--requests 64] [--distinct 16] [--latency 0.2] [--token-delay 0.005]
+                                   [--fail-rate 0.1] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from huggingface_hub import InferenceClient  # noqa: E402
+
+from fake_inference import DEFAULT_TRAILER, FakeInferenceServer  # noqa: E402
+from llm_extraction import ExtractionService, build_messages, parse_response  # noqa: E402
+
+
+MODEL = "fake-model"
+
+
+def job_texts(count, rng):
+    words = ["python", "react", "kubernetes", "backend", "team", "requirements", "experience", "remote", "senior"]
+    return [f"Job {i}: " + " ".join(rng.choices(words, k=120)) for i in range(count)]
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+def run_threads(fn, texts, threads):
+    latencies = []
+
+    def timed(text):
+        start = time.perf_counter()
+        try:
+            fn(text)
+            ok = True
+        except Exception:
+            ok = False
+        latencies.append((time.perf_counter() - start) * 1000)
+        return ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        ok = sum(pool.map(timed, texts))
+    return ok, latencies, (time.perf_counter() - start) * 1000
+
+
+def summarize(server, ok, latencies, wall_ms, service=None):
+    result = {
+        "succeeded": ok,
+        "inference_calls": server.requests,
+        "server_failures": server.failures,
+        "peak_concurrency": server.max_active,
+        "p50_ms": round(percentile(latencies, 0.5), 1) if latencies else None,
+        "p99_ms": round(percentile(latencies, 0.99), 1) if latencies else None,
+        "wall_ms": round(wall_ms, 1),
+    }
+    if service is not None:
+        result.update(coalesced=service.stats["coalesced"], retries=service.stats["retries"],
+                      early_stops=service.stats["early_stops"])
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--distinct", type=int, default=16, help="Distinct job texts among the requests")
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake server time to first token, seconds")
+    parser.add_argument("--token-delay", type=float, default=0.005, help="Fake server seconds per 4-character chunk")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of fake server calls failing with 503")
+    parser.add_argument("--concurrency", type=int, default=4, help="ExtractionService max_concurrency")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    distinct = job_texts(args.distinct, rng)
+    texts = [rng.choice(distinct) for _ in range(args.requests)]
+    server = FakeInferenceServer(latency=args.latency, fail_rate=args.fail_rate, token_delay=args.token_delay,
+                                 trailer=DEFAULT_TRAILER).start()
+    client = InferenceClient(base_url=server.url, api_key="fake", timeout=30)
+    results = {"requests": args.requests, "distinct": args.distinct, "latency_s": args.latency,
+               "token_delay_s": args.token_delay}
+
+    def direct(text):
+        completion = client.chat.completions.create(model=MODEL, messages=build_messages(text))
+        return parse_response(completion.choices[0].message.content)
+
+    def new_client():
+        return InferenceClient(base_url=server.url, api_key="fake", timeout=30)
+
+    def new_service(stream=True):
+        return ExtractionService(MODEL, max_concurrency=args.concurrency, backoff_seconds=0.05, stream=stream)
+
+    try:
+        server.reset()
+        results["direct"] = summarize(server, *run_threads(direct, texts, args.requests))
+
+        for name, stream in (("service_buffered", False), ("service_stream", True)):
+            server.reset()
+            service = new_service(stream)
+            results[name] = summarize(
+                server, *run_threads(lambda t: service.extract(new_client, t), texts, args.requests), service=service)
+    finally:
+        server.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.requests} requests over {args.distinct} texts, fake latency {args.latency}s "
+          f"+ {args.token_delay}s per chunk\n")
+    columns = ["succeeded", "inference_calls", "peak_concurrency", "p50_ms", "p99_ms", "wall_ms"]
+    print(f"{'':<18}" + "".join(f"{c:>18}" for c in columns))
+    for name in ("direct", "service_buffered", "service_stream"):
+        print(f"{name:<18}" + "".join(f"{str(results[name][c] or '-'):>18}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Time resume-to-application match scoring on synthetic text, without a database.
+
+Usage (from backend/):
+    python benchmarks/bench_match.py [--resumes 50] [--applications 5000] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from resume_match import _UserVectors  # noqa: E402
+
+
+VOCAB = [f"term{i}" for i in range(20000)] + [
+    "python", "java", "golang", "rust", "react", "kubernetes", "aws", "postgres", "backend", "frontend",
+]
+
+
+def fill(vectors, count, words, rng):
+    texts = {i: (" ".join(rng.choices(VOCAB, k=words)),) for i in range(count)}
+    start = time.perf_counter()
+    vectors.refresh((count, None), {i: 0 for i in texts}, lambda ids: {i: texts[i] for i in ids})
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--applications", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    entry = _UserVectors()
+    vectorize_apps_ms = fill(entry.apps, args.applications, 300, rng)
+    vectorize_resumes_ms = fill(entry.resumes, args.resumes, 600, rng)
+
+    start = time.perf_counter()
+    entry.rebuild_weights()
+    weights_ms = (time.perf_counter() - start) * 1000
+
+    samples = []
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        scores = entry.weighted_resumes @ entry.weighted_apps.T
+        scores.argmax(axis=0)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+
+    results = {
+        "resumes": args.resumes,
+        "applications": args.applications,
+        "vectorize_applications_ms": round(vectorize_apps_ms, 1),
+        "vectorize_resumes_ms": round(vectorize_resumes_ms, 1),
+        "rebuild_weights_ms": round(weights_ms, 1),
+        "score_p50_ms": round(samples[len(samples) // 2], 2),
+        "score_max_ms": round(samples[-1], 2),
+        "cached_bytes": entry.apps.matrix.nbytes + entry.weighted_apps.nbytes
+        + entry.resumes.matrix.nbytes + entry.weighted_resumes.nbytes,
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for key, value in results.items():
+        print(f"{key:<28}{value:>14}")
+
+
+if __name__ == "__main__":
+    main()
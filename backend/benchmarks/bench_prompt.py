@@ -0,0 +1,72 @@
+"""Measure prompt tokens before and after compaction on the fixture pages.
+
+"Before" is the old few-shot prompt around the first 6,000 characters of the
+page's paragraphs; "after" is the schema prompt around compact_posting()'s
+output. Counts use --tokenizer (a tokenizer.json path or Hub model id), or
+the built-in estimate when it can't be loaded.
+
+Usage (from backend/):
+    python benchmarks/bench_prompt.py [--tokenizer path/to/tokenizer.json] [--budget 1500] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from job_extractor import extract_page  # noqa: E402
+from llm_extraction import LEGACY_PROMPT_TEMPLATE, PROMPT_TEMPLATE  # noqa: E402
+from prompt_compaction import LLM_INPUT_TOKEN_BUDGET, BoilerplateTracker, TokenCounter, compact_posting  # noqa: E402
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokenizer", help="tokenizer.json path or Hub model id (default: estimate)")
+    parser.add_argument("--budget", type=int, default=LLM_INPUT_TOKEN_BUDGET)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    counter = TokenCounter.load(args.tokenizer) if args.tokenizer else TokenCounter()
+    results = {"exact_tokens": counter.exact, "budget": args.budget, "fixtures": []}
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        if not name.endswith(".html"):
+            continue
+        with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+            page = extract_page(f.read())
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            compacted = compact_posting(page.blocks, counter, budget=args.budget, tracker=BoilerplateTracker())
+        compact_ms = (time.perf_counter() - start) * 1000 / args.iterations
+
+        before = counter.template_tokens(LEGACY_PROMPT_TEMPLATE) + compacted.baseline_tokens
+        after = counter.template_tokens(PROMPT_TEMPLATE) + compacted.tokens
+        results["fixtures"].append({
+            "fixture": name,
+            "prompt_tokens_before": before,
+            "prompt_tokens_after": after,
+            "saved_pct": round(100 * (before - after) / before, 1),
+            "boilerplate_removed": compacted.boilerplate_removed,
+            "duplicates_removed": compacted.duplicates_removed,
+            "blocks_over_budget": len(compacted.blocks_dropped),
+            "compact_ms": round(compact_ms, 2),
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"token counts: {'tokenizer' if counter.exact else 'estimated'}, budget {args.budget}\n")
+    print(f"{'fixture':<26}{'before':>8}{'after':>8}{'saved %':>9}{'compact ms':>12}")
+    for row in results["fixtures"]:
+        print(f"{row['fixture']:<26}{row['prompt_tokens_before']:>8}{row['prompt_tokens_after']:>8}"
+              f"{row['saved_pct']:>9}{row['compact_ms']:>12}")
+
+
+if __name__ == "__main__":
+    main()
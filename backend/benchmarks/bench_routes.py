@@ -0,0 +1,395 @@
+"""Latency and throughput of every hot backend route against a seeded database.
+
+Seeds (or reuses, with --reuse) a database through seed_data.py, then
+drives the app in-process with Flask test clients, signed in with session
+tokens as a rotating set of seeded users. S3 is moto's in-process fake,
+HF inference is fake_inference.py and job pages come from fixture_http.py,
+so nothing leaves the machine. For each route it reports p50/p90/p99 and
+mean latency, throughput, SQL statements per request and unexpected
+statuses.
+
+Results are written as JSON (--output) together with the commit, Python
+and database they were measured on; --compare <older.json> prints the
+change per route and exits non-zero when a p50 or p99 got worse by more
+than --max-regression, which is what to run before a deploy:
+
+    python benchmarks/bench_routes.py --rows 100000 --output new.json --compare baseline.json
+
+"Uncached" variants clear the listing cache before each request (outside
+the timing) to measure building the response; the plain ones are what a
+returning client costs. Latencies are in-process: no HTTP server or
+network, so compare runs with each other rather than with production.
+
+Usage (from backend/):
+    python benchmarks/bench_routes.py [--rows 10000] [--requests 200] [--threads 1] [--routes list,insights]
+                                      [--database-url URL] [--reuse] [--output FILE] [--compare FILE] [--json]
+"""
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, ".."))
+sys.path.insert(0, BENCH_DIR)
+
+from seed_data import DEFAULT_DATABASE_URL, active_users, prepare  # noqa: E402
+
+BUCKET = "careervault-bench"
+PARSE_POLL_SECONDS = 0.005
+# Ignore p50/p99 changes smaller than this; they're timer noise on fast routes.
+MIN_REGRESSION_MS = 0.5
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def tiny_pdf():
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+class Context:
+    """What scenarios need: the app, users with tokens, their ids, and the fixture servers."""
+
+    def __init__(self, app, users, board, rng):
+        from auth import issue_session_token
+        from models import JobApplication, Resume
+
+        self.app = app
+        self.board = board
+        self.rng = rng
+        self.lock = threading.Lock()
+        self.pdf = tiny_pdf()
+        self.users = []
+        with app.app_context():
+            for user in users:
+                app_ids = [str(i) for (i,) in JobApplication.query.with_entities(JobApplication.id)
+                           .filter_by(user_id=user.id).limit(200)]
+                resume_ids = [str(i) for (i,) in Resume.query.with_entities(Resume.id).filter_by(user_id=user.id)]
+                self.users.append({
+                    "id": user.id,
+                    "headers": {"Authorization": f"Bearer {issue_session_token(app.secret_key, user)}"},
+                    "apps": app_ids,
+                    "resumes": resume_ids,
+                })
+        self.created = []
+        self.statements = 0
+        self.timing = threading.local()
+        self._cycle = itertools.cycle(self.users)
+
+    def next_user(self):
+        """A copy, so a request's scratch state (user["target"]) stays its own."""
+        with self.lock:
+            return dict(next(self._cycle))
+
+    def count_statement(self, *_):
+        if getattr(self.timing, "on", False):
+            with self.lock:
+                self.statements += 1
+
+    def cleanup(self):
+        """Delete what application_create added, through the API so rollups stay right."""
+        by_id = {u["id"]: u for u in self.users}
+        client = self.app.test_client()
+        for user_id, app_id in self.created:
+            client.delete(f"/api/applications/{app_id}", headers=by_id[user_id]["headers"])
+        self.created = []
+
+    def pick(self, items):
+        with self.lock:
+            return self.rng.choice(items)
+
+
+def uncached(kind):
+    def prepare_request(ctx, user):
+        from listing_cache import listing_cache
+
+        listing_cache.invalidate(user["id"], kind)
+    return prepare_request
+
+
+def create_payload(ctx, user):
+    n = uuid.uuid4().hex[:8]
+    return {"title": f"Benchmark Engineer {n}", "company": "Bench Co", "application_url": f"https://bench.test/{n}",
+            "job_type": "Full-Time", "location": "Remote", "description": "python kubernetes postgres " * 10}
+
+
+def remember_created(ctx, user, response):
+    if response.status_code == 201:
+        with ctx.lock:
+            ctx.created.append((user["id"], response.get_json()["id"]))
+
+
+def create_target(ctx, user):
+    """Untimed: an application for the following delete to remove."""
+    response = ctx.app.test_client().post("/api/applications", json=create_payload(ctx, user),
+                                          headers=user["headers"])
+    user["target"] = str(response.get_json()["id"])
+
+
+def parse_url(refresh):
+    def run(ctx, client, user):
+        page = ctx.pick(["/lever_sections.html", "/workday_nested.html", "/greenhouse_jsonld.html"])
+        response = client.post("/api/parse-url", json={"url": ctx.board.url + page, "refresh": refresh},
+                               headers=user["headers"])
+        if response.status_code != 202:
+            return response
+        task_id = response.get_json()["task_id"]
+        while True:
+            response = client.get(f"/api/parse-url/{task_id}", headers=user["headers"])
+            if response.get_json().get("status") in ("done", "failed"):
+                return response
+            time.sleep(PARSE_POLL_SECONDS)
+    return run
+
+
+# name -> (method, path(ctx, user), options). Options: json(ctx, user) for a
+# body, prepare(ctx, user) run untimed first, after(ctx, user, response),
+# run(ctx, client, user) to drive a multi-request flow, expect: statuses.
+SCENARIOS = {
+    "applications_list": ("GET", lambda ctx, u: "/api/applications", {}),
+    "applications_list_uncached": ("GET", lambda ctx, u: "/api/applications",
+                                   {"prepare": uncached("applications")}),
+    "applications_list_304": ("GET", lambda ctx, u: "/api/applications", {"conditional": True, "expect": (304,)}),
+    "applications_page": ("GET", lambda ctx, u: "/api/applications?limit=50&sort=-updated_at",
+                          {"prepare": uncached("applications")}),
+    "applications_filtered": ("GET", lambda ctx, u: "/api/applications?status=Interview&limit=50",
+                              {"prepare": uncached("applications")}),
+    "applications_search": ("GET", lambda ctx, u: "/api/applications/search?q=python+kubernetes", {}),
+    "application_get": ("GET", lambda ctx, u: f"/api/applications/{ctx.pick(u['apps'])}", {}),
+    "application_create": ("POST", lambda ctx, u: "/api/applications",
+                           {"json": create_payload, "after": remember_created, "expect": (201,)}),
+    "application_update": ("PATCH", lambda ctx, u: f"/api/applications/{ctx.pick(u['apps'])}",
+                           {"json": lambda ctx, u: {"status": ctx.pick(["Applied", "Interview", "Rejected"])}}),
+    "application_delete": ("DELETE", lambda ctx, u: f"/api/applications/{u['target']}",
+                           {"prepare": create_target}),
+    "applications_duplicates": ("GET", lambda ctx, u: "/api/applications/duplicates", {}),
+    "insights": ("GET", lambda ctx, u: "/api/insights", {}),
+    "timeline": ("GET", lambda ctx, u: "/api/applications/timeline?limit=50", {}),
+    "timeline_summary": ("GET", lambda ctx, u: "/api/applications/timeline/summary", {}),
+    "timeline_summary_uncached": ("GET", lambda ctx, u: "/api/applications/timeline/summary",
+                                  {"prepare": uncached("timeline_summary")}),
+    "application_timeline": ("GET", lambda ctx, u: f"/api/applications/{ctx.pick(u['apps'])}/timeline", {}),
+    "resumes_list": ("GET", lambda ctx, u: "/api/resumes", {}),
+    "resumes_list_uncached": ("GET", lambda ctx, u: "/api/resumes", {"prepare": uncached("resumes")}),
+    "resume_signed_url": ("GET", lambda ctx, u: f"/api/resumes/{ctx.pick(u['resumes'])}/signed-url", {}),
+    "resume_signed_urls": ("GET", lambda ctx, u: "/api/resumes/signed-urls", {}),
+    "resume_upload": ("POST", lambda ctx, u: "/api/resumes", {"upload": True}),
+    "parse_url_cached": ("POST", None, {"run": parse_url(refresh=False), "warmup": 3}),
+    "parse_url_fresh": ("POST", None, {"run": parse_url(refresh=True), "max_requests": 50}),
+}
+
+
+def run_scenario(ctx, name, requests, threads):
+    method, path, options = SCENARIOS[name]
+    expect = options.get("expect", (200,))
+    requests = min(requests, options.get("max_requests", requests))
+    etags = {}
+
+    def one():
+        user = ctx.next_user()
+        client = ctx.app.test_client()
+        if options.get("prepare"):
+            with ctx.app.app_context():
+                options["prepare"](ctx, user)
+        kwargs = {"headers": dict(user["headers"])}
+        if options.get("conditional"):
+            if user["id"] not in etags:
+                etags[user["id"]] = client.get(path(ctx, user), headers=user["headers"]).headers.get("ETag")
+            kwargs["headers"]["If-None-Match"] = etags[user["id"]]
+        if options.get("json"):
+            kwargs["json"] = options["json"](ctx, user)
+        if options.get("upload"):
+            kwargs["data"] = {"file": (io.BytesIO(ctx.pdf), "bench-cv.pdf")}
+            kwargs["content_type"] = "multipart/form-data"
+
+        ctx.timing.on = True
+        start = time.perf_counter()
+        if options.get("run"):
+            response = options["run"](ctx, client, user)
+        else:
+            response = client.open(path(ctx, user), method=method, **kwargs)
+        elapsed = (time.perf_counter() - start) * 1000
+        ctx.timing.on = False
+        if options.get("after"):
+            options["after"](ctx, user, response)
+        ok = response.status_code in expect and (not options.get("run") or
+                                                  response.get_json().get("status") == "done")
+        return elapsed, ok
+
+    for _ in range(options.get("warmup", 1)):
+        one()
+    ctx.statements = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(lambda _: one(), range(requests)))
+    wall = time.perf_counter() - start
+
+    latencies = [r[0] for r in results]
+    return {
+        "requests": requests,
+        "errors": sum(1 for r in results if not r[1]),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p90_ms": round(percentile(latencies, 90), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "max_ms": round(max(latencies), 3),
+        "throughput_rps": round(requests / wall, 1),
+        "sql_per_request": round(ctx.statements / requests, 2),
+    }
+
+
+def compare(results, baseline, max_regression):
+    """Rows of (route, metric, old, new, change) and whether any is a regression."""
+    rows, regressed = [], False
+    for name, new in results["routes"].items():
+        old = baseline.get("routes", {}).get(name)
+        if not old:
+            continue
+        for metric in ("p50_ms", "p99_ms"):
+            change = (new[metric] - old[metric]) / old[metric] if old[metric] else 0.0
+            bad = change > max_regression and new[metric] - old[metric] > MIN_REGRESSION_MS
+            regressed |= bad
+            rows.append((name, metric, old[metric], new[metric], change, bad))
+    return rows, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=10000, help="Applications to seed (1k to 1M)")
+    parser.add_argument("--apps-per-user", type=int, default=500)
+    parser.add_argument("--resumes-per-user", type=int, default=5)
+    parser.add_argument("--active-users", type=int, default=20, help="Users requests are spread across")
+    parser.add_argument("--reuse", action="store_true", help="Reuse an already seeded database of the same size")
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per route")
+    parser.add_argument("--threads", type=int, default=1, help="Concurrent clients")
+    parser.add_argument("--routes", help="Comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake inference seconds per call")
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="Allowed p50/p99 slowdown (0.25 = 25%%)")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    names = args.routes.split(",") if args.routes else list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(unknown)}")
+
+    from fake_inference import FakeInferenceServer
+    from fixture_http import FixtureServer
+
+    inference = FakeInferenceServer(latency=args.llm_latency).start()
+    board = FixtureServer().start()
+    os.environ.update({
+        "DATABASE_URL": args.database_url, "HF_INFERENCE_URL": inference.url, "API_TOKEN": "bench",
+        "FETCH_ALLOW_PRIVATE": "1", "FLASK_SECRET_KEY": "bench-secret", "AWS_S3_BUCKET": BUCKET,
+        "AWS_ACCESS_KEY_ID": "bench", "AWS_SECRET_ACCESS_KEY": "bench", "AWS_DEFAULT_REGION": "us-east-1",
+    })
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+    from moto import mock_aws
+
+    mock_aws().start()
+    import boto3
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    boto3.client("s3").create_bucket(Bucket=BUCKET)
+
+    from app import create_app
+    from extensions import db
+
+    app = create_app()
+    if not os.environ.get("LLM_TOKENIZER"):
+        # Estimated token counts, rather than fetching the chat model's tokenizer from the Hub.
+        from prompt_compaction import TokenCounter
+
+        app.extensions.setdefault("careervault_clients", {})["tokenizer"] = TokenCounter()
+    log = (lambda *a: print(*a, file=sys.stderr)) if args.json else print
+    seeded = prepare(app, db, args.rows, args.apps_per_user, args.resumes_per_user, args.active_users,
+                     args.reuse, log=log)
+    with app.app_context():
+        users = active_users(db, args.active_users)
+        dialect = db.engine.dialect.name
+    ctx = Context(app, users, board, random.Random(0))
+
+    event.listen(Engine, "after_cursor_execute", ctx.count_statement)
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "database": dialect,
+            "seeded": seeded,
+            "active_users": len(users),
+            "requests": args.requests,
+            "threads": args.threads,
+        },
+        "routes": {},
+    }
+    for name in names:
+        log(f"  {name}...")
+        results["routes"][name] = run_scenario(ctx, name, args.requests, args.threads)
+
+    ctx.cleanup()
+    inference.stop()
+    board.stop()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    regressed = False
+    comparison = []
+    if args.compare:
+        with open(args.compare) as f:
+            comparison, regressed = compare(results, json.load(f), args.max_regression)
+
+    if args.json:
+        results["regressed"] = regressed
+        print(json.dumps(results, indent=2))
+    else:
+        meta = results["meta"]
+        print(f"\n{meta['seeded']['applications']} applications, {meta['database']}, commit {meta['commit']}, "
+              f"{args.threads} thread(s)\n")
+        print(f"{'route':<28}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'req/s':>9}{'sql/req':>9}{'errors':>8}")
+        for name, row in results["routes"].items():
+            print(f"{name:<28}{row['p50_ms']:>9.2f}{row['p90_ms']:>9.2f}{row['p99_ms']:>9.2f}"
+                  f"{row['throughput_rps']:>9.1f}{row['sql_per_request']:>9.2f}{row['errors']:>8}")
+        if comparison:
+            print(f"\n{'route':<28}{'metric':<8}{'before':>9}{'after':>9}{'change':>9}")
+            for name, metric, old, new, change, bad in comparison:
+                print(f"{name:<28}{metric:<8}{old:>9.2f}{new:>9.2f}{change:>+9.0%}" + ("  REGRESSED" if bad else ""))
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
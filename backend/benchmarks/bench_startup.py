@@ -0,0 +1,96 @@
+"""Measure cold-start latency of the backend: `import app` and create_app().
+
+Each run is a fresh interpreter with `python -X importtime`, so module caches
+don't hide regressions. Also reports the slowest imports made by app.py and
+checks that the heavy clients (boto3, huggingface_hub, google-auth, lxml,
+alembic) stay out of startup.
+
+Usage (from backend/):
+    python benchmarks/bench_startup.py [--runs 5] [--top 10] [--json]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Modules that should only load on first use of the feature that needs them.
+DEFERRED_MODULES = ["boto3", "botocore", "huggingface_hub", "google.auth", "google.oauth2", "lxml", "requests",
+                    "alembic", "flask_migrate", "numpy", "pypdf", "tokenizers"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.create_app()
+created = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+""" % (DEFERRED_MODULES,)
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def run_probe():
+    env = dict(os.environ)
+    # create_app() only needs a URI to configure the engine; nothing connects.
+    env.setdefault("DATABASE_URL", "sqlite://")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+
+    direct = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and len(match.group(3)) == 3:  # direct imports of `app`
+            direct[match.group(4)] = int(match.group(2)) / 1000
+    return json.loads(proc.stdout.strip().splitlines()[-1]), direct
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="How many of app's direct imports to list")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    probes, imports = [], {}
+    for _ in range(args.runs):
+        probe, direct = run_probe()
+        probes.append(probe)
+        for module, ms in direct.items():
+            imports.setdefault(module, []).append(ms)
+
+    slowest = sorted(((statistics.median(v), k) for k, v in imports.items()), reverse=True)[:args.top]
+    results = {
+        "runs": args.runs,
+        "import_ms": round(statistics.median(p["import_ms"] for p in probes), 2),
+        "create_app_ms": round(statistics.median(p["create_app_ms"] for p in probes), 2),
+        "deferred_modules_loaded": sorted({m for p in probes for m in p["loaded"]}),
+        "slowest_imports": [{"module": module, "cumulative_ms": round(ms, 2)} for ms, module in slowest],
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"import app:   {results['import_ms']:8.1f} ms (median of {args.runs})")
+    print(f"create_app(): {results['create_app_ms']:8.1f} ms")
+    print(f"deferred modules loaded at startup: {', '.join(results['deferred_modules_loaded']) or 'none'}")
+    print(f"\n{'module':<32}{'cumulative ms':>14}")
+    for entry in results["slowest_imports"]:
+        print(f"{entry['module']:<32}{entry['cumulative_ms']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""A local stand-in for the Hugging Face chat-completions endpoint.
+
+Answers POST /v1/chat/completions (and /chat/completions) with a JSON
+extraction built from the job text in the prompt, after a configurable
+delay, and can fail a share of requests with 503 to exercise retries.
+"stream": true gets server-sent chunks of a few characters, --token-delay
+apart, and --trailer adds chatty prose after the JSON like real models do.
+Counts requests, and streams the client hung up on, so tests and
+benchmarks can check how many inference calls were actually made and
+whether early stopping works.
+
+Point the backend at it with HF_INFERENCE_URL=http://127.0.0.1:<port>.
+
+Usage (from backend/):
+    python benchmarks/fake_inference.py [--port 8089] [--latency 0.5] [--fail-rate 0.1] [--token-delay 0.01]
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+JOB_TEXT = re.compile(r"---\s*(.*?)\s*---", re.DOTALL)
+CHUNK_CHARS = 4
+DEFAULT_TRAILER = ("\n\nNote: the location was taken from the page header and the job type was inferred "
+                   "from the posting. Let me know if you would like the description shortened or reformatted.")
+
+
+def fake_extraction(prompt):
+    match = JOB_TEXT.search(prompt)
+    text = match.group(1) if match else prompt
+    words = text.split()
+    return {
+        "title": " ".join(words[:3]) or "Software Engineer",
+        "company": "Example Corp",
+        "location": "Remote",
+        "job_type": "Full-Time",
+        "description": " ".join(words[:60]),
+    }
+
+
+class FakeInferenceServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, address=("127.0.0.1", 0), latency=0.0, fail_rate=0.0, token_delay=0.0, trailer="", seed=0):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.token_delay = token_delay
+        self.trailer = trailer
+        self.requests = 0
+        self.failures = 0
+        self.streams_cut = 0
+        self.active = 0
+        self.max_active = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve from a daemon thread; returns self so it can be used inline."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def reset(self):
+        with self._lock:
+            self.requests = self.failures = self.streams_cut = self.max_active = 0
+
+    def _enter(self):
+        with self._lock:
+            self.requests += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            fail = self._rng.random() < self.fail_rate
+            if fail:
+                self.failures += 1
+            return fail
+
+    def _leave(self):
+        with self._lock:
+            self.active -= 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send(404, {"error": "not found"})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        server = self.server
+        fail = server._enter()
+        try:
+            time.sleep(server.latency)
+            if fail:
+                self._send(503, {"error": "Model is overloaded"}, {"Retry-After": "0"})
+                return
+            prompt = " ".join(m.get("content") or "" for m in body.get("messages", []))
+            content = json.dumps(fake_extraction(prompt)) + server.trailer
+            pieces = [content[i:i + CHUNK_CHARS] for i in range(0, len(content), CHUNK_CHARS)]
+            if body.get("stream"):
+                self._stream(body.get("model"), pieces)
+                return
+            time.sleep(server.token_delay * len(pieces))
+            self._send(200, {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                          "total_tokens": (len(prompt) + len(content)) // 4},
+            })
+        finally:
+            server._leave()
+
+    def _stream(self, model, pieces):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            for piece in pieces:
+                chunk = {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "finish_reason": None,
+                                 "delta": {"role": "assistant", "content": piece}}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+                time.sleep(self.server.token_delay)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            with self.server._lock:
+                self.server.streams_cut += 1
+
+    def _send(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds to wait before answering")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Seconds per generated chunk")
+    parser.add_argument("--no-trailer", action="store_true", help="Reply with the JSON only, no prose after it")
+    args = parser.parse_args()
+
+    server = FakeInferenceServer(("127.0.0.1", args.port), latency=args.latency, fail_rate=args.fail_rate,
+                                 token_delay=args.token_delay, trailer="" if args.no_trailer else DEFAULT_TRAILER)
+    print(f"Fake inference server on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""A local job-board stand-in serving the HTML fixtures.
+
+GET /<name>.html serves benchmarks/fixtures/<name>.html with an ETag and
+Last-Modified, answers If-None-Match / If-Modified-Since with 304, and
+gzips the body when the client accepts it. A few extra routes exercise the
+fetcher's edge cases:
+
+    /big?mb=N           N MiB of HTML, streamed (size cutoff)
+    /bomb?mb=N          a small gzip body that inflates to N MiB
+    /latin1             a Latin-1 page declared in Content-Type
+    /slow?seconds=S     waits S seconds first (per-host limits)
+    /redirect?to=URL    302 to URL
+    /pdf                a non-HTML response
+
+Counts requests, 304s, connections opened and the most requests in flight,
+so benchmarks can check keep-alive reuse and concurrency limits. Fetch from
+it with FETCH_ALLOW_PRIVATE=1, since it listens on loopback.
+
+Usage (from backend/):
+    python benchmarks/fixture_http.py [--port 8090]
+"""
+import argparse
+import gzip
+import hashlib
+import os
+import sys
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+LATIN1_PAGE = ("<html><head><title>Développeur Senior - Café Société</title></head><body><h1>Développeur</h1>"
+               "<p>Rejoignez notre équipe à Montréal. Salaire négocié, télétravail partiel.</p></body></html>")
+FILLER = b"<p>" + b"Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 16 + b"</p>\n"
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, address=("127.0.0.1", 0)):
+        super().__init__(address, _Handler)
+        self.pages = {}
+        for name in os.listdir(FIXTURES_DIR):
+            if name.endswith(".html"):
+                path = os.path.join(FIXTURES_DIR, name)
+                with open(path, "rb") as f:
+                    body = f.read()
+                self.pages["/" + name] = (body, '"%s"' % hashlib.sha1(body).hexdigest(),
+                                          formatdate(os.path.getmtime(path), usegmt=True))
+        self.requests = 0
+        self.not_modified = 0
+        self.connections = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve from a daemon thread; returns self so it can be used inline."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def reset(self):
+        with self._lock:
+            self.requests = self.not_modified = self.connections = self.max_active = 0
+
+    def handle_error(self, request, client_address):
+        # Clients cutting a download short is expected here.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server._count("connections")
+
+    def do_GET(self):
+        server = self.server
+        with server._lock:
+            server.requests += 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            self._route()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        finally:
+            with server._lock:
+                server.active -= 1
+
+    def _route(self):
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        if parts.path in self.server.pages:
+            self._page(*self.server.pages[parts.path])
+        elif parts.path == "/big":
+            self._big(int(float(query.get("mb", 8)) * 1024 * 1024))
+        elif parts.path == "/bomb":
+            body = gzip.compress(b"<html><body>" + b" " * int(float(query.get("mb", 64)) * 1024 * 1024))
+            self._send(200, body, "text/html", {"Content-Encoding": "gzip"})
+        elif parts.path == "/latin1":
+            self._send(200, LATIN1_PAGE.encode("latin-1"), "text/html; charset=ISO-8859-1")
+        elif parts.path == "/slow":
+            time.sleep(float(query.get("seconds", 0.2)))
+            self._page(*self.server.pages["/lever_sections.html"])
+        elif parts.path == "/redirect":
+            self._send(302, b"", "text/html", {"Location": query.get("to", "/")})
+        elif parts.path == "/pdf":
+            self._send(200, b"%PDF-1.4\n%fake\n", "application/pdf")
+        else:
+            self._send(404, b"<html><body>Not found</body></html>", "text/html")
+
+    def _page(self, body, etag, last_modified):
+        validators = {"ETag": etag, "Last-Modified": last_modified}
+        if self.headers.get("If-None-Match") == etag or (
+                not self.headers.get("If-None-Match") and self.headers.get("If-Modified-Since") == last_modified):
+            self.server._count("not_modified")
+            self._send(304, b"", None, validators)
+            return
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            validators["Content-Encoding"] = "gzip"
+        self._send(200, body, "text/html; charset=utf-8", validators)
+
+    def _big(self, size):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        sent = 0
+        while sent < size:
+            chunk = FILLER[:size - sent]
+            self.wfile.write(chunk)
+            sent += len(chunk)
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8090)
+    args = parser.parse_args()
+
+    server = FixtureServer(("127.0.0.1", args.port))
+    print(f"Fixture job board on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Replay the malformed-reply corpus through the streaming JSON extractor.
+
+Each fixtures/llm_responses/<name>.txt is a chat-model reply (prose around
+the JSON, code fences, braces inside strings, trailing commas, truncation,
+...) and expected.json holds the fields it should yield, or null when it
+should be rejected. Every reply is fed whole, one character at a time and
+in random chunks; the extractor must agree with expected.json in all three.
+Also reports how much of each reply was read before the object closed,
+which is what a stream skips by stopping early.
+
+Exits non-zero on any mismatch.
+
+Usage (from backend/):
+    python benchmarks/replay_llm_responses.py [--json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from llm_extraction import JsonStreamParser  # noqa: E402
+
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "llm_responses")
+
+
+def chunkings(text, rng):
+    yield "whole", [text]
+    yield "chars", list(text)
+    pieces, i = [], 0
+    while i < len(text):
+        step = rng.randint(1, 12)
+        pieces.append(text[i:i + step])
+        i += step
+    yield "random", pieces
+
+
+def replay(chunks):
+    """(fields or None, characters read before the parser was satisfied)."""
+    parser = JsonStreamParser()
+    read = 0
+    for chunk in chunks:
+        read += len(chunk)
+        if parser.feed(chunk):
+            break
+    try:
+        return parser.result(), read
+    except ValueError:
+        return None, read
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    with open(os.path.join(CORPUS_DIR, "expected.json")) as f:
+        expected = json.load(f)
+
+    rng = random.Random(0)
+    rows = []
+    for name in sorted(expected):
+        with open(os.path.join(CORPUS_DIR, f"{name}.txt")) as f:
+            text = f.read()
+        failures = []
+        read = len(text)
+        for mode, chunks in chunkings(text, rng):
+            fields, read_in_mode = replay(chunks)
+            if fields != expected[name]:
+                failures.append(mode)
+            if mode == "chars":
+                read = read_in_mode
+        rows.append({
+            "response": name,
+            "recovered": expected[name] is not None,
+            "ok": not failures,
+            "failed_modes": failures,
+            "read_chars": read,
+            "total_chars": len(text),
+        })
+
+    failed = [row for row in rows if not row["ok"]]
+    if args.json:
+        print(json.dumps({"responses": rows, "failed": len(failed)}, indent=2))
+    else:
+        print(f"{'response':<22}{'expect':>10}{'ok':>6}{'read/total chars':>20}")
+        for row in rows:
+            status = "ok" if row["ok"] else "FAIL"
+            print(f"{row['response']:<22}{'fields' if row['recovered'] else 'reject':>10}{status:>6}"
+                  f"{row['read_chars']:>12}/{row['total_chars']:<7}"
+                  + (f"  ({', '.join(row['failed_modes'])})" if row["failed_modes"] else ""))
+        print(f"\n{len(rows) - len(failed)}/{len(rows)} responses handled as expected")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Seed a database with synthetic users, applications, their status history and resumes for benchmarks.
+
+Rows are generated from a fixed seed, so the same arguments always produce
+the same data, and inserted with batched core INSERTs (1M applications
+take about a minute on SQLite). Rollups are rebuilt for everyone; duplicate
+signatures only for the first --active-users users, the ones benchmarks
+send requests as, because MinHashing every row would dominate seeding.
+
+On PostgreSQL, run `flask db upgrade` against the database first so the
+search_vector column and its indexes exist; on SQLite the tables are
+created from the models.
+
+Usage (from backend/):
+    python benchmarks/seed_data.py --database-url sqlite:////tmp/careervault-bench.db [--rows 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+DEFAULT_DATABASE_URL = "sqlite:////tmp/careervault-bench.db"
+BATCH_SIZE = 5000
+
+TITLES = ["Software Engineer", "Backend Engineer", "Frontend Developer", "Data Scientist", "Product Manager",
+          "Site Reliability Engineer", "Machine Learning Engineer", "QA Engineer", "DevOps Engineer",
+          "Full Stack Developer", "Data Engineer", "Security Engineer", "Mobile Developer", "Engineering Manager"]
+LEVELS = ["", "Senior ", "Staff ", "Junior ", "Lead ", "Principal "]
+COMPANIES = [f"{a}{b}" for a in ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Vandelay", "Stark", "Wayne",
+                                 "Wonka", "Cyberdyne", "Soylent", "Tyrell", "Aperture", "Massive", "Pied")
+             for b in ("", " Labs", " Systems", " Analytics", " Cloud", " Health", " Robotics")]
+LOCATIONS = ["Remote", "New York, NY", "San Francisco, CA", "Seattle, WA", "Austin, TX", "Boston, MA", "Chicago, IL",
+             "Denver, CO", "London, UK", "Toronto, ON", "Berlin, DE", None]
+JOB_TYPES = ["Full-Time", "Part-Time", "Contract", "Internship", None]
+STATUSES = ["Applied"] * 6 + ["Interview"] * 2 + ["Rejected"] * 3 + ["Offer"]
+METHODS = ["Company Website", "LinkedIn", "Referral", "Indeed", None]
+WORDS = ("python java golang rust react typescript kubernetes aws gcp postgres redis kafka spark airflow terraform "
+         "docker graphql grpc microservices distributed systems scalable reliable observability testing design "
+         "mentor collaborate ship customers product roadmap ownership agile api backend frontend data pipelines "
+         "machine learning models analytics security compliance performance latency throughput").split()
+
+
+def app_rows(user_id, count, rng, now):
+    for _ in range(count):
+        applied_at = now - timedelta(days=rng.random() * 720)
+        title = rng.choice(LEVELS) + rng.choice(TITLES)
+        company = rng.choice(COMPANIES)
+        yield {
+            "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+            "user_id": user_id,
+            "company_name": company,
+            "title": title,
+            "job_type": rng.choice(JOB_TYPES),
+            "location": rng.choice(LOCATIONS),
+            "application_url": f"https://jobs.example.com/{company.split()[0].lower()}/{rng.getrandbits(40):x}",
+            "application_method": rng.choice(METHODS),
+            "description": " ".join(rng.choices(WORDS, k=rng.randint(20, 80))),
+            "status": rng.choice(STATUSES),
+            "applied_at": applied_at,
+            "updated_at": applied_at + timedelta(days=rng.random() * 30),
+        }
+
+
+def event_rows(apps):
+    """Status history matching the applications: created as Applied, moved on at the last update."""
+    for app in apps:
+        yield {"user_id": app["user_id"], "application_id": app["id"], "from_status": None, "to_status": "Applied",
+               "occurred_at": app["applied_at"]}
+        if app["status"] != "Applied":
+            yield {"user_id": app["user_id"], "application_id": app["id"], "from_status": "Applied",
+                   "to_status": app["status"], "occurred_at": app["updated_at"]}
+
+
+def seed(db, rows=10000, apps_per_user=500, resumes_per_user=5, active=20, random_seed=0, bucket="careervault-bench",
+         log=print):
+    """Insert the data; returns the number of users, applications and resumes created."""
+    from dedupe import rebuild_signatures
+    from insights import rebuild_rollups
+    from models import ApplicationEvent, JobApplication, Resume, User
+
+    rng = random.Random(random_seed)
+    now = datetime.utcnow()
+    users = max(1, -(-rows // apps_per_user))
+    start = time.perf_counter()
+
+    user_rows = [{"id": uuid.UUID(int=rng.getrandbits(128), version=4), "email": f"bench{i}@example.com",
+                  "name": f"Bench User {i}", "created_at": now} for i in range(users)]
+    for i in range(0, len(user_rows), BATCH_SIZE):
+        db.session.execute(User.__table__.insert(), user_rows[i:i + BATCH_SIZE])
+
+    batch, inserted = [], 0
+    for n, user in enumerate(user_rows):
+        count = min(apps_per_user, rows - n * apps_per_user)
+        for row in app_rows(user["id"], count, rng, now):
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                db.session.execute(JobApplication.__table__.insert(), batch)
+                db.session.execute(ApplicationEvent.__table__.insert(), list(event_rows(batch)))
+                inserted += len(batch)
+                batch = []
+        if n and n % 200 == 0:
+            log(f"  {inserted} applications...")
+    if batch:
+        db.session.execute(JobApplication.__table__.insert(), batch)
+        db.session.execute(ApplicationEvent.__table__.insert(), list(event_rows(batch)))
+
+    resume_rows = []
+    for user in user_rows:
+        for j in range(resumes_per_user):
+            key = f"resumes/{user['id']}/{j}-cv.pdf"
+            resume_rows.append({
+                "id": uuid.UUID(int=rng.getrandbits(128), version=4), "user_id": user["id"], "s3_key": key,
+                "filename": f"cv-{j}.pdf", "file_url": f"https://{bucket}.s3.amazonaws.com/{key}",
+                "uploaded_at": now - timedelta(days=rng.random() * 365),
+            })
+    for i in range(0, len(resume_rows), BATCH_SIZE):
+        db.session.execute(Resume.__table__.insert(), resume_rows[i:i + BATCH_SIZE])
+    db.session.commit()
+    log(f"  inserted {users} users, {rows} applications, {len(resume_rows)} resumes "
+        f"in {time.perf_counter() - start:.1f}s")
+
+    rebuild_rollups()
+    for user in user_rows[:active]:
+        rebuild_signatures(user["id"])
+    db.session.commit()
+    log(f"  rollups and signatures rebuilt, {time.perf_counter() - start:.1f}s total")
+    return {"users": users, "applications": rows, "resumes": len(resume_rows)}
+
+
+def active_users(db, count):
+    """The users benchmarks act as: the first `count` by email, as seeded."""
+    from models import User
+
+    emails = [f"bench{i}@example.com" for i in range(count)]
+    return User.query.filter(User.email.in_(emails)).order_by(User.email).all()
+
+
+def seeded_counts(db):
+    from models import JobApplication, Resume, User
+
+    return {
+        "users": db.session.query(User).count(),
+        "applications": db.session.query(JobApplication).count(),
+        "resumes": db.session.query(Resume).count(),
+    }
+
+
+def prepare(app, db, rows, apps_per_user, resumes_per_user, active, reuse=False, log=print):
+    """Create tables if needed and seed, unless reuse is set and the counts already match."""
+    with app.app_context():
+        if app.config["SQLALCHEMY_DATABASE_URI"].startswith("sqlite"):
+            db.create_all()
+        users = max(1, -(-rows // apps_per_user))
+        expected = {"users": users, "applications": rows, "resumes": users * resumes_per_user}
+        counts = seeded_counts(db)
+        if reuse and counts == expected:
+            log(f"Reusing seeded database ({rows} applications)")
+            return counts
+        if any(counts.values()):
+            log("Clearing existing rows")
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+        log(f"Seeding {rows} applications for {users} users")
+        return seed(db, rows, apps_per_user, resumes_per_user, active, log=log)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=10000, help="Applications to create (1k to 1M)")
+    parser.add_argument("--apps-per-user", type=int, default=500)
+    parser.add_argument("--resumes-per-user", type=int, default=5)
+    parser.add_argument("--active-users", type=int, default=20, help="Users that get duplicate signatures")
+    parser.add_argument("--reuse", action="store_true", help="Skip seeding if the row counts already match")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url
+    from app import create_app
+    from extensions import db
+
+    prepare(create_app(), db, args.rows, args.apps_per_user, args.resumes_per_user, args.active_users, args.reuse)
+
+
+if __name__ == "__main__":
+    main()
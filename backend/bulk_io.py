@@ -0,0 +1,217 @@
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+from extensions import db
+from models import JobApplication
+from insights import rollup_buckets, record_bulk
+from timeline import record_status_changes
+from dedupe import index_applications
+from pagination import CursorError, parse_datetime_param
+
+
+IMPORT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+VALID_STATUSES = {"Applied", "Interview", "Offer", "Rejected"}
+
+EXPORT_FIELDS = [
+    "id", "title", "company", "job_type", "location", "status", "applied_at", "updated_at",
+    "application_url", "application_method", "resume_used", "description",
+]
+
+# import field -> (model attribute, max length)
+IMPORT_FIELDS = {
+    "title": ("title", 255),
+    "company": ("company_name", 255),
+    "job_type": ("job_type", 50),
+    "location": ("location", 255),
+    "status": ("status", 50),
+    "application_url": ("application_url", 1024),
+    "application_method": ("application_method", 50),
+    "description": ("description", None),
+}
+REQUIRED_FIELDS = ("title", "company", "application_url")
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def detect_format(filename, requested=None):
+    fmt = (requested or "").lower() or filename.rsplit(".", 1)[-1].lower()
+    if fmt in ("jsonl", "ndjson"):
+        return "ndjson"
+    if fmt == "csv":
+        return "csv"
+    raise ImportFormatError("Unsupported format; upload a .csv or .ndjson file")
+
+
+def iter_upload_rows(stream, fmt):
+    """Yield (line number, row dict or None, error or None) without reading the whole upload."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+
+    for line_no, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield line_no, None, "Each line must be a JSON object"
+            continue
+        yield line_no, row, None
+
+
+def validate_row(row, user_id, now):
+    """Turn an upload row into an insert mapping, or return an error message."""
+    if "company" not in row and "company_name" in row:
+        row["company"] = row["company_name"]
+
+    mapping = {"id": uuid.uuid4(), "user_id": user_id, "updated_at": now}
+    for field, (attr, max_length) in IMPORT_FIELDS.items():
+        value = row.get(field)
+        value = str(value).strip() if value is not None else ""
+        if not value:
+            if field in REQUIRED_FIELDS:
+                return None, f"Missing {field}"
+            value = None
+        elif max_length and len(value) > max_length:
+            return None, f"{field} is longer than {max_length} characters"
+        mapping[attr] = value
+
+    mapping["status"] = mapping["status"] or "Applied"
+    if mapping["status"] not in VALID_STATUSES:
+        return None, f"Invalid status: {mapping['status']}"
+
+    applied_at = row.get("applied_at")
+    if applied_at not in (None, "") and not isinstance(applied_at, str):
+        return None, "applied_at must be an ISO-8601 string"
+    try:
+        mapping["applied_at"] = parse_datetime_param(applied_at) or now
+    except CursorError as e:
+        return None, str(e)
+    return mapping, None
+
+
+def validate_update(data):
+    """Error message for PATCH-style fields that can't be saved, or None.
+
+    Only the fields present are checked: required ones can't be cleared,
+    lengths and statuses follow the import rules.
+    """
+    fields = dict(IMPORT_FIELDS, company_name=IMPORT_FIELDS["company"])
+    for field, (_, max_length) in fields.items():
+        if field not in data:
+            continue
+        value = data[field]
+        if value is None or (isinstance(value, str) and not value.strip()):
+            if field in REQUIRED_FIELDS or field == "company_name":
+                return f"{field} can't be empty"
+            continue
+        if not isinstance(value, str):
+            return f"{field} must be a string"
+        if max_length and len(value) > max_length:
+            return f"{field} is longer than {max_length} characters"
+    if "status" in data and data["status"] not in VALID_STATUSES:
+        return f"Invalid status: {data['status']}"
+    if data.get("resume_used") is not None:
+        try:
+            uuid.UUID(str(data["resume_used"]))
+        except ValueError:
+            return "resume_used must be a resume id"
+    return None
+
+
+def import_applications(user_id, rows, batch_size=IMPORT_BATCH_SIZE):
+    """Validate and insert uploaded rows in batches inside one transaction.
+
+    Rows that fail validation are skipped and reported; the rest commit
+    together, along with the matching insights rollup deltas, status history
+    and duplicate detection signatures.
+    """
+    now = datetime.utcnow()
+    imported = 0
+    errors = []
+    error_count = 0
+    batch = []
+
+    def flush():
+        nonlocal imported
+        if not batch:
+            return
+        db.session.bulk_insert_mappings(JobApplication, batch)
+        rows = [SimpleNamespace(**m) for m in batch]
+        record_bulk(user_id, [rollup_buckets(row) for row in rows])
+        record_status_changes(user_id, [(row.id, None, row.status, row.applied_at) for row in rows])
+        index_applications(user_id, rows)
+        imported += len(batch)
+        batch.clear()
+
+    for line_no, row, error in rows:
+        mapping = None
+        if error is None:
+            mapping, error = validate_row(row, user_id, now)
+        if error is not None:
+            error_count += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"line": line_no, "error": error})
+            continue
+        batch.append(mapping)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+
+    db.session.commit()
+    return {"imported": imported, "failed": error_count, "errors": errors}
+
+
+def export_applications(user_id, fmt, batch_size=IMPORT_BATCH_SIZE):
+    """Yield the user's applications as CSV or NDJSON chunks, one batch at a time."""
+    query = (
+        db.session.query(
+            JobApplication.id, JobApplication.title, JobApplication.company_name, JobApplication.job_type,
+            JobApplication.location, JobApplication.status, JobApplication.applied_at, JobApplication.updated_at,
+            JobApplication.application_url, JobApplication.application_method, JobApplication.resume_used,
+            JobApplication.description,
+        )
+        .filter(JobApplication.user_id == user_id)
+        .order_by(JobApplication.applied_at, JobApplication.id)
+        .execution_options(stream_results=True, yield_per=batch_size)
+    )
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(EXPORT_FIELDS)
+
+    for count, row in enumerate(query, start=1):
+        record = [_export_value(value) for value in row]
+        if writer:
+            writer.writerow(record)
+        else:
+            buffer.write(json.dumps(dict(zip(EXPORT_FIELDS, record))) + "\n")
+
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat() + "Z"
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
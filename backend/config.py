@@ -0,0 +1,48 @@
+import os
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def env_bool(name, default):
+    value = os.environ.get(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def available_cpus():
+    """CPUs this process may actually use, honouring cgroup quotas (e.g. docker `cpus: 0.75`)."""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(float(quota) / float(period), 0.1)
+    except (OSError, ValueError):
+        pass
+    try:
+        return float(len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return float(os.cpu_count() or 1)
+
+
+def engine_options(database_url):
+    """SQLALCHEMY_ENGINE_OPTIONS from DB_POOL_* environment variables.
+
+    Each gunicorn worker process gets its own pool, so DB_POOL_SIZE should
+    cover that worker's threads and workers * (size + overflow) must stay
+    under the database's connection limit.
+    """
+    options = {
+        "pool_pre_ping": env_bool("DB_POOL_PRE_PING", True),
+        "pool_recycle": env_int("DB_POOL_RECYCLE", 1800),
+    }
+    if database_url and not database_url.startswith("sqlite"):
+        options.update(
+            pool_size=env_int("DB_POOL_SIZE", 10),
+            max_overflow=env_int("DB_MAX_OVERFLOW", 5),
+            pool_timeout=env_int("DB_POOL_TIMEOUT", 30),
+        )
+    return options
@@ -0,0 +1,293 @@
+import hashlib
+import os
+import random
+import zlib
+from collections import defaultdict
+from functools import lru_cache
+from itertools import combinations
+
+from extensions import db
+from models import ApplicationSignature, ApplicationLshBucket, JobApplication
+from parse_cache import normalize_url
+from search import tokenize
+
+
+NUM_PERM = 64
+LSH_BANDS = 16
+ROWS_PER_BAND = NUM_PERM // LSH_BANDS
+# With 16 bands of 4 rows, pairs above ~0.5 Jaccard usually share a bucket;
+# candidates are then confirmed against this estimated similarity.
+DUPLICATE_THRESHOLD = float(os.environ.get("DUPLICATE_THRESHOLD", 0.7))
+# Buckets bigger than this (e.g. many empty descriptions) aren't expanded into pairs.
+MAX_BUCKET_SIZE = 50
+ID_BATCH = 500
+CONTENT_FIELDS = ("title", "company", "company_name", "description", "application_url")
+
+_PRIME = (1 << 31) - 1
+# Fixed seed: signatures are stored, so every process must hash the same way.
+_rng = random.Random(0x5EED)
+_PERM_A = [_rng.randrange(1, _PRIME) for _ in range(NUM_PERM)]
+_PERM_B = [_rng.randrange(0, _PRIME) for _ in range(NUM_PERM)]
+
+
+def application_url_key(url):
+    """Hash of the URL with tracking params, scheme, "www." and trailing slash stripped."""
+    if not url or not url.strip():
+        return None
+    normalized = normalize_url(url).split("://", 1)[-1]
+    if normalized.startswith("www."):
+        normalized = normalized[4:]
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def shingles(title, company, description):
+    """Title and company words plus word 3-grams of the description."""
+    result = {"t:" + t for t in tokenize(title)}
+    result.update("c:" + t for t in tokenize(company))
+    words = tokenize(description)
+    result.update(" ".join(words[i:i + 3]) for i in range(max(len(words) - 2, 0)))
+    if 0 < len(words) < 3:
+        result.add(" ".join(words))
+    return result
+
+
+@lru_cache(maxsize=1)
+def _permutations():
+    import numpy as np
+
+    return np.asarray(_PERM_A, dtype=np.uint64), np.asarray(_PERM_B, dtype=np.uint64)
+
+
+def minhash(shingle_set):
+    """MinHash signature (NUM_PERM uint32s), or None for an empty set."""
+    import numpy as np
+
+    if not shingle_set:
+        return None
+    a, b = _permutations()
+    x = np.fromiter((zlib.crc32(s.encode()) & _PRIME for s in shingle_set), dtype=np.uint64, count=len(shingle_set))
+    return ((np.outer(x, a) + b) % _PRIME).min(axis=0).astype("<u4")
+
+
+def band_hashes(signature):
+    hashes = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes()
+        digest = hashlib.blake2b(bytes([band]) + rows, digest_size=8).digest()
+        hashes.append(int.from_bytes(digest, "big", signed=True))
+    return hashes
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity: the share of MinHash slots that agree."""
+    import numpy as np
+
+    return float(np.count_nonzero(_unpack(sig_a) == _unpack(sig_b))) / NUM_PERM
+
+
+def _unpack(raw):
+    import numpy as np
+
+    return np.frombuffer(raw, dtype="<u4")
+
+
+def _signature_rows(user_id, app):
+    signature = minhash(shingles(app.title, app.company_name, app.description))
+    row = {
+        "application_id": app.id,
+        "user_id": user_id,
+        "url_key": application_url_key(app.application_url),
+        "minhash": signature.tobytes() if signature is not None else None,
+    }
+    buckets = [
+        {"user_id": user_id, "band_hash": h, "application_id": app.id}
+        for h in (band_hashes(signature) if signature is not None else [])
+    ]
+    return row, buckets
+
+
+def remove_applications(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), ID_BATCH):
+        chunk = ids[start:start + ID_BATCH]
+        ApplicationLshBucket.query.filter(ApplicationLshBucket.application_id.in_(chunk)).delete(
+            synchronize_session=False)
+        ApplicationSignature.query.filter(ApplicationSignature.application_id.in_(chunk)).delete(
+            synchronize_session=False)
+
+
+def index_applications(user_id, apps):
+    """(Re)compute signatures and LSH buckets for apps in the current transaction.
+
+    apps only need id, title, company_name, description and application_url,
+    so import mappings can be passed as SimpleNamespaces.
+    """
+    apps = list(apps)
+    if not apps:
+        return
+    remove_applications([app.id for app in apps])
+    rows, buckets = [], []
+    for app in apps:
+        row, app_buckets = _signature_rows(user_id, app)
+        rows.append(row)
+        buckets.extend(app_buckets)
+    db.session.bulk_insert_mappings(ApplicationSignature, rows)
+    db.session.bulk_insert_mappings(ApplicationLshBucket, buckets)
+
+
+def touches_content(data):
+    return any(field in data for field in CONTENT_FIELDS)
+
+
+def find_duplicates(user_id, app_id, limit=5):
+    """Likely duplicates of one (already indexed) application: [(id, similarity, reason)].
+
+    Only applications sharing its URL key or one of its LSH buckets are
+    compared, both looked up through indexes, so the cost tracks the number
+    of candidates rather than the size of the user's list.
+    """
+    mine = db.session.get(ApplicationSignature, app_id)
+    if mine is None:
+        return []
+
+    by_url = set()
+    if mine.url_key:
+        by_url = {
+            row[0] for row in db.session.query(ApplicationSignature.application_id).filter(
+                ApplicationSignature.user_id == user_id,
+                ApplicationSignature.url_key == mine.url_key,
+                ApplicationSignature.application_id != app_id,
+            )
+        }
+
+    candidates = set()
+    if mine.minhash is not None:
+        my_buckets = db.session.query(ApplicationLshBucket.band_hash).filter(
+            ApplicationLshBucket.application_id == app_id)
+        candidates = {
+            row[0] for row in db.session.query(ApplicationLshBucket.application_id).filter(
+                ApplicationLshBucket.user_id == user_id,
+                ApplicationLshBucket.band_hash.in_(my_buckets),
+                ApplicationLshBucket.application_id != app_id,
+            ).distinct()
+        }
+
+    found = {other_id: (1.0, "url") for other_id in by_url}
+    if candidates:
+        rows = db.session.query(ApplicationSignature.application_id, ApplicationSignature.minhash).filter(
+            ApplicationSignature.application_id.in_(candidates - by_url))
+        for other_id, other_sig in rows:
+            score = similarity(mine.minhash, other_sig)
+            if score >= DUPLICATE_THRESHOLD:
+                found[other_id] = (score, "content")
+
+    ranked = sorted(found.items(), key=lambda item: (-item[1][0], str(item[0])))[:limit]
+    return [(other_id, score, reason) for other_id, (score, reason) in ranked]
+
+
+def duplicate_clusters(user_id):
+    """Groups of a user's applications that share a URL key or are MinHash near-duplicates.
+
+    Returns a list of (set of application ids, highest pairwise similarity).
+    """
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(a, b):
+        parent[find(a)] = find(b)
+
+    best = defaultdict(float)
+
+    shared_urls = (
+        db.session.query(ApplicationSignature.url_key)
+        .filter(ApplicationSignature.user_id == user_id, ApplicationSignature.url_key.isnot(None))
+        .group_by(ApplicationSignature.url_key)
+        .having(db.func.count() > 1)
+    )
+    groups = defaultdict(list)
+    for url_key, app_id in db.session.query(ApplicationSignature.url_key, ApplicationSignature.application_id).filter(
+            ApplicationSignature.user_id == user_id, ApplicationSignature.url_key.in_(shared_urls)):
+        groups[url_key].append(app_id)
+    for ids in groups.values():
+        for other in ids[1:]:
+            union(ids[0], other)
+            best[other] = 1.0
+
+    shared_buckets = (
+        db.session.query(ApplicationLshBucket.band_hash)
+        .filter(ApplicationLshBucket.user_id == user_id)
+        .group_by(ApplicationLshBucket.band_hash)
+        .having(db.func.count() > 1)
+    )
+    buckets = defaultdict(list)
+    for band_hash, app_id in db.session.query(ApplicationLshBucket.band_hash, ApplicationLshBucket.application_id).filter(
+            ApplicationLshBucket.user_id == user_id, ApplicationLshBucket.band_hash.in_(shared_buckets)):
+        buckets[band_hash].append(app_id)
+
+    pairs = set()
+    for ids in buckets.values():
+        if len(ids) <= MAX_BUCKET_SIZE:
+            pairs.update(tuple(sorted(pair, key=str)) for pair in combinations(ids, 2))
+
+    if pairs:
+        involved = list({app_id for pair in pairs for app_id in pair})
+        signatures = {}
+        for start in range(0, len(involved), ID_BATCH):
+            signatures.update(
+                db.session.query(ApplicationSignature.application_id, ApplicationSignature.minhash)
+                .filter(ApplicationSignature.application_id.in_(involved[start:start + ID_BATCH]))
+                .all()
+            )
+        for a, b in pairs:
+            if find(a) == find(b):
+                continue
+            score = similarity(signatures[a], signatures[b])
+            if score >= DUPLICATE_THRESHOLD:
+                union(a, b)
+                best[a] = max(best[a], score)
+                best[b] = max(best[b], score)
+
+    clusters = defaultdict(set)
+    for app_id in parent:
+        clusters[find(app_id)].add(app_id)
+    return [
+        (ids, max(best[i] for i in ids))
+        for ids in clusters.values() if len(ids) > 1
+    ]
+
+
+def rebuild_signatures(user_id=None, batch_size=1000):
+    """Recompute every signature (optionally for one user); returns how many were indexed."""
+    query = db.session.query(
+        JobApplication.id, JobApplication.user_id, JobApplication.title, JobApplication.company_name,
+        JobApplication.description, JobApplication.application_url,
+    ).order_by(JobApplication.user_id, JobApplication.id)
+    if user_id is not None:
+        query = query.filter(JobApplication.user_id == user_id)
+
+    count = 0
+    batch = []
+    for row in query.yield_per(batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            count += _rebuild_batch(batch)
+    count += _rebuild_batch(batch)
+    db.session.commit()
+    return count
+
+
+def _rebuild_batch(batch):
+    by_user = defaultdict(list)
+    for row in batch:
+        by_user[row.user_id].append(row)
+    for user_id, apps in by_user.items():
+        index_applications(user_id, apps)
+    count = len(batch)
+    batch.clear()
+    return count
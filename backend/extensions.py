@@ -0,0 +1,92 @@
+import threading
+
+from flask import current_app
+from flask_cors import CORS
+from flask_sqlalchemy import SQLAlchemy
+
+
+db = SQLAlchemy()
+cors = CORS()
+
+# One lock per client name, so a slow build (say, downloading the tokenizer)
+# doesn't hold up the first S3 or Google call on other threads.
+_client_locks = {}
+
+
+def _client(name, build):
+    """Build a client once per app, on first use, and reuse it afterwards.
+
+    Keeps boto3/huggingface_hub/google-auth out of import time, so worker
+    boot and routes that never touch them don't pay for them.
+    """
+    clients = current_app.extensions.setdefault("careervault_clients", {})
+    client = clients.get(name)
+    if client is None:
+        with _client_locks.setdefault(name, threading.Lock()):
+            client = clients.get(name)
+            if client is None:
+                client = clients[name] = build(current_app.config)
+    return client
+
+
+def _hf_options(config):
+    options = {"api_key": config["HF_TOKEN"], "timeout": config.get("HF_TIMEOUT")}
+    if config.get("HF_INFERENCE_URL"):
+        options["base_url"] = config["HF_INFERENCE_URL"]
+    else:
+        options["provider"] = "hf-inference"
+    return options
+
+
+def new_hf_client():
+    """A fresh InferenceClient, meant to be closed after one call.
+
+    huggingface_hub holds every response a client opens until the client is
+    closed, and closing it is the only way to abandon a stream, so clients
+    aren't shared. They are cheap: the HTTP connection pool is global.
+    """
+    from huggingface_hub import InferenceClient
+
+    return InferenceClient(**_hf_options(current_app.config))
+
+
+def get_token_counter():
+    def build(config):
+        from prompt_compaction import TokenCounter
+
+        return TokenCounter.load(config["LLM_TOKENIZER"], config["HF_TOKEN"])
+
+    return _client("tokenizer", build)
+
+
+def get_page_fetcher():
+    def build(config):
+        from page_fetch import PageFetcher
+
+        return PageFetcher(allow_private=config["FETCH_ALLOW_PRIVATE"])
+
+    return _client("page_fetcher", build)
+
+
+def get_s3_client():
+    def build(config):
+        import boto3
+        from metrics import instrument_boto3
+
+        return instrument_boto3(boto3.client(
+            "s3",
+            aws_access_key_id=config["AWS_ACCESS_KEY_ID"],
+            aws_secret_access_key=config["AWS_SECRET_ACCESS_KEY"],
+            endpoint_url=config.get("AWS_S3_ENDPOINT_URL"),
+        ))
+
+    return _client("s3", build)
+
+
+def get_google_request():
+    def build(config):
+        from auth import CachingGoogleRequest
+
+        return CachingGoogleRequest()
+
+    return _client("google_request", build)
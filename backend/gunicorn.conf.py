@@ -0,0 +1,55 @@
+# Production serving profile: gunicorn -c gunicorn.conf.py "app:create_app()"
+#
+# Every setting can be overridden from the environment.
+import math
+import os
+import shutil
+import sys
+import tempfile
+
+# gunicorn reads this file before the app directory is on sys.path.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import available_cpus, env_int  # noqa: E402
+
+
+bind = f"0.0.0.0:{env_int('PORT', 5000)}"
+
+# parse-url tasks live in the memory of the worker that accepted them, and
+# polls for a task that land on another worker get a 404. So by default one
+# threaded worker serves everything: requests mostly wait on Postgres, S3 and
+# HTTP, which threads overlap, and the thread count scales with the CPUs
+# (keep DB_POOL_SIZE + DB_MAX_OVERFLOW above it). Only raise WEB_CONCURRENCY
+# behind sticky routing.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+workers = env_int("WEB_CONCURRENCY", 1)
+threads = env_int("GUNICORN_THREADS", max(8, 2 * math.ceil(available_cpus())))
+
+timeout = env_int("GUNICORN_TIMEOUT", 60)
+graceful_timeout = env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = env_int("GUNICORN_KEEPALIVE", 5)
+
+# Recycling a worker after GUNICORN_MAX_REQUESTS requests caps slow memory
+# growth, but drops its parse tasks, so it's off unless set (with jitter so
+# several workers don't restart together).
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 0)
+max_requests_jitter = env_int("GUNICORN_MAX_REQUESTS_JITTER", 200)
+
+accesslog = "-"
+errorlog = "-"
+
+# Each worker keeps its Prometheus metrics in files here so /metrics, served
+# by whichever worker, reports all of them. Must be set before the app (and
+# prometheus_client) is imported, and emptied on every start.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "careervault-metrics"))
+
+
+def on_starting(server):
+    shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"])
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,148 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from extensions import db
+from models import JobApplication, ApplicationRollup
+
+
+DIMENSIONS = ("status", "job_type", "location", "week")
+# Each funnel stage counts applications that got at least that far.
+FUNNEL_STAGES = (
+    ("Applied", None),
+    ("Interview", ("Interview", "Offer")),
+    ("Offer", ("Offer",)),
+)
+UNKNOWN = "Unknown"
+
+
+def rollup_buckets(app):
+    """Map an application to the rollup bucket it counts towards in each dimension."""
+    applied_at = app.applied_at
+    week = (applied_at.date() - timedelta(days=applied_at.weekday())).isoformat() if applied_at else UNKNOWN
+    return {
+        "status": app.status or UNKNOWN,
+        "job_type": app.job_type or UNKNOWN,
+        "location": (app.location or "").strip()[:255] or UNKNOWN,
+        "week": week,
+    }
+
+
+def _upsert(rows):
+    if not rows:
+        return
+    dialect = db.engine.dialect.name
+    insert = pg_insert if dialect == "postgresql" else sqlite_insert
+    stmt = insert(ApplicationRollup).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "dimension", "bucket"],
+        set_={"count": ApplicationRollup.count + stmt.excluded.count},
+    )
+    db.session.execute(stmt)
+
+
+def record_change(user_id, before=None, after=None):
+    """Adjust the user's rollups for one application change.
+
+    before/after are rollup_buckets() snapshots: pass only after for a create,
+    only before for a delete, and both for an update. Runs inside the caller's
+    transaction, so counts commit (or roll back) with the row itself.
+    """
+    record_changes(user_id, [(before, after)])
+
+
+def record_changes(user_id, changes):
+    """record_change() for many (before, after) pairs, applied as one upsert."""
+    delta = Counter()
+    for before, after in changes:
+        for dimension in DIMENSIONS:
+            old = before[dimension] if before else None
+            new = after[dimension] if after else None
+            if old == new:
+                continue
+            if old is not None:
+                delta[(dimension, old)] -= 1
+            if new is not None:
+                delta[(dimension, new)] += 1
+    _apply(user_id, delta)
+
+
+def record_bulk(user_id, created):
+    """Count many newly inserted applications (rollup_buckets() snapshots) in one upsert."""
+    delta = Counter()
+    for after in created:
+        for dimension in DIMENSIONS:
+            delta[(dimension, after[dimension])] += 1
+    _apply(user_id, delta)
+
+
+def _apply(user_id, delta):
+    _upsert([
+        {"user_id": user_id, "dimension": dimension, "bucket": bucket, "count": count}
+        for (dimension, bucket), count in delta.items() if count
+    ])
+
+
+def get_insights(user_id):
+    """Build the insights payload from the user's rollup rows only."""
+    counts = defaultdict(dict)
+    rows = ApplicationRollup.query.filter(
+        ApplicationRollup.user_id == user_id,
+        ApplicationRollup.count > 0,
+    ).all()
+    for row in rows:
+        counts[row.dimension][row.bucket] = row.count
+
+    by_status = counts["status"]
+    total = sum(by_status.values())
+    awaiting = by_status.get("Applied", 0)
+    responded = total - awaiting
+
+    funnel = [
+        {"stage": stage, "count": total if statuses is None else sum(by_status.get(s, 0) for s in statuses)}
+        for stage, statuses in FUNNEL_STAGES
+    ]
+
+    return {
+        "total": total,
+        "by_status": by_status,
+        "by_job_type": counts["job_type"],
+        "by_location": counts["location"],
+        "per_week": [
+            {"week": week, "count": count}
+            for week, count in sorted(counts["week"].items())
+        ],
+        "funnel": funnel,
+        "response_rate": round(responded / total, 4) if total else 0.0,
+        "interview_rate": round(funnel[1]["count"] / total, 4) if total else 0.0,
+        "offer_rate": round(funnel[2]["count"] / total, 4) if total else 0.0,
+    }
+
+
+def rebuild_rollups(user_id=None, batch_size=1000):
+    """Recompute rollups from job_applications, for one user or everyone."""
+    delete = ApplicationRollup.query
+    source = db.session.query(
+        JobApplication.user_id, JobApplication.status, JobApplication.job_type,
+        JobApplication.location, JobApplication.applied_at,
+    )
+    if user_id is not None:
+        delete = delete.filter(ApplicationRollup.user_id == user_id)
+        source = source.filter(JobApplication.user_id == user_id)
+    delete.delete(synchronize_session=False)
+
+    totals = Counter()
+    for row in source.yield_per(batch_size):
+        for dimension, bucket in rollup_buckets(row).items():
+            totals[(row.user_id, dimension, bucket)] += 1
+
+    rows = [
+        {"user_id": uid, "dimension": dimension, "bucket": bucket, "count": count}
+        for (uid, dimension, bucket), count in totals.items()
+    ]
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(ApplicationRollup.__table__.insert(), rows[start:start + batch_size])
+    db.session.commit()
+    return len(rows)
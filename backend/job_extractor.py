@@ -0,0 +1,253 @@
+import html
+import json
+import re
+from dataclasses import dataclass, field
+
+import lxml.html
+from lxml import etree
+
+
+KEYWORDS = [
+    "responsibilities", "requirements", "qualifications", "skills", "experience",
+    "job", "position", "team", "opportunity", "expectations", "tasks", "desired"
+]
+
+# Containers considered for the "best section", in the order they were
+# originally searched; ties on keyword hits keep that order.
+CONTAINER_TAGS = ("section", "article", "div", "main")
+PARAGRAPH_TAGS = ("p", "li")
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+MIN_SECTION_WORDS = 100
+
+EMPLOYMENT_TYPES = {
+    "FULL_TIME": "Full-Time",
+    "PART_TIME": "Part-Time",
+    "CONTRACTOR": "Contract",
+    "TEMPORARY": "Contract",
+    "INTERN": "Internship",
+    "INTERNSHIP": "Internship",
+}
+
+BLOCK_TAGS = {"p", "div", "section", "ul", "ol", "li", "br", "h1", "h2", "h3", "h4", "h5", "h6", "tr"}
+
+
+@dataclass
+class ExtractedPage:
+    title: str
+    company: str
+    paragraphs: list = field(default_factory=list)
+    best_section: str = ""
+    best_section_hits: int = 0
+    job_posting: dict = None
+    # (tag, text) for the headings and paragraphs of the best section, or of
+    # the whole page without one, in document order.
+    blocks: list = field(default_factory=list)
+
+
+def keyword_mask(text):
+    lowered = text.lower()
+    mask = 0
+    for bit, kw in enumerate(KEYWORDS):
+        if kw in lowered:
+            mask |= 1 << bit
+    return mask
+
+
+def element_text(el):
+    """Equivalent of BeautifulSoup's get_text(strip=True) for an lxml element."""
+    return "".join(s.strip() for s in el.itertext() if s.strip())
+
+
+def parse_html(html):
+    if isinstance(html, str):
+        # lxml rejects str input that carries an XML encoding declaration.
+        html = html.encode("utf-8")
+    return lxml.html.fromstring(html, parser=lxml.html.HTMLParser(encoding="utf-8", remove_comments=True))
+
+
+def extract_page(html):
+    """Pull title, company, paragraphs and the best-scoring section out of a job page.
+
+    One pre-order walk collects the paragraph text; walking it backwards
+    visits every element after its descendants, so each container's word
+    count and keyword hits are summed from its children exactly once instead
+    of re-walking and re-lowercasing its subtree per container.
+    """
+    root = parse_html(html)
+
+    title_el = next(root.iter("h1"), None)
+    if title_el is None:
+        title_el = next(root.iter("title"), None)
+    title_text = element_text(title_el) if title_el is not None else "Job Title Not Found"
+
+    company_el = _first(root, "//meta[@property='og:site_name']", "//meta[@name='author']", "//header")
+    if company_el is not None and company_el.get("content") is not None:
+        company_text = company_el.get("content")
+    elif company_el is not None:
+        company_text = element_text(company_el)
+    else:
+        company_text = "Company Not Found"
+
+    page = ExtractedPage(title=title_text, company=company_text, job_posting=extract_job_posting_ld(root))
+
+    elements = [el for el in root.iter() if isinstance(el.tag, str)]
+    words = {}
+    masks = {}
+    paragraph_texts = {}
+
+    for el in reversed(elements):
+        total_words = 0
+        mask = 0
+        for child in el:
+            if child in words:
+                total_words += words[child]
+                mask |= masks[child]
+        if el.tag in PARAGRAPH_TAGS:
+            text = element_text(el)
+            paragraph_texts[el] = text
+            total_words += len(text.split())
+            mask |= keyword_mask(text)
+        words[el] = total_words
+        masks[el] = mask
+
+    page.paragraphs = [paragraph_texts[el] for el in elements if el in paragraph_texts]
+
+    best = None
+    for order, el in enumerate(elements):
+        if el.tag not in CONTAINER_TAGS or words[el] < MIN_SECTION_WORDS or not masks[el]:
+            continue
+        hits = bin(masks[el]).count("1")
+        rank = (-hits, CONTAINER_TAGS.index(el.tag), order)
+        if best is None or rank < best[0]:
+            best = (rank, el, hits)
+
+    container = root
+    if best is not None:
+        _, el, hits = best
+        page.best_section = " ".join(
+            paragraph_texts[d] for d in el.iterdescendants(*PARAGRAPH_TAGS)
+        )
+        page.best_section_hits = hits
+        container = el
+    page.blocks = [
+        (d.tag, paragraph_texts[d] if d in paragraph_texts else element_text(d))
+        for d in container.iterdescendants(*PARAGRAPH_TAGS, *HEADING_TAGS)
+    ]
+    return page
+
+
+def _first(root, *xpaths):
+    # lxml elements are falsy when childless, so `a or b` can't be used here.
+    for xpath in xpaths:
+        found = root.xpath(xpath)
+        if found:
+            return found[0]
+    return None
+
+
+# schema.org JobPosting (JSON-LD)
+
+def extract_job_posting_ld(root):
+    """Return parsed fields from a JSON-LD JobPosting, or None if absent/incomplete."""
+    for script in root.xpath("//script[@type='application/ld+json']"):
+        try:
+            data = json.loads(script.text or "")
+        except ValueError:
+            continue
+        posting = _find_job_posting(data)
+        if posting is None:
+            continue
+
+        fields = {
+            "title": _clean(posting.get("title")),
+            "company": _clean(_name(posting.get("hiringOrganization"))),
+            "location": _location(posting),
+            "job_type": _employment_type(posting.get("employmentType")),
+            "description": html_to_text(posting.get("description") or ""),
+        }
+        if fields["title"] and fields["description"]:
+            return fields
+    return None
+
+
+def _find_job_posting(data):
+    if isinstance(data, list):
+        for item in data:
+            found = _find_job_posting(item)
+            if found is not None:
+                return found
+        return None
+    if not isinstance(data, dict):
+        return None
+    types = data.get("@type")
+    types = types if isinstance(types, list) else [types]
+    if "JobPosting" in types:
+        return data
+    if "@graph" in data:
+        return _find_job_posting(data["@graph"])
+    return None
+
+
+def _clean(value):
+    return " ".join(value.split()) if isinstance(value, str) and value.strip() else None
+
+
+def _name(value):
+    if isinstance(value, dict):
+        return value.get("name")
+    return value if isinstance(value, str) else None
+
+
+def _location(posting):
+    places = posting.get("jobLocation") or []
+    places = places if isinstance(places, list) else [places]
+    locations = []
+    for place in places:
+        address = place.get("address") if isinstance(place, dict) else None
+        if isinstance(address, dict):
+            country = address.get("addressCountry")
+            parts = [address.get("addressLocality"), address.get("addressRegion"), _name(country)]
+            text = ", ".join(p.strip() for p in parts if isinstance(p, str) and p.strip())
+        else:
+            text = _clean(address) if isinstance(address, str) else None
+        if text and text not in locations:
+            locations.append(text)
+    if posting.get("jobLocationType") == "TELECOMMUTE":
+        locations.append("Remote")
+    return "; ".join(locations) or None
+
+
+def _employment_type(value):
+    values = value if isinstance(value, list) else [value]
+    for v in values:
+        if isinstance(v, str):
+            key = v.strip().upper().replace("-", "_").replace(" ", "_")
+            if key in EMPLOYMENT_TYPES:
+                return EMPLOYMENT_TYPES[key]
+    return None
+
+
+def html_to_text(fragment):
+    """Flatten an HTML description to text, keeping paragraphs and list items on their own lines."""
+    if not fragment.strip():
+        return ""
+    if "&lt;" in fragment:
+        # Some boards entity-encode the markup inside the JSON string.
+        fragment = html.unescape(fragment)
+    if "<" not in fragment:
+        return fragment.strip()
+    try:
+        root = lxml.html.fragment_fromstring(fragment, create_parent="div")
+    except etree.ParserError:
+        return fragment.strip()
+
+    for el in root.iter():
+        if not isinstance(el.tag, str):
+            continue
+        if el.tag == "li":
+            el.text = "- " + (el.text or "")
+        if el.tag in BLOCK_TAGS:
+            el.tail = "\n" + (el.tail or "")
+    text = root.text_content()
+    lines = [" ".join(line.split()) for line in text.splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
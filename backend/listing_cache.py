@@ -0,0 +1,131 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from flask import current_app, request
+from sqlalchemy import func
+
+from extensions import db
+from models import ApplicationEvent, JobApplication, Resume
+
+
+LISTING_CACHE_BYTES = int(os.environ.get("LISTING_CACHE_BYTES", 32 * 1024 * 1024))
+# Bump when a listing's JSON shape changes, so clients' old ETags stop matching.
+SERIALIZATION_VERSION = 1
+
+# What a listing's version is computed from: the user's rows and the column
+# every write to them moves. Deletes show up in the count; application
+# events are append-only, so every status change does too.
+LISTINGS = {
+    "applications": (JobApplication, JobApplication.updated_at),
+    "resumes": (Resume, Resume.uploaded_at),
+    "timeline_summary": (ApplicationEvent, ApplicationEvent.occurred_at),
+}
+
+
+def listing_version(user_id, kind):
+    """Row count and latest write time of a user's listing, from one aggregate query.
+
+    Both come off the (user_id, <timestamp>) index, so this never reads the rows.
+    """
+    model, column = LISTINGS[kind]
+    count, latest = db.session.query(func.count(), func.max(column)).filter(model.user_id == user_id).one()
+    return f"{count}:{latest.isoformat() if latest else ''}"
+
+
+def listing_etag(user_id, kind, version, query):
+    key = f"{SERIALIZATION_VERSION}|{kind}|{user_id}|{version}|{query}"
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+class ListingCache:
+    """Serialized listing responses, keyed by user, listing and query string.
+
+    Each body is stored with the ETag it was built for and only served
+    while the listing's version still produces that ETag, so a write in
+    another worker can't make this one serve stale JSON. Write handlers
+    call invalidate() too, which frees the user's entries right away.
+    Bounded by total body size; least recently used go first.
+    """
+
+    def __init__(self, max_bytes=LISTING_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.stats = {"not_modified": 0, "hits": 0, "misses": 0, "invalidations": 0}
+        self._data = OrderedDict()
+        self._keys = {}
+        self._lock = threading.Lock()
+
+    def _drop(self, key):
+        _, body = self._data.pop(key)
+        self.size -= len(body)
+        owner = self._keys.get(key[:2])
+        if owner is not None:
+            owner.discard(key)
+            if not owner:
+                del self._keys[key[:2]]
+
+    def get(self, key, etag):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] != etag:
+                self.stats["misses"] += 1
+                return None
+            self._data.move_to_end(key)
+            self.stats["hits"] += 1
+            return item[1]
+
+    def set(self, key, etag, body):
+        if len(body) > self.max_bytes // 8:
+            return
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (etag, body)
+            self._keys.setdefault(key[:2], set()).add(key)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self._data)))
+
+    def invalidate(self, user_id, kind):
+        with self._lock:
+            self.stats["invalidations"] += 1
+            for key in list(self._keys.get((user_id, kind), ())):
+                self._drop(key)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, entries=len(self._data), bytes=self.size)
+
+    def respond(self, user_id, kind, build):
+        """Answer a listing GET with 304, a cached body, or build() (a Flask response).
+
+        Costs one aggregate query unless the body has to be built. Error
+        responses from build() are returned as they are and not cached.
+        """
+        query = urlencode(sorted(request.args.items(multi=True)))
+        etag = listing_etag(user_id, kind, listing_version(user_id, kind), query)
+        if request.if_none_match.contains_weak(etag):
+            with self._lock:
+                self.stats["not_modified"] += 1
+            response = current_app.response_class(status=304)
+        else:
+            key = (user_id, kind, query)
+            body = self.get(key, etag)
+            if body is None:
+                response = build()
+                if isinstance(response, tuple) or response.status_code != 200:
+                    return response
+                body = response.get_data()
+                self.set(key, etag, body)
+            response = current_app.response_class(body, mimetype="application/json")
+        response.set_etag(etag)
+        # Per-user data: browsers may keep it but must revalidate every time.
+        response.headers["Cache-Control"] = "private, no-cache"
+        response.vary.update(("Authorization", "X-User-Email"))
+        return response
+
+
+listing_cache = ListingCache()
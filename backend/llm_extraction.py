@@ -0,0 +1,377 @@
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from config import env_bool
+from metrics import outbound
+from parse_cache import text_key
+
+
+log = logging.getLogger(__name__)
+
+# Inference calls allowed in flight at once per process; extra callers queue
+# for a slot until their deadline.
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", 4))
+# Per-attempt HTTP timeout; passed to the inference client.
+LLM_TIMEOUT_SECONDS = float(os.environ.get("LLM_TIMEOUT_SECONDS", 30))
+# Budget for one extraction: queueing for a slot, every attempt and backoff.
+LLM_DEADLINE_SECONDS = float(os.environ.get("LLM_DEADLINE_SECONDS", 75))
+LLM_MAX_ATTEMPTS = int(os.environ.get("LLM_MAX_ATTEMPTS", 3))
+LLM_BACKOFF_SECONDS = float(os.environ.get("LLM_BACKOFF_SECONDS", 0.5))
+MAX_BACKOFF_SECONDS = 8
+# Stream completions and stop reading as soon as a valid object has closed.
+LLM_STREAM = env_bool("LLM_STREAM", True)
+
+FIELDS = ("title", "company", "location", "job_type", "description")
+JOB_TYPES = {
+    "fulltime": "Full-Time",
+    "parttime": "Part-Time",
+    "contract": "Contract",
+    "contractor": "Contract",
+    "temporary": "Contract",
+    "internship": "Internship",
+    "intern": "Internship",
+}
+TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+PROMPT_TEMPLATE = """Extract the job posting below into one JSON object with exactly these keys, and reply with that JSON only (no prose, no code fences):
+{{"title": string, "company": string, "location": string (several joined with "; "), "job_type": "Full-Time" | "Part-Time" | "Contract" | "Internship", "description": string with "Responsibilities:", "Requirements:" and "Qualifications:" sections of "- " bullets separated by blank lines}}
+Use null for anything the posting doesn't state.
+
+---
+{text}
+---
+"""
+
+# The few-shot prompt PROMPT_TEMPLATE replaced; only used to report tokens saved.
+LEGACY_PROMPT_TEMPLATE = """
+You are a job posting parser.
+
+Extract the following fields from this job post and RETURN THEM AS VALID JSON ONLY:
+
+- title
+- company
+- location (if multiple return as single string)
+- job_type (Full-Time, Part-Time, Contract, Internship)
+- description (as a single string — include Responsibilities, Requirements, Qualifications as separate, organized sections in the text)
+
+RULES:
+
+- DO NOT return any explanations.
+- DO NOT write any code.
+- DO NOT wrap in triple backticks.
+- JUST return the JSON object.
+
+### Example Outputs:
+
+{{
+    "title": "Software Engineer",
+    "company": "Amazon",
+    "location": "San Francisco, CA, USA; Bellevue, WA, USA; San Diego, CA, USA",
+    "job_type": "Full-Time",
+    "description": "Responsibilities:\\n- Develop and maintain web applications\\n- Collaborate with cross-functional teams\\n\\nRequirements:\\n- 3+ years experience in software development\\n- Proficiency in Python and JavaScript\\n\\nQualifications:\\n- Bachelor's degree in Computer Science or related field"
+}}
+
+{{
+    "title": "Software Developer",
+    "company": "CompanyName",
+    "location": "San Diego, CA, USA",
+    "job_type": "Internship",
+    "description": "Responsibilities:\\n- Develop and maintain web applications\\n- Collaborate with cross-functional teams\\n\\nRequirements:\\n- 3+ years experience in software development\\n- Proficiency in Python and JavaScript\\n\\nQualifications:\\n- Bachelor's degree in Computer Science or related field"
+}}
+
+Now here is the job post text to parse:
+
+---
+{text}
+---
+"""
+
+
+class ExtractionTimeout(Exception):
+    pass
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def empty_fields():
+    return dict.fromkeys(FIELDS)
+
+
+def build_messages(text):
+    return [{"role": "user", "content": PROMPT_TEMPLATE.format(text=text)}]
+
+
+def validate_fields(obj):
+    """Coerce a parsed reply to the five fields, or raise SchemaError.
+
+    Keys are matched case-insensitively and a single wrapping object
+    ({"job": {...}}) is unwrapped. Values must be strings or null; lists
+    are joined ("; " for location), unknown keys are dropped and job_type
+    is mapped onto the four allowed values (null if it matches none).
+    """
+    if not isinstance(obj, dict):
+        raise SchemaError(f"expected an object, got {type(obj).__name__}")
+    obj = {str(k).strip().lower().replace(" ", "_"): v for k, v in obj.items()}
+    if not any(f in obj for f in FIELDS):
+        inner = list(obj.values())
+        if len(inner) == 1 and isinstance(inner[0], dict):
+            return validate_fields(inner[0])
+        raise SchemaError("none of the expected fields")
+
+    fields = {}
+    for name in FIELDS:
+        value = obj.get(name)
+        if isinstance(value, list) and all(isinstance(v, str) for v in value):
+            value = ("; " if name == "location" else "\n").join(v.strip() for v in value if v.strip())
+        if value is not None and not isinstance(value, str):
+            raise SchemaError(f"{name} must be a string or null, got {type(value).__name__}")
+        fields[name] = (value or "").strip() or None
+
+    if fields["job_type"]:
+        fields["job_type"] = JOB_TYPES.get(re.sub(r"[^a-z]", "", fields["job_type"].lower()))
+    if not any(fields.values()):
+        raise SchemaError("every field is empty")
+    return fields
+
+
+def _load_fields(candidate):
+    """validate_fields() of a JSON object's text, forgiving trailing commas and raw newlines."""
+    try:
+        obj = json.loads(candidate, strict=False)
+    except ValueError:
+        obj = json.loads(TRAILING_COMMA.sub(r"\1", candidate), strict=False)
+    return validate_fields(obj)
+
+
+class JsonStreamParser:
+    """Finds the first valid job-fields object in model output fed in arbitrary chunks.
+
+    Tracks brace depth outside JSON strings (honouring escapes), so prose
+    or code fences around the object and braces inside string values don't
+    matter. Each top-level {...} is tried as soon as it closes; ones that
+    don't parse or don't fit the schema are skipped. If nothing balanced
+    works out (say a stray "{" in the preamble), result() retries from
+    every "{" in the full text.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._start = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.fields = None
+        self.errors = []
+
+    @property
+    def text(self):
+        return self._text
+
+    def feed(self, chunk):
+        """Add output; True once a valid object has closed (no need to read further)."""
+        if self.fields is not None:
+            return True
+        offset = len(self._text)
+        self._text += chunk
+        for i, ch in enumerate(chunk):
+            if self._depth == 0:
+                if ch == "{":
+                    self._start, self._depth = offset + i, 1
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0 and self._try(self._text[self._start:offset + i + 1]):
+                    return True
+        return False
+
+    def _try(self, candidate):
+        try:
+            self.fields = _load_fields(candidate)
+            return True
+        except ValueError as e:
+            self.errors.append(str(e))
+            return False
+
+    def result(self):
+        """The fields found; raises ValueError if the output holds no valid object."""
+        if self.fields is None:
+            decoder = json.JSONDecoder(strict=False)
+            start = self._text.find("{")
+            while start != -1 and self.fields is None:
+                try:
+                    self.fields = validate_fields(decoder.raw_decode(self._text, start)[0])
+                except ValueError:
+                    pass
+                start = self._text.find("{", start + 1)
+        if self.fields is None:
+            reason = self.errors[-1] if self.errors else "no complete JSON object"
+            raise ValueError(f"No job fields in model output: {reason}")
+        return self.fields
+
+
+def parse_response(response_text):
+    """The job fields in a complete model reply. Raises ValueError."""
+    parser = JsonStreamParser()
+    parser.feed(response_text)
+    return parser.result()
+
+
+def is_retryable(error):
+    """Rate limits, 5xx, timeouts and connection errors are retried; other 4xx and bad JSON aren't."""
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return not isinstance(error, ValueError)
+
+
+def _retry_after(error):
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class ExtractionService:
+    """Runs chat-model extractions with coalescing, a concurrency cap, retries and a deadline.
+
+    Concurrent requests for the same text share one inference call: the
+    first caller makes it and the others wait for its result. At most
+    max_concurrency calls are in flight; a slot is released while backing
+    off, so a retrying call doesn't hold up others.
+
+    Each attempt opens a client from new_client() and closes it afterwards:
+    huggingface_hub only releases a response when its client closes, and
+    closing is what cuts a streamed completion short once the JSON object
+    is complete.
+    """
+
+    def __init__(self, model, max_concurrency=LLM_MAX_CONCURRENCY, max_attempts=LLM_MAX_ATTEMPTS,
+                 backoff_seconds=LLM_BACKOFF_SECONDS, deadline_seconds=LLM_DEADLINE_SECONDS, stream=LLM_STREAM):
+        self.model = model
+        self.stream = stream
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.deadline_seconds = deadline_seconds
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "coalesced": 0, "calls": 0, "retries": 0, "failures": 0,
+                      "early_stops": 0, "prompts": 0, "prompt_tokens": 0, "prompt_tokens_saved": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.stats, inflight=len(self._inflight))
+        prompts = stats["prompts"]
+        stats["avg_prompt_tokens"] = round(stats["prompt_tokens"] / prompts, 1) if prompts else 0.0
+        stats["avg_prompt_tokens_saved"] = round(stats["prompt_tokens_saved"] / prompts, 1) if prompts else 0.0
+        return stats
+
+    def record_prompt(self, counter, compacted):
+        """Count a compacted prompt's tokens and what it saved over the few-shot prompt on a 6,000-char cut.
+
+        Returns (prompt tokens, tokens saved).
+        """
+        tokens = counter.template_tokens(PROMPT_TEMPLATE) + compacted.tokens
+        saved = counter.template_tokens(LEGACY_PROMPT_TEMPLATE) + compacted.baseline_tokens - tokens
+        with self._lock:
+            self.stats["prompts"] += 1
+            self.stats["prompt_tokens"] += tokens
+            self.stats["prompt_tokens_saved"] += saved
+        return tokens, saved
+
+    def _delay(self, error, attempt, deadline):
+        """Seconds to wait before the next attempt, or None to give up."""
+        if attempt + 1 >= self.max_attempts or not is_retryable(error):
+            return None
+        delay = _retry_after(error)
+        if delay is None:
+            delay = random.uniform(0, self.backoff_seconds * 2 ** attempt)
+        delay = min(delay, MAX_BACKOFF_SECONDS)
+        if time.monotonic() + delay >= deadline:
+            return None
+        return delay
+
+    def extract(self, new_client, text):
+        """Fields extracted from text. Raises on failure or ExtractionTimeout past the deadline."""
+        self._count("requests")
+        key = text_key(text)
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.stats["coalesced"] += 1
+
+        if leader:
+            try:
+                future.set_result(self._call(new_client, text, time.monotonic() + self.deadline_seconds))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+        try:
+            return dict(future.result(timeout=self.deadline_seconds))
+        except FutureTimeout:
+            raise ExtractionTimeout("Timed out waiting for a shared extraction")
+
+    def _complete(self, client, messages):
+        if not self.stream:
+            completion = client.chat.completions.create(model=self.model, messages=messages)
+            content = completion.choices[0].message.content or ""
+            log.debug("Model response", extra={"response": content})
+            return parse_response(content)
+
+        parser = JsonStreamParser()
+        for chunk in client.chat.completions.create(model=self.model, messages=messages, stream=True):
+            if chunk.choices and parser.feed(chunk.choices[0].delta.content or ""):
+                self._count("early_stops")
+                break
+        log.debug("Model response", extra={"response": parser.text})
+        return parser.result()
+
+    def _call(self, new_client, text, deadline):
+        messages = build_messages(text)
+        for attempt in range(self.max_attempts):
+            if not self._slots.acquire(timeout=max(deadline - time.monotonic(), 0)):
+                self._count("failures")
+                raise ExtractionTimeout("Timed out waiting for an inference slot")
+            try:
+                self._count("calls")
+                with outbound("hf_inference", "chat_completion"), new_client() as client:
+                    return self._complete(client, messages)
+            except Exception as e:
+                delay = self._delay(e, attempt, deadline)
+                if delay is None:
+                    self._count("failures")
+                    raise
+                log.warning("LLM call failed, retrying", extra={"error": str(e), "retry_in_s": round(delay, 2)})
+                self._count("retries")
+            finally:
+                self._slots.release()
+            time.sleep(delay)
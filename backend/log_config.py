@@ -0,0 +1,66 @@
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+
+from flask import g, has_request_context, request
+
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+# "json" for one object per line (production), "text" for reading locally.
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json").lower()
+
+# Attributes every LogRecord has; anything else on a record came from extra={...}.
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, then any extra fields."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update((k, v) for k, v in vars(record).items() if k not in _RECORD_FIELDS)
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record):
+        line = super().format(record)
+        extra = {k: v for k, v in vars(record).items() if k not in _RECORD_FIELDS}
+        return line + "".join(f" {k}={v}" for k, v in extra.items()) if extra else line
+
+
+class RequestContextFilter(logging.Filter):
+    """Tag records logged while handling a request with its id, method and route."""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = getattr(g, "request_id", None)
+            record.method = request.method
+            record.route = request.url_rule.rule if request.url_rule else request.path
+        return True
+
+
+def configure_logging(level=LOG_LEVEL, fmt=LOG_FORMAT):
+    """Send the app's logs to stdout as structured lines; safe to call more than once."""
+    root = logging.getLogger()
+    for handler in root.handlers:
+        if getattr(handler, "careervault", False):
+            return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.careervault = True
+    handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+    handler.addFilter(RequestContextFilter())
+    root.addHandler(handler)
+    root.setLevel(level)
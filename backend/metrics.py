@@ -0,0 +1,204 @@
+import cProfile
+import hmac
+import io
+import logging
+import os
+import pstats
+import re
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from flask import Response, current_app, g, has_request_context, request
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import env_int
+
+
+log = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = env_int("SLOW_QUERY_MS", 200)
+SLOW_REQUEST_MS = env_int("SLOW_REQUEST_MS", 1000)
+PROFILE_DIR = os.environ.get("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "careervault-profiles")
+PROFILE_TOP_FUNCTIONS = 25
+REQUEST_ID = re.compile(r"^[\w.-]{1,64}$")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100, 250)
+
+REQUEST_SECONDS = Histogram(
+    "careervault_http_request_duration_seconds", "Time to handle a request, by route.",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "careervault_http_request_sql_queries", "SQL statements run while handling a request.",
+    ["method", "route"], buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_SQL_SECONDS = Histogram(
+    "careervault_http_request_sql_seconds", "Time spent in SQL while handling a request.",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+SLOW_QUERIES = Counter("careervault_sql_slow_queries_total", "SQL statements slower than SLOW_QUERY_MS.")
+OUTBOUND_SECONDS = Histogram(
+    "careervault_outbound_duration_seconds", "Calls to S3, Google, job sites and HF inference.",
+    ["service", "operation", "outcome"], buckets=LATENCY_BUCKETS,
+)
+
+# cProfile can't run two profilers at once on newer Pythons; one profiled request at a time.
+_profile_lock = threading.Lock()
+
+
+def _route():
+    return request.url_rule.rule if request.url_rule else "unmatched"
+
+
+@contextmanager
+def outbound(service, operation=""):
+    """Time a call to an outside service; exceptions count as outcome="error" and propagate."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        elapsed = time.perf_counter() - start
+        OUTBOUND_SECONDS.labels(service, operation, outcome).observe(elapsed)
+        if has_request_context() and "outbound_seconds" in g:
+            g.outbound_seconds += elapsed
+
+
+def instrument_boto3(client, service="s3"):
+    """Time every API call a boto3 client makes (multipart parts included) via its event hooks."""
+    def before(context, **kwargs):
+        context["careervault_start"] = time.perf_counter()
+
+    def after(context, model, http_response=None, **kwargs):
+        start = context.pop("careervault_start", None)
+        if start is None:
+            return
+        status = getattr(http_response, "status_code", None) or 0
+        OUTBOUND_SECONDS.labels(service, model.name, "ok" if status < 400 else "error").observe(
+            time.perf_counter() - start)
+
+    def after_error(context, model, **kwargs):
+        start = context.pop("careervault_start", None)
+        if start is not None:
+            OUTBOUND_SECONDS.labels(service, model.name, "error").observe(time.perf_counter() - start)
+
+    client.meta.events.register(f"before-call.{service}", before)
+    client.meta.events.register(f"after-call.{service}", after)
+    # Connection errors and timeouts skip after-call (botocore >= 1.35).
+    client.meta.events.register(f"after-call-error.{service}", after_error)
+    return client
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("careervault_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["careervault_query_start"].pop()
+    if has_request_context() and "sql_queries" in g:
+        g.sql_queries += 1
+        g.sql_seconds += elapsed
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        SLOW_QUERIES.inc()
+        log.warning("Slow query", extra={"duration_ms": round(elapsed * 1000, 1),
+                                         "statement": " ".join(statement.split())[:1000]})
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("careervault_query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def _start_request():
+    request_id = request.headers.get("X-Request-ID", "")
+    g.request_id = request_id if REQUEST_ID.match(request_id) else uuid.uuid4().hex
+    g.request_start = time.perf_counter()
+    g.sql_queries = 0
+    g.sql_seconds = 0.0
+    g.outbound_seconds = 0.0
+
+    token = current_app.config.get("PROFILE_TOKEN")
+    header = request.headers.get("X-Profile")
+    if token and header and hmac.compare_digest(header, token) and _profile_lock.acquire(blocking=False):
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+
+def _finish_request(response):
+    if "request_start" not in g:
+        return response
+    elapsed = time.perf_counter() - g.request_start
+    route = _route()
+    REQUEST_SECONDS.labels(request.method, route, str(response.status_code)).observe(elapsed)
+    REQUEST_QUERIES.labels(request.method, route).observe(g.sql_queries)
+    REQUEST_SQL_SECONDS.labels(request.method, route).observe(g.sql_seconds)
+    response.headers["X-Request-ID"] = g.request_id
+
+    if "profiler" in g:
+        response.headers["X-Profile-Id"] = _save_profile(g.pop("profiler"))
+
+    if elapsed * 1000 >= SLOW_REQUEST_MS:
+        log.warning("Slow request", extra={
+            "status": response.status_code,
+            "duration_ms": round(elapsed * 1000, 1),
+            "sql_queries": g.sql_queries,
+            "sql_ms": round(g.sql_seconds * 1000, 1),
+            "outbound_ms": round(g.outbound_seconds * 1000, 1),
+        })
+    return response
+
+
+def _teardown_request(exc):
+    # If the response never got to _finish_request, still stop the profiler.
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.disable()
+        _profile_lock.release()
+
+
+def _save_profile(profiler):
+    """Write the request's profile to PROFILE_DIR/<request id>.prof and log its top functions."""
+    try:
+        profiler.disable()
+    finally:
+        _profile_lock.release()
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    profiler.dump_stats(os.path.join(PROFILE_DIR, f"{g.request_id}.prof"))
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+    log.info("Request profile", extra={"profile": out.getvalue(), "profile_file": f"{g.request_id}.prof"})
+    return g.request_id
+
+
+def metrics_view():
+    token = current_app.config.get("METRICS_TOKEN")
+    if token and not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return Response("Unauthorized\n", status=401, mimetype="text/plain")
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        # Under gunicorn each worker writes its own files; add them all up.
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_app(app):
+    """Time every request, count its SQL, and serve /metrics."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view)
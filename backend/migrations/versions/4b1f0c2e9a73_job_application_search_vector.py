@@ -0,0 +1,54 @@
+"""job application search vector
+
+Revision ID: 4b1f0c2e9a73
+Revises: 89de989c8f17
+Create Date: 2026-10-17 03:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '4b1f0c2e9a73'
+down_revision = '89de989c8f17'
+branch_labels = None
+depends_on = None
+
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(company_name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.add_column('job_applications', sa.Column(
+            'search_vector', postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True))
+        op.create_index('ix_job_applications_search_vector', 'job_applications', ['search_vector'],
+                        unique=False, postgresql_using='gin')
+    else:
+        with op.batch_alter_table('job_applications', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('search_vector', sa.Text(), nullable=True))
+            batch_op.create_index('ix_job_applications_search_vector', ['search_vector'], unique=False)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_job_applications_search_vector', table_name='job_applications')
+        op.drop_column('job_applications', 'search_vector')
+        return
+
+    # The batch rebuild of job_applications doesn't carry over the
+    # lower(company_name) expression index, so put it back afterwards.
+    op.drop_index('ix_job_applications_user_company', table_name='job_applications')
+    with op.batch_alter_table('job_applications', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_applications_search_vector')
+        batch_op.drop_column('search_vector')
+    op.create_index('ix_job_applications_user_company', 'job_applications',
+                    ['user_id', sa.text('lower(company_name)')], unique=False)
@@ -0,0 +1,58 @@
+"""resume text index
+
+Revision ID: 5f2d8c1a9b37
+Revises: e3a9d5b0c246
+Create Date: 2026-10-17 06:12:40.518327
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '5f2d8c1a9b37'
+down_revision = 'e3a9d5b0c246'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('resume_texts',
+    sa.Column('resume_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('text', sa.Text(), nullable=True),
+    sa.Column('page_count', sa.Integer(), nullable=False),
+    sa.Column('char_count', sa.Integer(), nullable=False),
+    sa.Column('token_count', sa.Integer(), nullable=False),
+    sa.Column('unique_terms', sa.Integer(), nullable=False),
+    sa.Column('indexed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('resume_id')
+    )
+    with op.batch_alter_table('resume_texts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_resume_texts_user_id'), ['user_id'], unique=False)
+
+    op.create_table('resume_terms',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('term', sa.String(length=64), nullable=False),
+    sa.Column('resume_id', sa.UUID(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'term', 'resume_id')
+    )
+    with op.batch_alter_table('resume_terms', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_resume_terms_resume_id'), ['resume_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('resume_terms', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_resume_terms_resume_id'))
+
+    op.drop_table('resume_terms')
+    with op.batch_alter_table('resume_texts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_resume_texts_user_id'))
+
+    op.drop_table('resume_texts')
@@ -0,0 +1,37 @@
+"""job application list indexes
+
+Revision ID: 89de989c8f17
+Revises: d057916b6b09
+Create Date: 2026-10-17 02:06:27.565945
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '89de989c8f17'
+down_revision = 'd057916b6b09'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('job_applications', schema=None) as batch_op:
+        batch_op.create_index('ix_job_applications_user_applied', ['user_id', 'applied_at', 'id'], unique=False)
+        batch_op.create_index('ix_job_applications_user_updated', ['user_id', 'updated_at', 'id'], unique=False)
+        batch_op.create_index('ix_job_applications_user_status_applied', ['user_id', 'status', 'applied_at', 'id'], unique=False)
+        batch_op.create_index('ix_job_applications_user_job_type_applied', ['user_id', 'job_type', 'applied_at', 'id'], unique=False)
+
+    op.create_index('ix_job_applications_user_company', 'job_applications',
+                    ['user_id', sa.text('lower(company_name)')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_job_applications_user_company', table_name='job_applications')
+
+    with op.batch_alter_table('job_applications', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_applications_user_job_type_applied')
+        batch_op.drop_index('ix_job_applications_user_status_applied')
+        batch_op.drop_index('ix_job_applications_user_updated')
+        batch_op.drop_index('ix_job_applications_user_applied')
@@ -0,0 +1,52 @@
+"""application duplicate signatures
+
+Revision ID: 9c4e7b2d6a15
+Revises: 5f2d8c1a9b37
+Create Date: 2026-10-17 07:31:05.824196
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4e7b2d6a15'
+down_revision = '5f2d8c1a9b37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('application_signatures',
+    sa.Column('application_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('url_key', sa.String(length=64), nullable=True),
+    sa.Column('minhash', sa.LargeBinary(), nullable=True),
+    sa.ForeignKeyConstraint(['application_id'], ['job_applications.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('application_id')
+    )
+    with op.batch_alter_table('application_signatures', schema=None) as batch_op:
+        batch_op.create_index('ix_application_signatures_user_url', ['user_id', 'url_key'], unique=False)
+
+    op.create_table('application_lsh_buckets',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('band_hash', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('application_id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['application_id'], ['job_applications.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'band_hash', 'application_id')
+    )
+    with op.batch_alter_table('application_lsh_buckets', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_application_lsh_buckets_application_id'), ['application_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('application_lsh_buckets', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_application_lsh_buckets_application_id'))
+
+    op.drop_table('application_lsh_buckets')
+    with op.batch_alter_table('application_signatures', schema=None) as batch_op:
+        batch_op.drop_index('ix_application_signatures_user_url')
+
+    op.drop_table('application_signatures')
@@ -0,0 +1,26 @@
+"""resume listing index
+
+Revision ID: b6d1e8f3a420
+Revises: 9c4e7b2d6a15
+Create Date: 2026-10-17 14:12:48.301957
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d1e8f3a420'
+down_revision = '9c4e7b2d6a15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.create_index('ix_resumes_user_uploaded', ['user_id', 'uploaded_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.drop_index('ix_resumes_user_uploaded')
@@ -0,0 +1,32 @@
+"""application rollups
+
+Revision ID: c7e2a94d1f58
+Revises: 4b1f0c2e9a73
+Create Date: 2026-10-17 04:02:13.640375
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2a94d1f58'
+down_revision = '4b1f0c2e9a73'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('application_rollups',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('dimension', sa.String(length=20), nullable=False),
+    sa.Column('bucket', sa.String(length=255), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'dimension', 'bucket')
+    )
+    # Existing rows are backfilled with `flask rebuild-insights`.
+
+
+def downgrade():
+    op.drop_table('application_rollups')
@@ -0,0 +1,39 @@
+"""parse cache entries
+
+Revision ID: e3a9d5b0c246
+Revises: c7e2a94d1f58
+Create Date: 2026-10-17 04:48:51.207734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a9d5b0c246'
+down_revision = 'c7e2a94d1f58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('parse_cache_entries',
+    sa.Column('key', sa.String(length=80), nullable=False),
+    sa.Column('fields', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('last_hit_at', sa.DateTime(), nullable=True),
+    sa.Column('hit_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    with op.batch_alter_table('parse_cache_entries', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_parse_cache_entries_expires_at'), ['expires_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_parse_cache_entries_last_hit_at'), ['last_hit_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('parse_cache_entries', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_parse_cache_entries_last_hit_at'))
+        batch_op.drop_index(batch_op.f('ix_parse_cache_entries_expires_at'))
+
+    op.drop_table('parse_cache_entries')
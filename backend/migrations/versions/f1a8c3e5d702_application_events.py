@@ -0,0 +1,58 @@
+"""application events
+
+Revision ID: f1a8c3e5d702
+Revises: b6d1e8f3a420
+Create Date: 2026-10-17 19:26:04.518230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a8c3e5d702'
+down_revision = 'b6d1e8f3a420'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('application_events',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('application_id', sa.UUID(), nullable=False),
+    sa.Column('from_status', sa.String(length=50), nullable=True),
+    sa.Column('to_status', sa.String(length=50), nullable=True),
+    sa.Column('occurred_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('application_events', schema=None) as batch_op:
+        batch_op.create_index('ix_application_events_user_occurred', ['user_id', 'occurred_at', 'id'], unique=False)
+        batch_op.create_index('ix_application_events_application', ['application_id', 'occurred_at', 'id'],
+                              unique=False)
+
+    # Reconstruct what history we can: each application was created as
+    # "Applied", and one not in "Applied" any more moved to its current
+    # status at its last update. Portable SQL, so this runs on SQLite too.
+    op.execute("""
+        INSERT INTO application_events (user_id, application_id, from_status, to_status, occurred_at)
+        SELECT user_id, id, NULL, 'Applied', coalesce(applied_at, CURRENT_TIMESTAMP)
+        FROM job_applications
+    """)
+    op.execute("""
+        INSERT INTO application_events (user_id, application_id, from_status, to_status, occurred_at)
+        SELECT user_id, id, 'Applied', status,
+               CASE WHEN updated_at IS NULL OR updated_at < applied_at
+                    THEN coalesce(applied_at, CURRENT_TIMESTAMP) ELSE updated_at END
+        FROM job_applications
+        WHERE status IS NOT NULL AND status <> 'Applied'
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('application_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_application_events_application')
+        batch_op.drop_index('ix_application_events_user_occurred')
+
+    op.drop_table('application_events')
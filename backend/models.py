@@ -1,7 +1,7 @@
 import uuid
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from datetime import datetime
-from app import db
+from extensions import db
 
 class User(db.Model):
     __tablename__ = "users"
@@ -30,9 +30,27 @@ class JobApplication(db.Model):
     status = db.Column(db.String(50), default="Applied")
     applied_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Generated by the database (see migration 4b1f0c2e9a73); plain TEXT (and
+    # unused) on SQLite.
+    search_vector = db.deferred(db.Column(
+        TSVECTOR().with_variant(db.Text(), "sqlite"),
+        server_default=db.FetchedValue(),
+        server_onupdate=db.FetchedValue(),
+    ))
 
     resume = db.relationship("Resume", backref="applications_used", lazy=True)
 
+    # Keyset pagination walks (user_id, <sort key>, id); the filtered variants
+    # let status/job_type/company filters stay on an index range scan.
+    __table_args__ = (
+        db.Index("ix_job_applications_user_applied", "user_id", "applied_at", "id"),
+        db.Index("ix_job_applications_user_updated", "user_id", "updated_at", "id"),
+        db.Index("ix_job_applications_user_status_applied", "user_id", "status", "applied_at", "id"),
+        db.Index("ix_job_applications_user_job_type_applied", "user_id", "job_type", "applied_at", "id"),
+        db.Index("ix_job_applications_user_company", "user_id", db.text("lower(company_name)")),
+        db.Index("ix_job_applications_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
 
 class Resume(db.Model):
     __tablename__ = "resumes"
@@ -43,4 +61,105 @@ class Resume(db.Model):
     file_url = db.Column(db.String(1024), nullable=False)  # public or internal path
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    user = db.relationship("User", backref="resumes")
\ No newline at end of file
+    user = db.relationship("User", backref="resumes")
+
+    # Covers the listing and its version aggregate (count, max uploaded_at).
+    __table_args__ = (
+        db.Index("ix_resumes_user_uploaded", "user_id", "uploaded_at"),
+    )
+
+
+class ApplicationEvent(db.Model):
+    """Append-only history of application status changes; see timeline.py.
+
+    from_status is NULL for the event that created the application and
+    to_status is NULL for the one that deleted it. No foreign key to
+    job_applications, so history outlives deleted applications.
+    """
+    __tablename__ = "application_events"
+    # Sequential, so events with equal timestamps keep the order they were written in.
+    id = db.Column(db.BigInteger().with_variant(db.Integer(), "sqlite"), primary_key=True, autoincrement=True)
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey("users.id"), nullable=False)
+    application_id = db.Column(UUID(as_uuid=True), nullable=False)
+    from_status = db.Column(db.String(50))
+    to_status = db.Column(db.String(50))
+    occurred_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    # The timeline pages through (user_id, occurred_at, id); stage durations
+    # partition by application and walk it in time order.
+    __table_args__ = (
+        db.Index("ix_application_events_user_occurred", "user_id", "occurred_at", "id"),
+        db.Index("ix_application_events_application", "application_id", "occurred_at", "id"),
+    )
+
+
+class ApplicationRollup(db.Model):
+    """Per-user application counts by dimension (status, job_type, location, week).
+
+    Kept current by the application write handlers; see insights.py.
+    """
+    __tablename__ = "application_rollups"
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey("users.id"), primary_key=True)
+    dimension = db.Column(db.String(20), primary_key=True)
+    bucket = db.Column(db.String(255), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+
+class ParseCacheEntry(db.Model):
+    """Persisted /api/parse-url extraction, keyed by normalized URL or text hash."""
+    __tablename__ = "parse_cache_entries"
+    key = db.Column(db.String(80), primary_key=True)
+    fields = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    last_hit_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    hit_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class ResumeText(db.Model):
+    """Text extracted from a resume PDF, with token stats; see resume_index.py."""
+    __tablename__ = "resume_texts"
+    resume_id = db.Column(UUID(as_uuid=True), db.ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey("users.id"), nullable=False, index=True)
+    status = db.Column(db.String(20), nullable=False, default="pending")  # pending, indexed, failed
+    error = db.Column(db.Text)
+    text = db.Column(db.Text)
+    page_count = db.Column(db.Integer, nullable=False, default=0)
+    char_count = db.Column(db.Integer, nullable=False, default=0)
+    token_count = db.Column(db.Integer, nullable=False, default=0)
+    unique_terms = db.Column(db.Integer, nullable=False, default=0)
+    indexed_at = db.Column(db.DateTime)
+
+
+class ResumeTerm(db.Model):
+    """Inverted keyword index over resume text: which of a user's resumes contain a term."""
+    __tablename__ = "resume_terms"
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey("users.id"), primary_key=True)
+    term = db.Column(db.String(64), primary_key=True)
+    resume_id = db.Column(UUID(as_uuid=True), db.ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True,
+                          index=True)
+    count = db.Column(db.Integer, nullable=False, default=1)
+
+
+class ApplicationSignature(db.Model):
+    """Normalized URL key and MinHash signature of an application; see dedupe.py."""
+    __tablename__ = "application_signatures"
+    application_id = db.Column(UUID(as_uuid=True), db.ForeignKey("job_applications.id", ondelete="CASCADE"),
+                               primary_key=True)
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey("users.id"), nullable=False)
+    url_key = db.Column(db.String(64))
+    minhash = db.Column(db.LargeBinary)  # NUM_PERM little-endian uint32s
+
+    __table_args__ = (
+        db.Index("ix_application_signatures_user_url", "user_id", "url_key"),
+    )
+
+
+class ApplicationLshBucket(db.Model):
+    """LSH band buckets of application signatures; applications sharing a bucket are duplicate candidates."""
+    __tablename__ = "application_lsh_buckets"
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey("users.id"), primary_key=True)
+    band_hash = db.Column(db.BigInteger, primary_key=True, autoincrement=False)
+    application_id = db.Column(UUID(as_uuid=True), db.ForeignKey("job_applications.id", ondelete="CASCADE"),
+                               primary_key=True, index=True)
@@ -0,0 +1,364 @@
+import codecs
+import ipaddress
+import re
+import socket
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.connection import HTTPConnection, HTTPSConnection
+
+from config import env_int
+from parse_cache import normalize_url
+
+
+FETCH_CONNECT_TIMEOUT_SECONDS = env_int("FETCH_CONNECT_TIMEOUT_SECONDS", 5)
+FETCH_READ_TIMEOUT_SECONDS = env_int("FETCH_READ_TIMEOUT_SECONDS", 10)
+# Job pages are well under this; anything bigger is cut off, not refused.
+FETCH_MAX_BYTES = env_int("FETCH_MAX_BYTES", 2 * 1024 * 1024)
+FETCH_MAX_PER_HOST = env_int("FETCH_MAX_PER_HOST", 4)
+FETCH_HOST_WAIT_SECONDS = env_int("FETCH_HOST_WAIT_SECONDS", 10)
+# Compressed page bodies kept for conditional refetches, across all hosts.
+FETCH_CACHE_BYTES = env_int("FETCH_CACHE_BYTES", 32 * 1024 * 1024)
+FETCH_MAX_REDIRECTS = 5
+# Hosts with a pool of idle keep-alive connections, and connections per pool.
+POOL_HOSTS = 32
+CHUNK_BYTES = 64 * 1024
+ALLOWED_SCHEMES = {"http", "https"}
+ALLOWED_PORTS = {80, 443}
+USER_AGENT = "Mozilla/5.0 (compatible; CareerVault/1.0; +https://careervaultapp.com)"
+
+HTML_TYPES = re.compile(r"^(text/|application/(xhtml\+)?xml|application/ld\+json)", re.IGNORECASE)
+CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+HEADER_CHARSET = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+
+
+class FetchError(Exception):
+    pass
+
+
+class BlockedURL(FetchError):
+    pass
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int
+    body: bytes = b""
+    content_type: str = ""
+    not_modified: bool = False
+    truncated: bool = False
+    elapsed: float = 0.0
+
+
+def check_address(address, allow_private=False):
+    """Refuse to talk to anything but public unicast addresses."""
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if getattr(ip, "ipv4_mapped", None):
+        ip = ip.ipv4_mapped
+    if not allow_private and (not ip.is_global or ip.is_multicast):
+        raise BlockedURL(f"{address} is not a public address")
+
+
+def check_url(url, allow_private=False):
+    """Validate a URL before fetching it; returns (host, port).
+
+    http(s) only, no credentials, standard ports, and every address the host
+    resolves to must be public. The connection itself is checked again once
+    it is open, so a DNS answer that changes in between doesn't get through.
+    """
+    parts = urlsplit(url)
+    if parts.scheme.lower() not in ALLOWED_SCHEMES:
+        raise BlockedURL(f"Unsupported URL scheme: {parts.scheme or 'none'}")
+    if parts.username or parts.password:
+        raise BlockedURL("URLs with credentials are not fetched")
+    host = parts.hostname
+    if not host:
+        raise BlockedURL("URL has no host")
+    try:
+        port = parts.port or (443 if parts.scheme.lower() == "https" else 80)
+    except ValueError:
+        raise BlockedURL("Invalid port")
+    if allow_private:
+        return host, port
+    if port not in ALLOWED_PORTS:
+        raise BlockedURL(f"Port {port} is not allowed")
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)}
+    except socket.gaierror as e:
+        raise FetchError(f"Could not resolve {host}: {e}")
+    for address in addresses:
+        check_address(address)
+    return host, port
+
+
+def _to_utf8(body, content_type):
+    """Re-encode the body as UTF-8 when the server or the page declares another charset.
+
+    The HTML parser reads bytes as UTF-8, which garbles Latin-1 and
+    Windows-1252 pages; decoding here fixes that.
+    """
+    match = HEADER_CHARSET.search(content_type) or CHARSET.search(body[:4096])
+    if not match:
+        return body
+    charset = match.group(1)
+    if isinstance(charset, bytes):
+        charset = charset.decode("ascii", "replace")
+    try:
+        codec = codecs.lookup(charset).name
+    except LookupError:
+        return body
+    if codec in ("utf-8", "ascii"):
+        return body
+    return body.decode(codec, "replace").encode("utf-8")
+
+
+def _drain(response):
+    """Read what's left of a small body so closing returns the connection to the pool.
+
+    A streamed response closed before its body is read takes its connection
+    down with it; that's fine for a cut-off page, wasteful for a 304.
+    """
+    length = response.headers.get("Content-Length", "")
+    if response.status_code == 304 or (length.isdigit() and int(length) <= CHUNK_BYTES):
+        response.content
+
+
+class ResponseCache:
+    """Validators and compressed bodies of fetched pages, for conditional GETs.
+
+    Bounded by the compressed size of what it holds, not by entry count, so a
+    few large pages can't crowd out memory; least recently used go first.
+    """
+
+    def __init__(self, max_bytes=FETCH_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """(etag, last_modified, body) or None."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            self._data.move_to_end(key)
+        etag, last_modified, compressed = item
+        return etag, last_modified, zlib.decompress(compressed)
+
+    def set(self, key, etag, last_modified, body):
+        compressed = zlib.compress(body, 6)
+        if len(compressed) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.size -= len(old[2])
+            self._data[key] = (etag, last_modified, compressed)
+            self.size += len(compressed)
+            while self.size > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self.size -= len(evicted[2])
+
+    def discard(self, key):
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.size -= len(old[2])
+
+    def __len__(self):
+        return len(self._data)
+
+
+class HostLimiter:
+    """At most per_host fetches in flight to any one host.
+
+    Semaphores exist only while a host has fetches waiting or running, so
+    the table doesn't grow with every host ever seen.
+    """
+
+    def __init__(self, per_host=FETCH_MAX_PER_HOST, wait_seconds=FETCH_HOST_WAIT_SECONDS):
+        self.per_host = per_host
+        self.wait_seconds = wait_seconds
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, host):
+        with self._lock:
+            entry = self._hosts.get(host)
+            if entry is None:
+                entry = self._hosts[host] = [threading.BoundedSemaphore(self.per_host), 0]
+            entry[1] += 1
+        try:
+            if not entry[0].acquire(timeout=self.wait_seconds):
+                raise FetchError(f"Too many pages being fetched from {host}, try again shortly")
+            try:
+                yield
+            finally:
+                entry[0].release()
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._hosts[host]
+
+
+class PageFetcher:
+    """Fetches job pages over a shared pool of keep-alive connections.
+
+    Bodies are streamed and cut off at max_bytes (after gzip/deflate
+    decoding, so a compressed bomb can't get past it), redirects are
+    followed by hand so each hop is checked, and pages that sent an ETag
+    or Last-Modified are revalidated with a conditional GET, reusing the
+    cached body on 304. Thread-safe; one per process.
+    """
+
+    def __init__(self, max_bytes=FETCH_MAX_BYTES, per_host=FETCH_MAX_PER_HOST, cache_bytes=FETCH_CACHE_BYTES,
+                 allow_private=False, timeout=(FETCH_CONNECT_TIMEOUT_SECONDS, FETCH_READ_TIMEOUT_SECONDS)):
+        self.max_bytes = max_bytes
+        self.allow_private = allow_private
+        self.timeout = timeout
+        self.cache = ResponseCache(cache_bytes)
+        self.limiter = HostLimiter(per_host)
+        self.stats = {"fetches": 0, "not_modified": 0, "truncated": 0, "blocked": 0,
+                      "connections": 0, "bytes": 0}
+        self._stats_lock = threading.Lock()
+        self.session = self._build_session(per_host)
+
+    def _count(self, name, n=1):
+        with self._stats_lock:
+            self.stats[name] += n
+
+    def _build_session(self, per_host):
+        fetcher = self
+
+        def connected(conn, sock):
+            try:
+                check_address(sock.getpeername()[0], fetcher.allow_private)
+            except BlockedURL:
+                sock.close()
+                raise
+            fetcher._count("connections")
+            return sock
+
+        class GuardedHTTPConnection(HTTPConnection):
+            def _new_conn(self):
+                return connected(self, super()._new_conn())
+
+        class GuardedHTTPSConnection(HTTPSConnection):
+            def _new_conn(self):
+                return connected(self, super()._new_conn())
+
+        class GuardedHTTPConnectionPool(HTTPConnectionPool):
+            ConnectionCls = GuardedHTTPConnection
+
+        class GuardedHTTPSConnectionPool(HTTPSConnectionPool):
+            ConnectionCls = GuardedHTTPSConnection
+
+        class GuardedAdapter(HTTPAdapter):
+            def init_poolmanager(self, *args, **kwargs):
+                super().init_poolmanager(*args, **kwargs)
+                self.poolmanager.pool_classes_by_scheme = {
+                    "http": GuardedHTTPConnectionPool, "https": GuardedHTTPSConnectionPool,
+                }
+
+        session = requests.Session()
+        # Environment proxies would make the guarded peer the proxy, not the
+        # page's host; and one user's cookies must not ride along on another's fetch.
+        session.trust_env = False
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        session.headers.update({"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.5"})
+        adapter = GuardedAdapter(pool_connections=POOL_HOSTS, pool_maxsize=per_host, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def snapshot(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats.update(cached_pages=len(self.cache), cached_bytes=self.cache.size)
+        return stats
+
+    def fetch(self, url):
+        """Fetch url, following redirects; raises FetchError for blocked or unusable pages."""
+        start = time.perf_counter()
+        key = normalize_url(url)
+        cached = self.cache.get(key)
+        headers = {}
+        if cached is not None:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        try:
+            host, _ = check_url(url, self.allow_private)
+            with self.limiter.slot(host.lower()):
+                current = url
+                for _ in range(FETCH_MAX_REDIRECTS + 1):
+                    with self._get(current, headers) as response:
+                        if not response.is_redirect:
+                            return self._finish(key, cached, current, response, start)
+                        current = urljoin(current, response.headers["Location"])
+                        _drain(response)
+                    check_url(current, self.allow_private)
+                raise FetchError("Too many redirects")
+        except BlockedURL:
+            self._count("blocked")
+            raise
+
+    def _get(self, url, headers):
+        # A connection to a private address raises BlockedURL straight out of here.
+        try:
+            return self.session.get(url, headers=headers, stream=True, timeout=self.timeout, allow_redirects=False)
+        except requests.exceptions.Timeout:
+            raise FetchError(f"Timed out fetching {urlsplit(url).hostname}")
+        except requests.exceptions.RequestException as e:
+            raise FetchError(f"Could not connect to {urlsplit(url).hostname}: {type(e).__name__}")
+
+    def _finish(self, key, cached, url, response, start):
+        self._count("fetches")
+        if response.status_code == 304 and cached is not None:
+            self._count("not_modified")
+            _drain(response)
+            return FetchResult(url, 200, cached[2], response.headers.get("Content-Type", ""), not_modified=True,
+                               elapsed=time.perf_counter() - start)
+        if response.status_code != 200:
+            return FetchResult(url, response.status_code, elapsed=time.perf_counter() - start)
+
+        content_type = response.headers.get("Content-Type", "")
+        if content_type and not HTML_TYPES.match(content_type):
+            raise FetchError(f"Not a web page ({content_type.split(';')[0]})")
+
+        chunks, size, truncated = [], 0, False
+        for chunk in response.iter_content(CHUNK_BYTES):
+            if size + len(chunk) > self.max_bytes:
+                chunk = chunk[:self.max_bytes - size]
+                truncated = True
+            chunks.append(chunk)
+            size += len(chunk)
+            if truncated:
+                break
+        body = _to_utf8(b"".join(chunks), content_type)
+        self._count("bytes", size)
+        if truncated:
+            self._count("truncated")
+
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if (etag or last_modified) and not truncated:
+            self.cache.set(key, etag, last_modified, body)
+        else:
+            self.cache.discard(key)
+        return FetchResult(url, 200, body, content_type, truncated=truncated, elapsed=time.perf_counter() - start)
@@ -0,0 +1,112 @@
+import base64
+import json
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import tuple_
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class CursorError(ValueError):
+    pass
+
+
+def parse_limit(raw, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Parse a ?limit= query value, clamped to [1, maximum]."""
+    if raw is None or raw == "":
+        return default
+    try:
+        limit = int(raw)
+    except (TypeError, ValueError):
+        raise CursorError("limit must be an integer")
+    return max(1, min(limit, maximum))
+
+
+def parse_datetime_param(raw):
+    """Parse an ISO-8601 date/datetime query value as naive UTC (a trailing Z is accepted).
+
+    Values with an offset are converted to UTC; values without one are taken as UTC.
+    """
+    if not raw:
+        return None
+    try:
+        value = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except ValueError:
+        raise CursorError(f"Invalid date: {raw}")
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def encode_cursor(sort, key, row_id):
+    """Encode the last row of a page as an opaque, URL-safe cursor.
+
+    The sort name is embedded so a cursor can't be replayed against a
+    different ordering.
+    """
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    payload = json.dumps({"s": sort, "k": key, "id": str(row_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, sort):
+    """Return the (key, id) pair stored in a cursor issued for the given sort."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key, row_id = payload["k"], payload["id"]
+    except (ValueError, KeyError, TypeError):
+        raise CursorError("Malformed cursor")
+
+    if payload.get("s") != sort:
+        raise CursorError("Cursor does not match the requested sort")
+
+    if isinstance(key, str):
+        try:
+            key = datetime.fromisoformat(key)
+        except ValueError:
+            pass
+    return key, row_id
+
+
+def keyset_page(query, key_column, id_column, sort, descending, cursor, limit):
+    """Apply keyset pagination on (key_column, id_column) to a query.
+
+    Returns (rows, next_cursor). One extra row is fetched to know whether
+    another page exists, so no COUNT(*) is needed.
+    """
+    if cursor:
+        key, row_id = decode_cursor(cursor, sort)
+        id_type = _python_type(id_column)
+        if id_type in (uuid.UUID, int):
+            try:
+                row_id = id_type(row_id)
+            except ValueError:
+                raise CursorError("Malformed cursor")
+        position = tuple_(key_column, id_column)
+        bound = (key, row_id)
+        query = query.filter(position < bound if descending else position > bound)
+
+    if descending:
+        query = query.order_by(key_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(key_column.asc(), id_column.asc())
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, getattr(last, key_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
+
+
+def _python_type(column):
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
@@ -0,0 +1,180 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from extensions import db
+from models import ParseCacheEntry
+
+
+log = logging.getLogger(__name__)
+
+PARSE_CACHE_TTL_SECONDS = int(os.environ.get("PARSE_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+PARSE_CACHE_MAX_ENTRIES = int(os.environ.get("PARSE_CACHE_MAX_ENTRIES", 512))
+PARSE_CACHE_MAX_ROWS = int(os.environ.get("PARSE_CACHE_MAX_ROWS", 20000))
+# Trim the table every N writes per process rather than on every insert.
+PRUNE_EVERY = 50
+
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "refid", "src", "source",
+    "trk", "trkinfo", "trackingid", "gh_src", "lever-source", "lever-origin", "_hsenc", "_hsmi",
+}
+
+
+def normalize_url(url):
+    """Canonical form of a job URL: lowercase host, no fragment, no tracking params."""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def url_key(url):
+    return "url:" + hashlib.sha256(normalize_url(url).encode()).hexdigest()
+
+
+def text_key(text):
+    return "text:" + hashlib.sha256(text.encode()).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe in-process LRU with a per-entry expiry."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= datetime.utcnow():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ParseCache:
+    """Two-layer cache for job-posting extractions: in-process LRU, then DB.
+
+    Entries are stored both under the normalized URL (skips the fetch) and
+    under a hash of the text sent to the model (catches the same posting
+    behind a different URL).
+    """
+
+    def __init__(self, ttl_seconds=PARSE_CACHE_TTL_SECONDS, max_entries=PARSE_CACHE_MAX_ENTRIES,
+                 max_rows=PARSE_CACHE_MAX_ROWS):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_rows = max_rows
+        self.memory = LRUCache(max_entries)
+        self.stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "writes": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return dict(value)
+
+        try:
+            entry = db.session.get(ParseCacheEntry, key)
+            if entry is not None and entry.expires_at > datetime.utcnow():
+                entry.hit_count += 1
+                entry.last_hit_at = datetime.utcnow()
+                db.session.commit()
+                self.memory.set(key, dict(entry.fields), entry.expires_at)
+                self._count("db_hits")
+                return dict(entry.fields)
+        except Exception as e:
+            db.session.rollback()
+            log.warning("Parse cache read failed", extra={"error": str(e)})
+
+        self._count("misses")
+        return None
+
+    def set(self, key, fields):
+        now = datetime.utcnow()
+        expires_at = now + self.ttl
+        fields = dict(fields)
+        self.memory.set(key, fields, expires_at)
+
+        try:
+            entry = db.session.get(ParseCacheEntry, key)
+            if entry is None:
+                entry = ParseCacheEntry(key=key)
+                db.session.add(entry)
+            entry.fields = dict(fields)
+            entry.created_at = now
+            entry.last_hit_at = now
+            entry.expires_at = expires_at
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            log.warning("Parse cache write failed", extra={"error": str(e)})
+            return
+
+        self._count("writes")
+        if self.stats["writes"] % PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self):
+        """Drop expired rows, then the least recently hit rows above max_rows."""
+        try:
+            ParseCacheEntry.query.filter(
+                ParseCacheEntry.expires_at <= datetime.utcnow()
+            ).delete(synchronize_session=False)
+
+            excess = ParseCacheEntry.query.count() - self.max_rows
+            if excess > 0:
+                oldest = (
+                    db.session.query(ParseCacheEntry.key)
+                    .order_by(ParseCacheEntry.last_hit_at)
+                    .limit(excess)
+                    .subquery()
+                )
+                ParseCacheEntry.query.filter(
+                    ParseCacheEntry.key.in_(db.select(oldest.c.key))
+                ).delete(synchronize_session=False)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            log.warning("Parse cache prune failed", extra={"error": str(e)})
+
+    def snapshot(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+        stats["memory_entries"] = len(self.memory)
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+parse_cache = ParseCache()
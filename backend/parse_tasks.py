@@ -0,0 +1,132 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+log = logging.getLogger(__name__)
+
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", 2))
+PARSE_QUEUE_LIMIT = int(os.environ.get("PARSE_QUEUE_LIMIT", 16))
+PARSE_TASK_TTL_SECONDS = int(os.environ.get("PARSE_TASK_TTL_SECONDS", 600))
+
+FINISHED_STATES = ("done", "failed")
+
+
+class QueueFull(Exception):
+    pass
+
+
+class ParseTask:
+    """State of one background parse, shared between a worker and its pollers.
+
+    Every update bumps version and notifies waiters, which is what the SSE
+    stream blocks on.
+    """
+
+    def __init__(self, owner=None):
+        self.id = str(uuid.uuid4())
+        self.owner = owner
+        self.status = "queued"
+        self.partial = {}
+        self.result = None
+        self.error = None
+        self.version = 0
+        self.updated_at = time.time()
+        self._changed = threading.Condition()
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATES
+
+    def update(self, status=None, partial=None, result=None, error=None):
+        with self._changed:
+            if status:
+                self.status = status
+            if partial:
+                self.partial.update(partial)
+            if result is not None:
+                self.result = result
+            if error is not None:
+                self.error = error
+            self.version += 1
+            self.updated_at = time.time()
+            self._changed.notify_all()
+
+    def wait(self, since_version, timeout):
+        """Block until version moves past since_version (or timeout); return the version."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version > since_version, timeout=timeout)
+            return self.version
+
+    def to_dict(self):
+        with self._changed:
+            return {
+                "task_id": self.id,
+                "status": self.status,
+                "partial": dict(self.partial),
+                "result": self.result,
+                "error": self.error,
+            }
+
+
+class ParseTaskQueue:
+    """Bounded in-process pool for parse jobs.
+
+    Tasks live in this process only, so polls must reach the process that
+    accepted the POST (one app process, or sticky routing); clients
+    resubmit when a poll gets a 404.
+    """
+
+    def __init__(self, workers=PARSE_WORKERS, queue_limit=PARSE_QUEUE_LIMIT, ttl_seconds=PARSE_TASK_TTL_SECONDS):
+        self.capacity = workers + queue_limit
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parse")
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    def _purge(self):
+        cutoff = time.time() - self.ttl_seconds
+        for task_id in [t.id for t in self._tasks.values() if t.finished and t.updated_at < cutoff]:
+            del self._tasks[task_id]
+
+    def _pending(self):
+        return sum(1 for t in self._tasks.values() if not t.finished)
+
+    def depth(self):
+        with self._lock:
+            return self._pending()
+
+    def create(self, owner=None):
+        """Register a task without scheduling work (e.g. answered from cache)."""
+        task = ParseTask(owner)
+        with self._lock:
+            self._purge()
+            self._tasks[task.id] = task
+        return task
+
+    def submit(self, fn, *args, owner=None):
+        """Run fn(task, *args) on the pool. Raises QueueFull when at capacity."""
+        task = ParseTask(owner)
+        with self._lock:
+            self._purge()
+            if self._pending() >= self.capacity:
+                raise QueueFull()
+            self._tasks[task.id] = task
+        self._executor.submit(self._run, task, fn, args)
+        return task
+
+    def _run(self, task, fn, args):
+        try:
+            fn(task, *args)
+        except Exception as e:
+            log.exception("Parse task failed")
+            task.update(status="failed", error=f"Failed to parse job URL: {str(e)}")
+        if not task.finished:
+            task.update(status="failed", error="Parse task ended without a result")
+
+    def get(self, task_id):
+        with self._lock:
+            return self._tasks.get(task_id)
@@ -0,0 +1,283 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from job_extractor import PARAGRAPH_TAGS, keyword_mask
+
+
+log = logging.getLogger(__name__)
+
+LLM_INPUT_TOKEN_BUDGET = int(os.environ.get("LLM_INPUT_TOKEN_BUDGET", 1500))
+# What the parser used to send: the first 6,000 characters. Only used to
+# report how many tokens compaction saved.
+LEGACY_MAX_CHARS = 6000
+# Don't bother truncating a block into less room than this.
+MIN_TRUNCATED_TOKENS = 48
+# A heading is a short block; longer ones are content even if they end in ":".
+MAX_HEADING_WORDS = 6
+# Sentences shorter than this aren't tracked across postings.
+MIN_TRACKED_WORDS = 8
+
+# Fallback token estimate: words in pieces of up to four characters, and
+# each punctuation mark. Slightly over-counts English BPE, which is the safe
+# side for a budget.
+APPROX_TOKEN = re.compile(r"\w{1,4}|[^\w\s]")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9])")
+
+BOILERPLATE = re.compile("|".join([
+    r"equal (employment )?opportunity", r"without regard to", r"reasonable accommodation", r"affirmative action",
+    r"protected veteran", r"do not discriminate", r"e-verify", r"\bcookies?\b", r"privacy (policy|notice|statement)",
+    r"terms of (use|service)", r"all rights reserved", r"^(apply|apply now|share|share this job|save job)$",
+    r"^back to (jobs|search|results)$",
+]), re.IGNORECASE)
+
+# Checked in order, so more specific headings come first.
+SECTIONS = [
+    ("preferred", 1, r"preferred|nice to have|bonus points|\bplus(es)?\b"),
+    ("about_role", 1, r"about (the|this) (role|job|position|team)|overview|job description|summary"),
+    ("responsibilities", 0, r"responsibilit|what you('|’)?ll do|what you will do|duties|day.to.day|your (role|impact)"),
+    ("requirements", 0, r"requirement|qualification|looking for|what you bring|you (have|bring)|skills|must have|"
+                        r"who you are|experience"),
+    ("compensation", 2, r"salary|compensation|pay range|\bpay\b"),
+    ("benefits", 3, r"benefit|perks|what we offer|why (join|work)|we offer"),
+    ("about_company", 3, r"about (us|the company)|who we are|our (mission|story|values|company)"),
+]
+SECTIONS = [(name, priority, re.compile(pattern, re.IGNORECASE)) for name, priority, pattern in SECTIONS]
+INTRO_PRIORITY = 1
+OTHER_PRIORITY = 2
+
+
+class TokenCounter:
+    """Counts tokens with the chat model's tokenizer, or estimates them without one."""
+
+    def __init__(self, tokenizer=None):
+        self.tokenizer = tokenizer
+        self._templates = {}
+
+    @property
+    def exact(self):
+        return self.tokenizer is not None
+
+    @classmethod
+    def load(cls, name, token=None):
+        """Load the tokenizer from a tokenizer.json path or a Hub model id; estimate if that fails."""
+        try:
+            from tokenizers import Tokenizer
+
+            if os.path.isfile(name):
+                return cls(Tokenizer.from_file(name))
+            return cls(Tokenizer.from_pretrained(name, token=token))
+        except Exception as e:
+            log.warning("Tokenizer unavailable, estimating token counts", extra={"tokenizer": name, "error": str(e)})
+            return cls()
+
+    def count(self, text):
+        if not text:
+            return 0
+        if self.tokenizer is None:
+            return len(APPROX_TOKEN.findall(text))
+        return len(self.tokenizer.encode(text, add_special_tokens=False).ids)
+
+    def count_many(self, texts):
+        if self.tokenizer is None:
+            return [self.count(t) for t in texts]
+        return [len(e.ids) for e in self.tokenizer.encode_batch(list(texts), add_special_tokens=False)]
+
+    def template_tokens(self, template):
+        """Tokens a prompt template adds around the text it wraps (memoized)."""
+        tokens = self._templates.get(template)
+        if tokens is None:
+            tokens = self._templates[template] = self.count(template.format(text=""))
+        return tokens
+
+
+class BoilerplateTracker:
+    """Remembers long sentences across postings to spot boilerplate no pattern covers.
+
+    A sentence seen in min_postings different postings (a company's benefits
+    blurb, its own wording of an EEO statement) is dropped from later ones.
+    Per-process and bounded; postings are told apart by a digest of their
+    text so re-parsing one doesn't count it twice.
+    """
+
+    def __init__(self, min_postings=3, max_sentences=20000, max_postings=2000):
+        self.min_postings = min_postings
+        self.max_sentences = max_sentences
+        self.max_postings = max_postings
+        self._counts = OrderedDict()
+        self._postings = OrderedDict()
+        self._lock = threading.Lock()
+
+    def observe(self, posting_key, fingerprints):
+        """Record a posting's sentence fingerprints; return the ones that are boilerplate."""
+        with self._lock:
+            new_posting = posting_key not in self._postings
+            self._postings[posting_key] = True
+            self._postings.move_to_end(posting_key)
+            while len(self._postings) > self.max_postings:
+                self._postings.popitem(last=False)
+
+            repeated = set()
+            for fp in fingerprints:
+                count = self._counts.get(fp, 0) + (1 if new_posting else 0)
+                self._counts[fp] = count
+                self._counts.move_to_end(fp)
+                if count >= self.min_postings:
+                    repeated.add(fp)
+            while len(self._counts) > self.max_sentences:
+                self._counts.popitem(last=False)
+            return repeated
+
+
+boilerplate = BoilerplateTracker()
+
+
+@dataclass
+class CompactPosting:
+    text: str
+    tokens: int
+    baseline_tokens: int
+    boilerplate_removed: int = 0
+    duplicates_removed: int = 0
+    blocks_dropped: list = field(default_factory=list)
+    # The page after the fixed cleanup only: learned boilerplate depends on
+    # what this process has seen, so cache keys come from this, not text.
+    source_text: str = ""
+
+
+@dataclass
+class _Block:
+    index: int
+    section: str
+    priority: int
+    text: str
+    heading: bool = False
+    tokens: int = 0
+
+
+def _normalize(sentence):
+    return " ".join(re.sub(r"[^\w\s]", "", sentence.lower()).split())
+
+
+def _fingerprint(sentence):
+    return hashlib.blake2b(_normalize(sentence).encode(), digest_size=8).digest()
+
+
+def _section_for(heading):
+    for name, priority, pattern in SECTIONS:
+        if pattern.search(heading):
+            return name, priority
+    return "other", OTHER_PRIORITY
+
+
+def _is_heading(tag, text):
+    """h1-h6, or a short <p> that ends in ":" or names a section ("Responsibilities")."""
+    if tag not in PARAGRAPH_TAGS:
+        return True
+    if tag != "p" or len(text.split()) > MAX_HEADING_WORDS:
+        return False
+    return text.endswith(":") or (not text.endswith(".") and _section_for(text)[0] != "other")
+
+
+def _truncate(text, tokens, room):
+    cut = text[:max(int(len(text) * room / tokens) - 1, 0)]
+    return cut[:cut.rfind(" ")].rstrip(" ,;:") + " …" if " " in cut else ""
+
+
+def compact_posting(blocks, counter, budget=LLM_INPUT_TOKEN_BUDGET, tracker=boilerplate):
+    """Fit a job page's (tag, text) blocks into budget tokens for the model.
+
+    Drops boilerplate (EEO statements, cookie and privacy notices, sentences
+    repeated across postings) and sentences repeated within this one, tags
+    every block with the section its nearest heading names, then fills the
+    budget by section priority (responsibilities and requirements first,
+    benefits and company blurb last), keeping document order in the output.
+    """
+    legacy = "\n".join(text for tag, text in blocks if tag in PARAGRAPH_TAGS)[:LEGACY_MAX_CHARS]
+    result = CompactPosting(text="", tokens=0, baseline_tokens=counter.count(legacy))
+
+    seen = set()
+    candidates = []
+    section, priority = "intro", INTRO_PRIORITY
+    for tag, text in blocks:
+        text = " ".join(text.split())
+        if not text:
+            continue
+        if _is_heading(tag, text):
+            section, priority = _section_for(text)
+            candidates.append(_Block(len(candidates), section, priority, text, heading=True))
+            continue
+
+        kept = []
+        for sentence in SENTENCE_END.split(text):
+            if BOILERPLATE.search(sentence):
+                result.boilerplate_removed += 1
+                continue
+            fp = _fingerprint(sentence)
+            if fp in seen:
+                result.duplicates_removed += 1
+                continue
+            seen.add(fp)
+            kept.append(sentence)
+        if not kept:
+            continue
+        block_priority = priority
+        if section == "intro" and not keyword_mask(text):
+            block_priority = OTHER_PRIORITY
+        candidates.append(_Block(len(candidates), section, block_priority, " ".join(kept)))
+
+    # Learned boilerplate only ever comes out of the lower-priority sections.
+    tracked = {}
+    for block in candidates:
+        if block.heading or block.priority == 0:
+            continue
+        for sentence in SENTENCE_END.split(block.text):
+            if len(sentence.split()) >= MIN_TRACKED_WORDS:
+                tracked.setdefault(_fingerprint(sentence), []).append(block)
+    result.source_text = "\n".join(b.text for b in candidates)
+    posting_key = hashlib.blake2b(result.source_text.encode(), digest_size=16).digest()
+    for fp in tracker.observe(posting_key, tracked):
+        for block in tracked[fp]:
+            sentences = [s for s in SENTENCE_END.split(block.text) if _fingerprint(s) != fp]
+            result.boilerplate_removed += 1
+            block.text = " ".join(sentences)
+    candidates = [b for b in candidates if b.text]
+
+    for block, tokens in zip(candidates, counter.count_many(b.text for b in candidates)):
+        block.tokens = tokens + 1  # the newline joining it to the next block
+
+    headings = {}
+    current = None
+    for block in candidates:
+        if block.heading:
+            current = block
+        else:
+            headings[block.index] = current
+
+    chosen = set()
+    room = budget
+    for block in sorted((b for b in candidates if not b.heading), key=lambda b: (b.priority, b.index)):
+        heading = headings.get(block.index)
+        cost = block.tokens + (heading.tokens if heading is not None and heading.index not in chosen else 0)
+        if cost <= room:
+            chosen.add(block.index)
+        elif room - (cost - block.tokens) >= MIN_TRUNCATED_TOKENS:
+            block.text = _truncate(block.text, block.tokens, room - (cost - block.tokens))
+            if not block.text:
+                result.blocks_dropped.append(block.section)
+                continue
+            chosen.add(block.index)
+        else:
+            result.blocks_dropped.append(block.section)
+            continue
+        if heading is not None:
+            chosen.add(heading.index)
+        room -= cost
+
+    result.text = "\n".join(b.text for b in candidates if b.index in chosen)
+    result.tokens = counter.count(result.text)
+    return result
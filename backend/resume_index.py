@@ -0,0 +1,203 @@
+import logging
+import os
+import re
+import tempfile
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from extensions import db, get_s3_client
+from models import Resume, ResumeText, ResumeTerm
+from search import tokenize
+
+
+log = logging.getLogger(__name__)
+
+RESUME_INDEX_WORKERS = int(os.environ.get("RESUME_INDEX_WORKERS", 2))
+MAX_RESUME_PAGES = int(os.environ.get("MAX_RESUME_PAGES", 50))
+# S3 bodies are copied in chunks into a spool that stays in memory up to this
+# size and moves to a temp file beyond it; pypdf needs a seekable file.
+SPOOL_MAX_BYTES = 1024 * 1024
+STREAM_CHUNK_BYTES = 64 * 1024
+MAX_TERM_LENGTH = 64
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of", "on", "or",
+    "our", "the", "to", "was", "we", "were", "with", "you", "your",
+}
+
+
+@dataclass
+class ExtractedResume:
+    text: str = ""
+    page_count: int = 0
+    token_count: int = 0
+    term_counts: Counter = field(default_factory=Counter)
+
+
+def normalize_text(text):
+    """NFKC-fold a page's text, rejoin hyphenated line breaks and collapse whitespace."""
+    text = unicodedata.normalize("NFKC", text).replace("\x00", "")
+    text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def index_terms(text):
+    return [t[:MAX_TERM_LENGTH] for t in tokenize(text) if t not in STOPWORDS]
+
+
+def extract_pdf_text(body, chunk_size=STREAM_CHUNK_BYTES):
+    """Extract normalized text and term counts from a PDF byte stream, page by page."""
+    from pypdf import PdfReader
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+        for chunk in iter(lambda: body.read(chunk_size), b""):
+            spool.write(chunk)
+        spool.seek(0)
+
+        reader = PdfReader(spool)
+        result = ExtractedResume(page_count=len(reader.pages))
+        pages = []
+        for number, page in enumerate(reader.pages):
+            if number >= MAX_RESUME_PAGES:
+                break
+            text = normalize_text(page.extract_text() or "")
+            terms = index_terms(text)
+            result.token_count += len(terms)
+            result.term_counts.update(terms)
+            pages.append(text)
+
+    result.text = "\n\n".join(pages)
+    return result
+
+
+def extract_resume(s3, bucket, s3_key):
+    body = s3.get_object(Bucket=bucket, Key=s3_key)["Body"]
+    try:
+        return extract_pdf_text(body)
+    finally:
+        body.close()
+
+
+def save_extracted(resume_id, user_id, extracted):
+    """Store a resume's text and stats and replace its rows in the term index."""
+    row = db.session.get(ResumeText, resume_id) or ResumeText(resume_id=resume_id, user_id=user_id)
+    row.status = "indexed"
+    row.error = None
+    row.text = extracted.text
+    row.page_count = extracted.page_count
+    row.char_count = len(extracted.text)
+    row.token_count = extracted.token_count
+    row.unique_terms = len(extracted.term_counts)
+    row.indexed_at = datetime.utcnow()
+    db.session.add(row)
+
+    ResumeTerm.query.filter_by(resume_id=resume_id).delete(synchronize_session=False)
+    db.session.bulk_insert_mappings(ResumeTerm, [
+        {"user_id": user_id, "term": term, "resume_id": resume_id, "count": count}
+        for term, count in extracted.term_counts.items()
+    ])
+    db.session.commit()
+
+
+def save_failure(resume_id, user_id, error):
+    db.session.rollback()
+    row = db.session.get(ResumeText, resume_id) or ResumeText(resume_id=resume_id, user_id=user_id)
+    row.status = "failed"
+    row.error = str(error)[:1000]
+    row.indexed_at = datetime.utcnow()
+    db.session.add(row)
+    db.session.commit()
+
+
+def clear_resume_index(resume_id):
+    """Drop a resume's text and terms (the FKs cascade on Postgres; this covers SQLite)."""
+    ResumeTerm.query.filter_by(resume_id=resume_id).delete(synchronize_session=False)
+    ResumeText.query.filter_by(resume_id=resume_id).delete(synchronize_session=False)
+
+
+def match_resumes(user_id, terms, limit=20):
+    """Rank a user's resumes by how many of terms they contain, then by occurrences.
+
+    Returns [(resume_id, matched term count, total occurrences)].
+    """
+    terms = sorted({t[:MAX_TERM_LENGTH] for t in terms})
+    if not terms:
+        return []
+    matched = db.func.count(ResumeTerm.term)
+    occurrences = db.func.sum(ResumeTerm.count)
+    return (
+        db.session.query(ResumeTerm.resume_id, matched, occurrences)
+        .filter(ResumeTerm.user_id == user_id, ResumeTerm.term.in_(terms))
+        .group_by(ResumeTerm.resume_id)
+        .order_by(matched.desc(), occurrences.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+class ResumeIndexer:
+    """Background thread pool that extracts and indexes newly uploaded resumes."""
+
+    def __init__(self, workers=RESUME_INDEX_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resume-index")
+
+    def submit(self, flask_app, resume_id):
+        return self._executor.submit(self._run, flask_app, resume_id)
+
+    def _run(self, flask_app, resume_id):
+        with flask_app.app_context():
+            resume = db.session.get(Resume, resume_id)
+            if resume is None:
+                return
+            try:
+                extracted = extract_resume(get_s3_client(), flask_app.config["AWS_S3_BUCKET"], resume.s3_key)
+                save_extracted(resume.id, resume.user_id, extracted)
+            except Exception as e:
+                log.warning("Resume indexing failed", extra={"resume_id": str(resume_id), "error": str(e)})
+                save_failure(resume.id, resume.user_id, e)
+
+
+# Backfill
+
+_worker_s3 = None
+
+
+def _init_backfill_worker(s3_options):
+    global _worker_s3
+    import boto3
+
+    _worker_s3 = boto3.client("s3", **s3_options)
+
+
+def _extract_in_worker(bucket, s3_key):
+    return extract_resume(_worker_s3, bucket, s3_key)
+
+
+def backfill(resumes, bucket, s3_options, workers=None):
+    """Extract many resumes in a process pool; results are written from this process.
+
+    resumes is an iterable of (resume_id, user_id, s3_key). PDF parsing is
+    CPU-bound, so worker processes sidestep the GIL; they only talk to S3,
+    never to the database. Returns (indexed, failed) counts.
+    """
+    indexed = failed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_backfill_worker,
+                             initargs=(s3_options,)) as pool:
+        futures = {
+            pool.submit(_extract_in_worker, bucket, s3_key): (resume_id, user_id)
+            for resume_id, user_id, s3_key in resumes
+        }
+        for future in as_completed(futures):
+            resume_id, user_id = futures[future]
+            try:
+                save_extracted(resume_id, user_id, future.result())
+                indexed += 1
+            except Exception as e:
+                log.warning("Resume indexing failed", extra={"resume_id": str(resume_id), "error": str(e)})
+                save_failure(resume_id, user_id, e)
+                failed += 1
+    return indexed, failed
@@ -0,0 +1,233 @@
+import hashlib
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+from extensions import db
+from models import JobApplication, ResumeText
+from resume_index import index_terms
+
+
+# Hashed feature space: terms are bucketed with crc32 (stable across worker
+# processes, unlike hash()). Raw vectors are float16 rows and the weighted
+# copies used for scoring are float32, so 5,000 applications cost about
+# 60 MB at the default width.
+MATCH_HASH_FEATURES = int(os.environ.get("MATCH_HASH_FEATURES", 2048))
+MATCH_CACHE_USERS = int(os.environ.get("MATCH_CACHE_USERS", 8))
+ID_BATCH = 500
+
+
+@lru_cache(maxsize=200000)
+def _bucket(term):
+    return zlib.crc32(term.encode()) % MATCH_HASH_FEATURES
+
+
+def vectorize(text):
+    """Sublinear term-frequency vector (1 + log tf) in the hashed feature space."""
+    terms = index_terms(text or "")
+    if not terms:
+        return np.zeros(MATCH_HASH_FEATURES, dtype=np.float16)
+    buckets = np.fromiter((_bucket(t) for t in terms), dtype=np.int64, count=len(terms))
+    tf = np.bincount(buckets, minlength=MATCH_HASH_FEATURES).astype(np.float32)
+    present = tf > 0
+    tf[present] = 1 + np.log(tf[present])
+    return tf.astype(np.float16)
+
+
+def _digest(*parts):
+    h = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        h.update((part or "").encode())
+        h.update(b"\0")
+    return h.digest()
+
+
+def _weighted(matrix, idf):
+    """Apply idf and L2-normalize rows, in float32."""
+    weighted = matrix.astype(np.float32) * idf
+    norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+    np.maximum(norms, 1e-12, out=norms)
+    weighted /= norms
+    return weighted
+
+
+class _VectorSet:
+    """Vectors for one kind of document, refreshed row by row.
+
+    rows maps id -> (stamp, content digest, vector). A row is re-vectorized
+    only when its stamp moved *and* its text actually changed, so a status
+    update doesn't cost a re-vectorization.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.rows = {}
+        self.ids = []
+        self.matrix = np.zeros((0, MATCH_HASH_FEATURES), dtype=np.float16)
+        self.vectorized = 0
+
+    def refresh(self, version, stamps, load_texts):
+        """stamps: {id: stamp}; load_texts(ids) -> {id: text parts}. Returns True if anything changed."""
+        if version == self.version:
+            return False
+
+        stale = [doc_id for doc_id, stamp in stamps.items()
+                 if doc_id not in self.rows or self.rows[doc_id][0] != stamp]
+        changed = len(stamps) != len(self.rows) or any(doc_id not in stamps for doc_id in self.rows)
+        for start in range(0, len(stale), ID_BATCH):
+            for doc_id, parts in load_texts(stale[start:start + ID_BATCH]).items():
+                digest = _digest(*parts)
+                old = self.rows.get(doc_id)
+                if old is not None and old[1] == digest:
+                    self.rows[doc_id] = (stamps[doc_id], digest, old[2])
+                    continue
+                self.rows[doc_id] = (stamps[doc_id], digest, vectorize(" ".join(p or "" for p in parts)))
+                self.vectorized += 1
+                changed = True
+
+        for doc_id in [d for d in self.rows if d not in stamps]:
+            del self.rows[doc_id]
+        if changed:
+            self.ids = sorted(self.rows, key=str)
+            self.matrix = (np.stack([self.rows[i][2] for i in self.ids]) if self.ids
+                           else np.zeros((0, MATCH_HASH_FEATURES), dtype=np.float16))
+        self.version = version
+        return changed
+
+
+class _UserVectors:
+    def __init__(self):
+        self.apps = _VectorSet()
+        self.resumes = _VectorSet()
+        self.lock = threading.Lock()
+        self.weighted_apps = None
+        self.weighted_resumes = None
+        self.app_index = {}
+
+    def rebuild_weights(self):
+        """Recompute idf over the user's resumes and applications, and the weighted matrices.
+
+        Only runs after a vector changed, so scoring itself is one matrix product.
+        """
+        n = len(self.apps.ids) + len(self.resumes.ids)
+        df = np.count_nonzero(self.apps.matrix, axis=0) + np.count_nonzero(self.resumes.matrix, axis=0)
+        idf = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+        self.weighted_apps = _weighted(self.apps.matrix, idf)
+        self.weighted_resumes = _weighted(self.resumes.matrix, idf)
+        self.app_index = {app_id: i for i, app_id in enumerate(self.apps.ids)}
+
+
+class ResumeMatcher:
+    """Per-process cache of per-user resume/application vectors and batched scoring.
+
+    Like the search fallback index, each user's vectors are tagged with
+    aggregate versions (row count, newest stamp) for applications and indexed
+    resumes; only when those move are individual rows diffed and re-vectorized.
+    """
+
+    def __init__(self, max_users=MATCH_CACHE_USERS):
+        self.max_users = max_users
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _entry(self, user_id):
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                entry = self._users[user_id] = _UserVectors()
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        return entry
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def get(self, user_id):
+        entry = self._entry(user_id)
+        with entry.lock:
+            changed = self._refresh_apps(entry.apps, user_id)
+            changed = self._refresh_resumes(entry.resumes, user_id) or changed
+            if changed or entry.weighted_apps is None:
+                entry.rebuild_weights()
+        return entry
+
+    def _refresh_apps(self, vectors, user_id):
+        version = tuple(
+            db.session.query(db.func.count(JobApplication.id), db.func.max(JobApplication.updated_at))
+            .filter(JobApplication.user_id == user_id)
+            .one()
+        )
+        if version == vectors.version:
+            return False
+        stamps = dict(
+            db.session.query(JobApplication.id, JobApplication.updated_at)
+            .filter(JobApplication.user_id == user_id)
+            .all()
+        )
+
+        def load_texts(ids):
+            rows = (db.session.query(JobApplication.id, JobApplication.title, JobApplication.description)
+                    .filter(JobApplication.id.in_(ids)).all())
+            return {row.id: (row.title, row.description) for row in rows}
+
+        return vectors.refresh(version, stamps, load_texts)
+
+    def _refresh_resumes(self, vectors, user_id):
+        indexed = db.session.query(ResumeText).filter(
+            ResumeText.user_id == user_id, ResumeText.status == "indexed"
+        )
+        version = tuple(indexed.with_entities(db.func.count(ResumeText.resume_id),
+                                              db.func.max(ResumeText.indexed_at)).one())
+        if version == vectors.version:
+            return False
+        stamps = dict(indexed.with_entities(ResumeText.resume_id, ResumeText.indexed_at).all())
+
+        def load_texts(ids):
+            rows = (db.session.query(ResumeText.resume_id, ResumeText.text)
+                    .filter(ResumeText.resume_id.in_(ids)).all())
+            return {row.resume_id: (row.text,) for row in rows}
+
+        return vectors.refresh(version, stamps, load_texts)
+
+    def score(self, user_id, application_ids=None):
+        """Cosine scores (0..1) for every indexed resume against the given applications.
+
+        Returns (resume ids, application ids, scores) with scores shaped
+        (len(resume ids), len(application ids)), computed as one matrix product.
+        """
+        entry = self.get(user_id)
+        with entry.lock:
+            resume_ids = list(entry.resumes.ids)
+            resumes = entry.weighted_resumes
+            if application_ids is None:
+                app_ids = list(entry.apps.ids)
+                apps = entry.weighted_apps
+            else:
+                app_ids = [a for a in application_ids if a in entry.app_index]
+                apps = entry.weighted_apps[[entry.app_index[a] for a in app_ids]]
+
+        if not resume_ids or not app_ids:
+            return resume_ids, app_ids, np.zeros((len(resume_ids), len(app_ids)), dtype=np.float32)
+        return resume_ids, app_ids, resumes @ apps.T
+
+    def top_matches(self, user_id, application_ids=None, top=1):
+        """[(application id, [(resume id, score 0..100), ...best first])] for each application."""
+        resume_ids, app_ids, scores = self.score(user_id, application_ids)
+        if not resume_ids:
+            return [(app_id, []) for app_id in app_ids]
+        top = min(top, len(resume_ids))
+        best = np.argsort(-scores, axis=0, kind="stable")[:top]
+        picked = np.take_along_axis(scores, best, axis=0)
+        return [
+            (app_id, [(resume_ids[r], round(float(s) * 100, 1)) for r, s in zip(best[:, col], picked[:, col])])
+            for col, app_id in enumerate(app_ids)
+        ]
+
+
+resume_matcher = ResumeMatcher()
@@ -0,0 +1,191 @@
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime
+
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from werkzeug.utils import secure_filename
+
+
+log = logging.getLogger(__name__)
+
+RESUME_MAX_BYTES = int(os.environ.get("RESUME_MAX_BYTES", 25 * 1024 * 1024))
+# Files above this size are uploaded in parts; S3 requires every part but the
+# last to be at least 5 MiB.
+RESUME_MULTIPART_THRESHOLD = int(os.environ.get("RESUME_MULTIPART_THRESHOLD", 8 * 1024 * 1024))
+RESUME_PART_SIZE = max(int(os.environ.get("RESUME_PART_SIZE", 5 * 1024 * 1024)), 5 * 1024 * 1024)
+UPLOAD_URL_EXPIRES = int(os.environ.get("RESUME_UPLOAD_URL_EXPIRES", 900))
+# Upload tokens outlive the presigned URLs so a slow multipart upload can still complete.
+UPLOAD_TOKEN_MAX_AGE = UPLOAD_URL_EXPIRES + 3600
+
+SIGNED_URL_EXPIRES = 300
+# A cached preview URL is only reused while it has at least this long left,
+# so the browser never gets one that expires while the PDF is loading.
+SIGNED_URL_MARGIN = int(os.environ.get("SIGNED_URL_MARGIN_SECONDS", 60))
+
+
+class UploadError(ValueError):
+    pass
+
+
+def resume_key(user_id, filename):
+    filename = secure_filename(f"{user_id}_{datetime.utcnow().timestamp()}_{filename}")
+    return f"resumes/{filename}"
+
+
+def resume_url(bucket, s3_key):
+    return f"https://{bucket}.s3.amazonaws.com/{s3_key}"
+
+
+def _serializer(secret_key):
+    return URLSafeTimedSerializer(secret_key, salt="careervault-resume-upload")
+
+
+def load_upload_token(secret_key, token, user_id):
+    """Return the ticket an upload token was issued for, if it belongs to user_id."""
+    try:
+        ticket = _serializer(secret_key).loads(token or "", max_age=UPLOAD_TOKEN_MAX_AGE)
+    except BadSignature:
+        raise UploadError("Invalid or expired upload token")
+    if ticket.get("uid") != str(user_id):
+        raise UploadError("Invalid or expired upload token")
+    return ticket
+
+
+def start_upload(s3, bucket, secret_key, user_id, filename, size):
+    """Reserve an S3 key and presign the requests the browser uploads with.
+
+    Small files get a presigned POST whose policy pins the content type and
+    size; larger ones get a multipart upload with one presigned PUT per part.
+    The returned upload_token is what complete_upload() trusts, so clients
+    can't point a Resume row at someone else's object.
+    """
+    if not filename or not filename.lower().endswith(".pdf"):
+        raise UploadError("Only PDF files allowed")
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError("size must be the file size in bytes")
+    if size <= 0 or size > RESUME_MAX_BYTES:
+        raise UploadError(f"Resumes must be between 1 byte and {RESUME_MAX_BYTES} bytes")
+
+    key = resume_key(user_id, filename)
+    ticket = {"uid": str(user_id), "key": key, "filename": filename}
+
+    if size <= RESUME_MULTIPART_THRESHOLD:
+        post = s3.generate_presigned_post(
+            bucket, key,
+            Fields={"Content-Type": "application/pdf"},
+            Conditions=[{"Content-Type": "application/pdf"}, ["content-length-range", 1, RESUME_MAX_BYTES]],
+            ExpiresIn=UPLOAD_URL_EXPIRES,
+        )
+        upload = {"method": "POST", "url": post["url"], "fields": post["fields"]}
+    else:
+        upload_id = s3.create_multipart_upload(Bucket=bucket, Key=key, ContentType="application/pdf")["UploadId"]
+        ticket["upload_id"] = upload_id
+        part_count = math.ceil(size / RESUME_PART_SIZE)
+        upload = {
+            "method": "multipart",
+            "part_size": RESUME_PART_SIZE,
+            "parts": [
+                {
+                    "part_number": n,
+                    "url": s3.generate_presigned_url(
+                        "upload_part",
+                        Params={"Bucket": bucket, "Key": key, "UploadId": upload_id, "PartNumber": n},
+                        ExpiresIn=UPLOAD_URL_EXPIRES,
+                    ),
+                }
+                for n in range(1, part_count + 1)
+            ],
+        }
+
+    upload.update(key=key, upload_token=_serializer(secret_key).dumps(ticket), expires_in=UPLOAD_URL_EXPIRES)
+    return upload
+
+
+def complete_upload(s3, bucket, ticket, parts=None):
+    """Finish a multipart upload if needed and check the object is really there."""
+    from botocore.exceptions import ClientError
+
+    key = ticket["key"]
+    if ticket.get("upload_id"):
+        if not isinstance(parts, list) or not parts:
+            raise UploadError("parts are required to complete a multipart upload")
+        try:
+            s3.complete_multipart_upload(
+                Bucket=bucket, Key=key, UploadId=ticket["upload_id"],
+                MultipartUpload={"Parts": sorted(
+                    ({"PartNumber": int(p["part_number"]), "ETag": p["etag"]} for p in parts),
+                    key=lambda p: p["PartNumber"],
+                )},
+            )
+        except (KeyError, TypeError, ValueError):
+            raise UploadError("Each part needs a part_number and etag")
+        except ClientError as e:
+            raise UploadError(f"Could not complete upload: {e.response['Error'].get('Code')}")
+
+    try:
+        head = s3.head_object(Bucket=bucket, Key=key)
+    except ClientError:
+        raise UploadError("Upload not found; send the file to S3 before completing")
+
+    if head["ContentLength"] > RESUME_MAX_BYTES:
+        s3.delete_object(Bucket=bucket, Key=key)
+        raise UploadError(f"Resumes must be at most {RESUME_MAX_BYTES} bytes")
+    return head
+
+
+def abort_upload(s3, bucket, ticket):
+    """Drop an unfinished upload: abort the multipart upload, or delete a stray object."""
+    from botocore.exceptions import ClientError
+
+    try:
+        if ticket.get("upload_id"):
+            s3.abort_multipart_upload(Bucket=bucket, Key=ticket["key"], UploadId=ticket["upload_id"])
+        else:
+            s3.delete_object(Bucket=bucket, Key=ticket["key"])
+    except ClientError as e:
+        log.warning("S3 abort upload failed", extra={"key": ticket["key"], "error": str(e)})
+
+
+class SignedUrlCache:
+    """Presigned GET URLs for resume previews, keyed by s3_key.
+
+    A URL is reused until it is within `margin` seconds of expiring, so
+    repeated previews of the same resume skip re-signing.
+    """
+
+    def __init__(self, expires_in=SIGNED_URL_EXPIRES, margin=SIGNED_URL_MARGIN, max_entries=10000):
+        self.expires_in = expires_in
+        self.margin = min(margin, expires_in // 2)
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, s3, bucket, s3_key):
+        """Return (url, seconds until it expires)."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(s3_key)
+        if entry and entry[1] - self.margin > now:
+            return entry[0], int(entry[1] - now)
+
+        url = s3.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": bucket, "Key": s3_key},
+            ExpiresIn=self.expires_in,
+        )
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {k: v for k, v in self._entries.items() if v[1] - self.margin > now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[s3_key] = (url, now + self.expires_in)
+        return url, self.expires_in
+
+    def invalidate(self, s3_key):
+        with self._lock:
+            self._entries.pop(s3_key, None)
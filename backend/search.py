@@ -0,0 +1,242 @@
+import math
+import re
+import threading
+from collections import OrderedDict, defaultdict
+
+from sqlalchemy.orm import load_only
+
+from extensions import db
+from models import JobApplication
+
+
+HIGHLIGHT_START = "<<hl>>"
+HIGHLIGHT_END = "<</hl>>"
+SNIPPET_WORDS = 30
+
+# Field weights mirror the setweight() labels of job_applications.search_vector
+# (A/A/B/C, see migration 4b1f0c2e9a73).
+FIELD_WEIGHTS = {
+    "title": 1.0,
+    "company_name": 1.0,
+    "location": 0.4,
+    "description": 0.2,
+}
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def split_highlights(marked):
+    """Turn a snippet containing highlight markers into (text, [[start, end], ...]).
+
+    Returning offsets instead of HTML keeps the client from having to render
+    untrusted description markup.
+    """
+    text, highlights = [], []
+    pos = 0
+    for part in re.split(f"({re.escape(HIGHLIGHT_START)}|{re.escape(HIGHLIGHT_END)})", marked):
+        if part == HIGHLIGHT_START:
+            start = pos
+        elif part == HIGHLIGHT_END:
+            highlights.append([start, pos])
+        else:
+            text.append(part)
+            pos += len(part)
+    return "".join(text), highlights
+
+
+def search_applications(user_id, q, base_query, filtered, limit, offset):
+    """Rank the user's applications against q. Returns (results, has_more).
+
+    base_query is already scoped to the user and any list filters; filtered
+    says whether it narrows anything beyond the user.
+    """
+    if db.engine.dialect.name == "postgresql":
+        return _search_postgres(q, base_query, limit, offset)
+    return _fallback_index.search(user_id, q, base_query if filtered else None, limit, offset)
+
+
+def _result(app, rank, snippet):
+    text, highlights = split_highlights(snippet or "")
+    return {
+        "id": app.id,
+        "title": app.title,
+        "company": app.company_name,
+        "job_type": app.job_type,
+        "location": app.location,
+        "status": app.status,
+        "applied_at": app.applied_at.isoformat() + "Z",
+        "application_url": app.application_url,
+        "rank": rank,
+        "snippet": text,
+        "highlights": highlights,
+    }
+
+
+# PostgreSQL: generated tsvector column + GIN index
+
+def _search_postgres(q, base_query, limit, offset):
+    tsquery = db.func.websearch_to_tsquery("english", q)
+    rank = db.func.ts_rank_cd(JobApplication.search_vector, tsquery).label("rank")
+
+    # Rank and page on the index first, then run ts_headline only for the
+    # rows actually returned; it re-parses the description and is the
+    # expensive part of the query.
+    page = (
+        base_query
+        .with_entities(JobApplication.id.label("id"), rank)
+        .filter(JobApplication.search_vector.op("@@")(tsquery))
+        .order_by(rank.desc(), JobApplication.id)
+        .limit(limit + 1)
+        .offset(offset)
+        .subquery()
+    )
+
+    headline = db.func.ts_headline(
+        "english",
+        db.func.coalesce(JobApplication.description, ""),
+        tsquery,
+        f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_END}", MaxWords={SNIPPET_WORDS}, MinWords=10, MaxFragments=2',
+    ).label("snippet")
+
+    rows = (
+        db.session.query(JobApplication, page.c.rank, headline)
+        .join(page, JobApplication.id == page.c.id)
+        .options(load_only(
+            JobApplication.title, JobApplication.company_name, JobApplication.job_type,
+            JobApplication.location, JobApplication.status, JobApplication.applied_at,
+            JobApplication.application_url,
+        ))
+        .order_by(page.c.rank.desc(), JobApplication.id)
+        .all()
+    )
+    has_more = len(rows) > limit
+    return [_result(app, float(r), snippet) for app, r, snippet in rows[:limit]], has_more
+
+
+# SQLite / other dev databases: pure-Python inverted index
+
+class _UserIndex:
+    """Inverted index over one user's applications.
+
+    postings maps token -> {application id: weighted term frequency}.
+    """
+
+    def __init__(self, version, apps):
+        self.version = version
+        self.postings = defaultdict(dict)
+        self.docs = {}
+        for app in apps:
+            self.docs[app.id] = app
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(getattr(app, field)):
+                    bucket = self.postings[token]
+                    bucket[app.id] = bucket.get(app.id, 0.0) + weight
+
+    def match(self, terms):
+        """Return {app id: score} for docs containing every term (AND semantics)."""
+        lists = []
+        for term in terms:
+            posting = self.postings.get(term)
+            if not posting:
+                return {}
+            lists.append((term, posting))
+        lists.sort(key=lambda item: len(item[1]))
+
+        candidates = set(lists[0][1])
+        for _, posting in lists[1:]:
+            candidates &= posting.keys()
+            if not candidates:
+                return {}
+
+        n = len(self.docs)
+        idfs = [(posting, math.log(1 + n / len(posting))) for _, posting in lists]
+        return {
+            doc_id: sum(posting[doc_id] * idf for posting, idf in idfs)
+            for doc_id in candidates
+        }
+
+
+def _fallback_snippet(description, terms):
+    words = (description or "").split()
+    if not words:
+        return ""
+    terms = set(terms)
+    hit = next((i for i, w in enumerate(words) if terms.intersection(tokenize(w))), 0)
+    start = max(0, hit - SNIPPET_WORDS // 3)
+    window = words[start:start + SNIPPET_WORDS]
+    marked = [
+        f"{HIGHLIGHT_START}{w}{HIGHLIGHT_END}" if terms.intersection(tokenize(w)) else w
+        for w in window
+    ]
+    return " ".join(marked)
+
+
+class FallbackSearchIndex:
+    """Per-process cache of per-user inverted indexes.
+
+    Each index is tagged with (row count, max updated_at) for its user; that
+    aggregate is answered from ix_job_applications_user_updated, so a stale
+    index (e.g. after a write in another worker) is rebuilt on the next query.
+    """
+
+    def __init__(self, max_users=64):
+        self.max_users = max_users
+        self._indexes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _version(self, user_id):
+        return tuple(
+            db.session.query(db.func.count(JobApplication.id), db.func.max(JobApplication.updated_at))
+            .filter(JobApplication.user_id == user_id)
+            .one()
+        )
+
+    def get(self, user_id):
+        version = self._version(user_id)
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is not None and index.version == version:
+                self._indexes.move_to_end(user_id)
+                return index
+
+        apps = JobApplication.query.filter_by(user_id=user_id).all()
+        for app in apps:
+            db.session.expunge(app)
+        index = _UserIndex(version, apps)
+
+        with self._lock:
+            self._indexes[user_id] = index
+            self._indexes.move_to_end(user_id)
+            while len(self._indexes) > self.max_users:
+                self._indexes.popitem(last=False)
+        return index
+
+    def search(self, user_id, q, filter_query, limit, offset):
+        terms = tokenize(q)
+        if not terms:
+            return [], False
+
+        index = self.get(user_id)
+        scores = index.match(terms)
+        if not scores:
+            return [], False
+
+        # Only pay for a filter query when the caller actually filtered.
+        if filter_query is not None:
+            allowed = {row[0] for row in filter_query.with_entities(JobApplication.id).all()}
+            scores = {doc_id: s for doc_id, s in scores.items() if doc_id in allowed}
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], str(item[0])))
+        page = ranked[offset:offset + limit]
+        results = [
+            _result(index.docs[doc_id], round(score, 6), _fallback_snippet(index.docs[doc_id].description, terms))
+            for doc_id, score in page
+        ]
+        return results, len(ranked) > offset + limit
+
+
+_fallback_index = FallbackSearchIndex()
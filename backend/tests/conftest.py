@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Tests import backend modules the way the app does, and reuse the local
+# stand-ins (fixture board, fake inference server, reply corpus) in benchmarks/.
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+USERS = ("ada@example.com", "grace@example.com")
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Build the app on a fresh SQLite database with the USERS signed up."""
+    apps = []
+
+    def make(**config):
+        from app import create_app
+        from extensions import db
+        from models import User
+
+        app = create_app(dict({
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+            "SECRET_KEY": "test-secret",
+        }, **config))
+        with app.app_context():
+            db.create_all()
+            for email in USERS:
+                db.session.add(User(email=email, name=email.split("@")[0]))
+            db.session.commit()
+        apps.append(app)
+        return app
+
+    yield make
+    from extensions import db
+
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
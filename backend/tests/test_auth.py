@@ -0,0 +1,69 @@
+"""Session tokens: who may get one, and what an invalid one gets."""
+import pytest
+
+from auth import issue_session_token, load_session_token
+
+ADA = "ada@example.com"
+
+
+@pytest.fixture
+def google(monkeypatch):
+    """Stand in for Google's verifier: "google:<email>" verifies as <email>."""
+    import app as app_module
+
+    def verify(token):
+        if not token.startswith("google:"):
+            raise ValueError("Token used too late")
+        return {"email": token[len("google:"):]}
+
+    monkeypatch.setattr(app_module, "verify_google_id_token", verify)
+
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def token_for(app, email):
+    from models import User
+
+    with app.app_context():
+        return issue_session_token(app.secret_key, User.query.filter_by(email=email).one())
+
+
+def test_header_alone_cannot_mint_a_token(app):
+    response = app.test_client().post("/api/session-token", headers={"X-User-Email": ADA})
+    assert response.status_code == 401
+    assert "session_token" not in response.get_json()
+
+
+def test_valid_token_is_renewed(app):
+    client = app.test_client()
+    response = client.post("/api/session-token", headers=bearer(token_for(app, ADA)))
+    assert response.status_code == 200
+    renewed = response.get_json()["session_token"]
+    assert load_session_token(app.secret_key, renewed).email == ADA
+    assert client.get("/api/applications", headers=bearer(renewed)).status_code == 200
+
+
+def test_google_id_token_gets_a_token(app, google):
+    client = app.test_client()
+    response = client.post("/api/session-token", json={"token": f"google:{ADA}"},
+                           headers=bearer("expired-or-rotated"))
+    assert response.status_code == 200
+    assert load_session_token(app.secret_key, response.get_json()["session_token"]).email == ADA
+
+    assert client.post("/api/session-token", json={"token": "forged"}).status_code == 401
+    assert client.post("/api/session-token", json={"token": "google:nobody@example.com"}).status_code == 401
+
+
+def test_invalid_token_is_401_without_falling_back_to_the_header(app):
+    client = app.test_client()
+    rotated = issue_session_token("an-old-secret", load_session_token(app.secret_key, token_for(app, ADA)))
+    for token in (rotated, "not-a-token"):
+        headers = dict(bearer(token), **{"X-User-Email": ADA})
+        assert client.get("/api/applications", headers=headers).status_code == 401
+        assert client.post("/api/session-token", headers=headers).status_code == 401
+
+
+def test_header_requests_without_a_token_still_work(app):
+    assert app.test_client().get("/api/applications", headers={"X-User-Email": ADA}).status_code == 200
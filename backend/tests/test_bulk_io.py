@@ -0,0 +1,40 @@
+"""Bulk import of applications."""
+import io
+import json
+
+import pytest
+
+ADA = {"X-User-Email": "ada@example.com"}
+
+
+def upload(client, rows, filename="applications.ndjson"):
+    body = "\n".join(json.dumps(row) for row in rows).encode()
+    return client.post("/api/applications/import", headers=ADA, content_type="multipart/form-data",
+                       data={"file": (io.BytesIO(body), filename)})
+
+
+def row(**fields):
+    return dict({"title": "Backend Engineer", "company": "Acme", "application_url": "https://acme.test/jobs/1"},
+                **fields)
+
+
+@pytest.mark.parametrize("applied_at", [1700000000, 17.5, ["2024-01-01"], {"date": "2024-01-01"}, True])
+def test_ndjson_applied_at_must_be_a_string(app, applied_at):
+    response = upload(app.test_client(), [row(), row(applied_at=applied_at), row(applied_at="2024-03-01T09:00:00Z")])
+    assert response.status_code == 201
+    report = response.get_json()
+    assert report["imported"] == 2
+    assert report["errors"] == [{"line": 2, "error": "applied_at must be an ISO-8601 string"}]
+
+
+def test_invalid_applied_at_is_a_row_error(app):
+    report = upload(app.test_client(), [row(applied_at="last tuesday")]).get_json()
+    assert report["imported"] == 0
+    assert report["errors"] == [{"line": 1, "error": "Invalid date: last tuesday"}]
+
+
+def test_applied_at_offset_is_stored_as_utc(app):
+    client = app.test_client()
+    upload(client, [row(applied_at="2024-03-01T09:00:00+02:00")])
+    apps = client.get("/api/applications", headers=ADA).get_json()
+    assert apps[0]["applied_at"].startswith("2024-03-01T07:00:00")
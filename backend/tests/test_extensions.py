@@ -0,0 +1,49 @@
+"""Lazily built clients."""
+import threading
+
+from extensions import _client
+
+
+def test_each_client_is_built_once(app):
+    builds = []
+
+    def build(config):
+        builds.append(1)
+        return object()
+
+    def get():
+        with app.app_context():
+            results.append(_client("test-once", build))
+
+    results = []
+    threads = [threading.Thread(target=get) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(builds) == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_slow_build_does_not_block_other_clients(app):
+    started, release = threading.Event(), threading.Event()
+
+    def slow(config):
+        started.set()
+        release.wait(5)
+        return "slow"
+
+    def get_slow():
+        with app.app_context():
+            _client("test-slow", slow)
+
+    thread = threading.Thread(target=get_slow)
+    thread.start()
+    try:
+        assert started.wait(5)
+        with app.app_context():
+            assert _client("test-fast", lambda config: "fast") == "fast"
+        assert thread.is_alive()
+    finally:
+        release.set()
+        thread.join()
@@ -0,0 +1,115 @@
+"""ExtractionService against the fake chat-completions server."""
+import threading
+
+import pytest
+from huggingface_hub import InferenceClient
+from huggingface_hub.errors import HfHubHTTPError
+
+from fake_inference import DEFAULT_TRAILER, FakeInferenceServer
+from llm_extraction import ExtractionService, ExtractionTimeout
+
+MODEL = "fake-model"
+
+
+@pytest.fixture
+def fake_inference():
+    servers = []
+
+    def start(**options):
+        servers.append(FakeInferenceServer(**options).start())
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def client_factory(server):
+    return lambda: InferenceClient(base_url=server.url, api_key="fake", timeout=10)
+
+
+def job_text(n):
+    return f"Job {n}: Senior Backend Engineer at Example Corp, remote. Python, Postgres and Kubernetes."
+
+
+def run_threads(fn, args):
+    results = [None] * len(args)
+
+    def run(i):
+        try:
+            results[i] = fn(args[i])
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(args))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_requests_for_one_text_share_a_call(fake_inference):
+    server = fake_inference(latency=0.2)
+    new_client = client_factory(server)
+    service = ExtractionService(MODEL, stream=False)
+
+    results = run_threads(lambda text: service.extract(new_client, text), [job_text(1)] * 12)
+    assert server.requests == 1
+    assert all(r == results[0] for r in results)
+    assert results[0]["company"] == "Example Corp"
+    assert service.stats["coalesced"] == 11
+
+
+def test_calls_in_flight_are_capped(fake_inference):
+    server = fake_inference(latency=0.1)
+    new_client = client_factory(server)
+    service = ExtractionService(MODEL, max_concurrency=3, stream=False)
+
+    results = run_threads(lambda text: service.extract(new_client, text), [job_text(n) for n in range(12)])
+    assert not any(isinstance(r, Exception) for r in results)
+    assert server.requests == 12
+    assert server.max_active == 3
+
+
+def test_overloaded_model_is_retried(fake_inference):
+    server = fake_inference(fail_rate=0.5, seed=1)
+    new_client = client_factory(server)
+    service = ExtractionService(MODEL, max_attempts=10, backoff_seconds=0.01, stream=False)
+
+    for n in range(8):
+        assert service.extract(new_client, job_text(n))["company"] == "Example Corp"
+    assert server.failures > 0
+    assert service.stats["retries"] == server.failures
+    assert service.stats["failures"] == 0
+
+
+def test_gives_up_after_max_attempts(fake_inference):
+    server = fake_inference(fail_rate=1.0)
+    new_client = client_factory(server)
+    service = ExtractionService(MODEL, max_attempts=3, backoff_seconds=0.01, stream=False)
+
+    with pytest.raises(HfHubHTTPError) as raised:
+        service.extract(new_client, job_text(1))
+    assert raised.value.response.status_code == 503
+    assert server.requests == 3
+    assert service.stats["failures"] == 1
+
+
+def test_waiting_for_a_slot_times_out_at_the_deadline(fake_inference):
+    server = fake_inference(latency=0.5)
+    new_client = client_factory(server)
+    service = ExtractionService(MODEL, max_concurrency=1, deadline_seconds=0.2, stream=False)
+
+    results = run_threads(lambda text: service.extract(new_client, text), [job_text(1), job_text(2)])
+    assert sum(isinstance(r, ExtractionTimeout) for r in results) == 1
+
+
+def test_stream_stops_after_the_json_object(fake_inference):
+    server = fake_inference(token_delay=0.002, trailer=DEFAULT_TRAILER * 20)
+    new_client = client_factory(server)
+    service = ExtractionService(MODEL, stream=True)
+
+    fields = service.extract(new_client, job_text(1))
+    assert fields["company"] == "Example Corp" and fields["job_type"] == "Full-Time"
+    assert service.stats["early_stops"] == 1
@@ -0,0 +1,49 @@
+"""The malformed-reply corpus through the streaming JSON extractor."""
+import json
+import os
+import random
+
+import pytest
+
+from llm_extraction import JsonStreamParser, parse_response
+from replay_llm_responses import CORPUS_DIR, chunkings, replay
+
+with open(os.path.join(CORPUS_DIR, "expected.json")) as f:
+    EXPECTED = json.load(f)
+
+
+def reply(name):
+    with open(os.path.join(CORPUS_DIR, f"{name}.txt")) as f:
+        return f.read()
+
+
+def test_every_reply_has_an_expectation():
+    names = {n[:-len(".txt")] for n in os.listdir(CORPUS_DIR) if n.endswith(".txt")}
+    assert names == set(EXPECTED)
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_reply_yields_expected_fields(name):
+    text = reply(name)
+    for mode, chunks in chunkings(text, random.Random(name)):
+        fields, _ = replay(chunks)
+        assert fields == EXPECTED[name], f"{name} fed {mode}"
+
+
+@pytest.mark.parametrize("name", sorted(n for n, fields in EXPECTED.items() if fields is not None))
+def test_complete_reply_parses(name):
+    assert parse_response(reply(name)) == EXPECTED[name]
+
+
+@pytest.mark.parametrize("name", sorted(n for n, fields in EXPECTED.items() if fields is None))
+def test_rejected_reply_raises(name):
+    with pytest.raises(ValueError):
+        parse_response(reply(name))
+
+
+def test_stream_stops_when_the_object_closes():
+    obj = json.dumps(EXPECTED["clean"])
+    parser = JsonStreamParser()
+    assert parser.feed("Here you go:\n" + obj[:-1]) is False
+    assert parser.feed(obj[-1:]) is True
+    assert parser.result() == EXPECTED["clean"]
@@ -0,0 +1,38 @@
+"""The alembic chain on SQLite, the local development database."""
+import os
+import sqlite3
+
+from conftest import BACKEND_DIR
+
+MIGRATIONS_DIR = os.path.join(BACKEND_DIR, "migrations")
+
+
+def job_application_indexes(path):
+    with sqlite3.connect(path) as conn:
+        return {name for (name,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'job_applications'")}
+
+
+def test_upgrade_and_downgrade_round_trip(tmp_path):
+    from flask_migrate import Migrate, downgrade, upgrade
+
+    from app import create_app
+    from extensions import db
+
+    path = tmp_path / "migrations.db"
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"})
+    Migrate(app, db, directory=MIGRATIONS_DIR)
+    with app.app_context():
+        upgrade()
+        at_head = job_application_indexes(path)
+        assert "ix_job_applications_user_company" in at_head
+
+        downgrade(revision="89de989c8f17")
+        assert job_application_indexes(path) == at_head - {"ix_job_applications_search_vector"}
+
+        downgrade(revision="base")
+        assert job_application_indexes(path) == set()
+
+        upgrade()
+        assert job_application_indexes(path) == at_head
+        db.engine.dispose()
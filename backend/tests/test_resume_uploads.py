@@ -0,0 +1,152 @@
+"""Direct-to-S3 resume uploads against moto's in-process S3."""
+import io
+
+import pytest
+import requests
+
+BUCKET = "careervault-test"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    from moto import mock_aws
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        import boto3
+
+        client = boto3.client("s3")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+@pytest.fixture
+def app(s3, make_app, monkeypatch):
+    import app as app_module
+
+    app = make_app(AWS_ACCESS_KEY_ID="test", AWS_SECRET_ACCESS_KEY="test", AWS_S3_BUCKET=BUCKET,
+                   AWS_S3_ENDPOINT_URL=None)
+    # Indexing reads the PDF back in a background thread; record what was queued instead.
+    app.indexed = []
+    monkeypatch.setattr(app_module.resume_indexer, "submit", lambda flask_app, resume_id: app.indexed.append(resume_id))
+    return app
+
+
+def headers(email):
+    return {"X-User-Email": email}
+
+
+ADA = headers("ada@example.com")
+GRACE = headers("grace@example.com")
+
+
+def pdf_bytes(size):
+    body = b"%PDF-1.4\n"
+    return body + b"0" * (size - len(body))
+
+
+def start(client, size, filename="cv.pdf", user=ADA):
+    return client.post("/api/resumes/uploads", json={"filename": filename, "size": size}, headers=user)
+
+
+def test_small_file_posts_to_s3_and_completes_once(app, s3):
+    client = app.test_client()
+    body = pdf_bytes(4096)
+    response = start(client, len(body))
+    assert response.status_code == 201
+    upload = response.get_json()
+    assert upload["method"] == "POST"
+
+    sent = requests.post(upload["url"], data=upload["fields"], files={"file": ("cv.pdf", io.BytesIO(body))})
+    assert sent.status_code in (200, 204)
+    assert s3.get_object(Bucket=BUCKET, Key=upload["key"])["Body"].read() == body
+
+    first = client.post("/api/resumes/uploads/complete", json={"upload_token": upload["upload_token"]}, headers=ADA)
+    again = client.post("/api/resumes/uploads/complete", json={"upload_token": upload["upload_token"]}, headers=ADA)
+    assert first.status_code == again.status_code == 201
+    assert first.get_json()["resume"]["id"] == again.get_json()["resume"]["id"]
+    assert len(app.indexed) == 1
+
+    listed = client.get("/api/resumes", headers=ADA).get_json()
+    assert [r["filename"] for r in listed] == ["cv.pdf"]
+
+
+def test_large_file_uses_multipart(app, s3, monkeypatch):
+    import resume_uploads
+
+    monkeypatch.setattr(resume_uploads, "RESUME_MULTIPART_THRESHOLD", 1024 * 1024)
+    client = app.test_client()
+    body = pdf_bytes(resume_uploads.RESUME_PART_SIZE + 1024 * 1024)
+    upload = start(client, len(body)).get_json()
+    assert upload["method"] == "multipart"
+    assert [p["part_number"] for p in upload["parts"]] == [1, 2]
+
+    parts = []
+    for part in upload["parts"]:
+        offset = (part["part_number"] - 1) * upload["part_size"]
+        sent = requests.put(part["url"], data=body[offset:offset + upload["part_size"]])
+        assert sent.status_code == 200
+        parts.append({"part_number": part["part_number"], "etag": sent.headers["ETag"]})
+
+    missing = client.post("/api/resumes/uploads/complete", json={"upload_token": upload["upload_token"]},
+                          headers=ADA)
+    assert missing.status_code == 400
+
+    done = client.post("/api/resumes/uploads/complete",
+                       json={"upload_token": upload["upload_token"], "parts": parts[::-1]}, headers=ADA)
+    assert done.status_code == 201
+    assert s3.head_object(Bucket=BUCKET, Key=upload["key"])["ContentLength"] == len(body)
+
+
+def test_complete_before_upload_is_refused(app):
+    client = app.test_client()
+    upload = start(client, 4096).get_json()
+    response = client.post("/api/resumes/uploads/complete", json={"upload_token": upload["upload_token"]},
+                           headers=ADA)
+    assert response.status_code == 400
+    assert client.get("/api/resumes", headers=ADA).get_json() == []
+
+
+def test_upload_token_is_bound_to_its_user(app):
+    client = app.test_client()
+    upload = start(client, 4096).get_json()
+    requests.post(upload["url"], data=upload["fields"], files={"file": ("cv.pdf", io.BytesIO(pdf_bytes(4096)))})
+
+    response = client.post("/api/resumes/uploads/complete", json={"upload_token": upload["upload_token"]},
+                           headers=GRACE)
+    assert response.status_code == 400
+    forged = client.post("/api/resumes/uploads/complete", json={"upload_token": upload["upload_token"] + "x"},
+                         headers=ADA)
+    assert forged.status_code == 400
+
+
+@pytest.mark.parametrize("filename, size", [
+    ("cv.docx", 4096),
+    ("cv.pdf", 0),
+    ("cv.pdf", "lots"),
+    ("cv.pdf", 10 ** 9),
+])
+def test_start_validates_file(app, filename, size):
+    assert start(app.test_client(), size, filename).status_code == 400
+
+
+def test_abort_drops_unfinished_multipart_upload(app, s3, monkeypatch):
+    import resume_uploads
+
+    monkeypatch.setattr(resume_uploads, "RESUME_MULTIPART_THRESHOLD", 1024)
+    client = app.test_client()
+    upload = start(client, 4096).get_json()
+    assert s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads")
+
+    response = client.delete("/api/resumes/uploads", json={"upload_token": upload["upload_token"]}, headers=ADA)
+    assert response.status_code == 200
+    assert not s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads")
+
+
+def test_requires_a_known_user(app):
+    client = app.test_client()
+    payload = {"filename": "cv.pdf", "size": 10}
+    assert client.post("/api/resumes/uploads", json=payload).status_code == 400
+    assert client.post("/api/resumes/uploads", json=payload, headers=headers("nobody@example.com")).status_code == 401
@@ -0,0 +1,155 @@
+from datetime import datetime
+
+from sqlalchemy import case, func
+
+from extensions import db
+from models import ApplicationEvent, JobApplication
+from pagination import keyset_page
+
+
+SECONDS_PER_DAY = 86400
+# Summary stages come in funnel order; any other status follows, by name.
+STAGE_ORDER = ("Applied", "Interview", "Offer", "Rejected")
+
+
+def record_status_changes(user_id, changes):
+    """Append an event for each (application_id, from_status, to_status, occurred_at) that changes status.
+
+    from_status is None for a new application and to_status None for a
+    deleted one; occurred_at None means now. Runs inside the caller's
+    transaction, like the rollup updates, so history commits with the row.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {"user_id": user_id, "application_id": app_id, "from_status": old, "to_status": new,
+         "occurred_at": occurred_at or now}
+        for app_id, old, new, occurred_at in changes if old != new
+    ]
+    if rows:
+        db.session.execute(ApplicationEvent.__table__.insert(), rows)
+
+
+def _seconds_between(start, end):
+    if db.engine.dialect.name == "postgresql":
+        return func.extract("epoch", end - start)
+    return (func.julianday(end) - func.julianday(start)) * SECONDS_PER_DAY
+
+
+def _stages(*criteria):
+    """Matching events, each with when its stage ended and the status that followed.
+
+    Both come from LEAD() over the application's events in time order, so
+    the database pairs consecutive events in a single ordered pass. A stage
+    that hasn't ended has a NULL left_at.
+    """
+    window = {"partition_by": ApplicationEvent.application_id,
+              "order_by": (ApplicationEvent.occurred_at, ApplicationEvent.id)}
+    return db.session.query(
+        ApplicationEvent.id,
+        ApplicationEvent.user_id,
+        ApplicationEvent.application_id,
+        ApplicationEvent.from_status,
+        ApplicationEvent.to_status,
+        ApplicationEvent.occurred_at,
+        func.lead(ApplicationEvent.occurred_at).over(**window).label("left_at"),
+        func.lead(ApplicationEvent.to_status).over(**window).label("next_status"),
+    ).filter(*criteria).subquery()
+
+
+def serialize_event(row):
+    return {
+        "id": row.id,
+        "application_id": row.application_id,
+        "from_status": row.from_status,
+        "to_status": row.to_status,
+        "occurred_at": row.occurred_at.isoformat() + "Z",
+    }
+
+
+def timeline_page(user_id, statuses, cursor, limit):
+    """The user's events, newest first, keyset paged on (occurred_at, id).
+
+    Each event carries the application's title and company, or None if it
+    has since been deleted. Returns (events, next_cursor).
+    """
+    query = db.session.query(
+        ApplicationEvent.id, ApplicationEvent.application_id, ApplicationEvent.from_status,
+        ApplicationEvent.to_status, ApplicationEvent.occurred_at, JobApplication.title, JobApplication.company_name,
+    ).outerjoin(JobApplication, JobApplication.id == ApplicationEvent.application_id).filter(
+        ApplicationEvent.user_id == user_id,
+    )
+    if statuses:
+        query = query.filter(ApplicationEvent.to_status.in_(statuses))
+    rows, next_cursor = keyset_page(
+        query, ApplicationEvent.occurred_at, ApplicationEvent.id, "-occurred_at", True, cursor, limit,
+    )
+    events = [dict(serialize_event(row), title=row.title, company=row.company_name) for row in rows]
+    return events, next_cursor
+
+
+def application_timeline(application_id):
+    """(owner user_id, events oldest first with seconds spent in each stage); owner is None without history."""
+    stages = _stages(ApplicationEvent.application_id == application_id)
+    rows = db.session.query(stages, _seconds_between(stages.c.occurred_at, stages.c.left_at).label("seconds")) \
+        .order_by(stages.c.occurred_at, stages.c.id).all()
+    if not rows:
+        return None, []
+    events = [
+        dict(serialize_event(row), duration_seconds=round(float(row.seconds)) if row.seconds is not None else None)
+        for row in rows
+    ]
+    return rows[0].user_id, events
+
+
+def timeline_summary(user_id):
+    """Per-stage counts and durations plus time to first response, aggregated in one query.
+
+    A stage's duration runs from entering a status to the next event on the
+    same application; stages still open are counted under "current" and left
+    out of the averages. Time to response runs from creation in "Applied" to
+    the first change other than deletion.
+    """
+    stages = _stages(ApplicationEvent.user_id == user_id)
+    seconds = _seconds_between(stages.c.occurred_at, stages.c.left_at)
+    first_response = (stages.c.from_status.is_(None)) & (stages.c.next_status.isnot(None))
+    rows = db.session.query(
+        stages.c.to_status,
+        func.count().label("entered"),
+        func.count(stages.c.application_id.distinct()).label("applications"),
+        func.count(case((stages.c.left_at.is_(None), 1))).label("current"),
+        func.avg(seconds).label("avg_seconds"),
+        func.max(seconds).label("max_seconds"),
+        func.count(case((first_response, 1))).label("responded"),
+        func.avg(case((first_response, seconds))).label("response_seconds"),
+        func.min(stages.c.occurred_at).label("first_at"),
+        func.max(stages.c.occurred_at).label("last_at"),
+    ).group_by(stages.c.to_status).all()
+
+    def days(value):
+        return round(float(value) / SECONDS_PER_DAY, 2) if value is not None else None
+
+    def order(row):
+        status = row.to_status or ""
+        return (STAGE_ORDER.index(status) if status in STAGE_ORDER else len(STAGE_ORDER), status)
+
+    result = {"events": 0, "first_event_at": None, "last_event_at": None, "stages": [],
+              "deleted": 0, "time_to_response": {"responded": 0, "avg_days": None}}
+    for row in sorted(rows, key=order):
+        result["events"] += row.entered
+        if row.to_status is None:
+            result["deleted"] = row.applications
+        else:
+            result["stages"].append({
+                "status": row.to_status,
+                "entered": row.entered,
+                "applications": row.applications,
+                "current": row.current,
+                "avg_days": days(row.avg_seconds),
+                "max_days": days(row.max_seconds),
+            })
+        if row.to_status == "Applied":
+            result["time_to_response"] = {"responded": row.responded, "avg_days": days(row.response_seconds)}
+    if rows:
+        result["first_event_at"] = min(r.first_at for r in rows).isoformat() + "Z"
+        result["last_event_at"] = max(r.last_at for r in rows).isoformat() + "Z"
+    return result
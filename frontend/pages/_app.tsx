@@ -1,10 +1,88 @@
 import "@/styles/globals.css";
 import {SessionProvider, useSession} from "next-auth/react";
 import type {AppProps} from "next/app";
+import {useEffect} from "react";
+import axios, {AxiosError, InternalAxiosRequestConfig} from "axios";
 import Navbar from "@/pages/components/Navbar";
 
+const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL || "http://localhost:5000";
+// Ask for a new session token when the stored one has less than a day left.
+const REFRESH_MARGIN_MS = 24 * 60 * 60 * 1000;
+
+function storeSessionToken(token: string, expiresIn: number) {
+    localStorage.setItem("sessionToken", token);
+    localStorage.setItem("sessionTokenExpiresAt", String(Date.now() + expiresIn * 1000));
+    axios.defaults.headers.common["Authorization"] = `Bearer ${token}`;
+}
+
+function clearSessionToken() {
+    localStorage.removeItem("sessionToken");
+    localStorage.removeItem("sessionTokenExpiresAt");
+    delete axios.defaults.headers.common["Authorization"];
+}
+
+// The Google ID token of the signed-in session, the only thing besides a
+// still-valid session token that the backend renews a session token for.
+let googleIdToken: string | undefined;
+
+async function renewSessionToken(useGoogle: boolean): Promise<string> {
+    const res = await axios.post(`${API_BASE_URL}/api/session-token`, useGoogle ? {token: googleIdToken} : {});
+    storeSessionToken(res.data.session_token, res.data.expires_in);
+    return res.data.session_token;
+}
+
+// A rejected token (expired, or the backend's key was rotated) is dropped,
+// replaced through the Google ID token when possible, and the request retried
+// once; without a new token the retry goes out identified by X-User-Email.
+if (typeof window !== "undefined") {
+    axios.interceptors.response.use(undefined, async (error: AxiosError) => {
+        const config = error.config as (InternalAxiosRequestConfig & { _retriedAfter401?: boolean }) | undefined;
+        if (error.response?.status === 401 && config && !config._retriedAfter401
+            && config.headers?.get("Authorization") && !config.url?.endsWith("/api/session-token")) {
+            clearSessionToken();
+            config._retriedAfter401 = true;
+            config.headers.delete("Authorization");
+            if (googleIdToken) {
+                try {
+                    config.headers.set("Authorization", `Bearer ${await renewSessionToken(true)}`);
+                } catch (err) {
+                    console.error("Could not renew session token", err);
+                }
+            }
+            return axios(config);
+        }
+        return Promise.reject(error);
+    });
+}
+
 function LayoutWithAuth({children}: { children: React.ReactNode }) {
-    const {status} = useSession();
+    const {status, data: session} = useSession();
+
+    // Send the backend session token on every API call, and renew it
+    // before it expires (the NextAuth session outlives it): with the token
+    // itself while it is valid, else with the Google ID token.
+    useEffect(() => {
+        if (status === "authenticated") {
+            googleIdToken = session?.idToken;
+            const token = localStorage.getItem("sessionToken");
+            const expiresAt = Number(localStorage.getItem("sessionTokenExpiresAt") || 0);
+            if (token) {
+                axios.defaults.headers.common["Authorization"] = `Bearer ${token}`;
+            }
+            if (!token || expiresAt - Date.now() < REFRESH_MARGIN_MS) {
+                const renewal = token && expiresAt > Date.now()
+                    ? renewSessionToken(false).catch(() => renewSessionToken(true))
+                    : renewSessionToken(true);
+                renewal.catch((err) => {
+                    clearSessionToken();
+                    console.error("Could not refresh session token", err);
+                });
+            }
+        } else if (status === "unauthenticated") {
+            googleIdToken = undefined;
+            clearSessionToken();
+        }
+    }, [status, session?.idToken]);
 
     return (
         <>
@@ -10,6 +10,9 @@ interface Resume {
     uploaded_at: string;
 }
 
+// How many times a parse is restarted after its task is lost (404).
+const MAX_PARSE_RESUBMITS = 2;
+
 export default function AddJobPage() {
     const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL || 'http://localhost:5000';
     const {status, data: session} = useSession();
@@ -76,19 +79,27 @@ export default function AddJobPage() {
         setSubmitting(true);
         setError(null);
         try {
-            await axios.post(
+            const headers = {"X-User-Email": session?.user?.email || ""};
+            const res = await axios.post(
                 `${API_BASE_URL}/api/applications`,
                 {
                     ...formData,
                     company_name: formData.company,
                     resume_used: formData.resume_used || null,
                 },
-                {
-                    headers: {
-                        "X-User-Email": session?.user?.email || "",
-                    },
-                } as AxiosRequestConfig
+                {headers} as AxiosRequestConfig
             );
+
+            const duplicates: { title: string; company: string; applied_at: string }[] =
+                res.data.possible_duplicates || [];
+            if (duplicates.length > 0) {
+                const list = duplicates
+                    .map((d) => `- ${d.title} at ${d.company} (added ${new Date(d.applied_at).toLocaleDateString()})`)
+                    .join("\n");
+                if (!confirm(`This looks like a job you already added:\n${list}\n\nKeep the new one anyway?`)) {
+                    await axios.delete(`${API_BASE_URL}/api/applications/${res.data.id}`, {headers} as AxiosRequestConfig);
+                }
+            }
             router.push("/");
         } catch (err) {
             console.error(err);
@@ -103,11 +114,35 @@ export default function AddJobPage() {
         setParsing(true);
         setError(null);
         try {
-            const res = await axios.post(`${API_BASE_URL}/api/parse-url`, {url});
+            const headers = {"X-User-Email": session?.user?.email || ""};
+            const submit = async () =>
+                (await axios.post(`${API_BASE_URL}/api/parse-url`, {url}, {headers} as AxiosRequestConfig)).data;
+            let task = await submit();
+            let resubmits = 0;
+            while (task.status !== "done" && task.status !== "failed") {
+                await new Promise((resolve) => setTimeout(resolve, 1000));
+                try {
+                    task = (await axios.get(`${API_BASE_URL}/api/parse-url/${task.task_id}`,
+                        {headers} as AxiosRequestConfig)).data;
+                } catch (err) {
+                    // Tasks live in the server process that accepted them; if it
+                    // restarted (or the poll reached another one), start again.
+                    // A parse that finished meanwhile is answered from the cache.
+                    if (axios.isAxiosError(err) && err.response?.status === 404 && resubmits < MAX_PARSE_RESUBMITS) {
+                        resubmits += 1;
+                        task = await submit();
+                    } else {
+                        throw err;
+                    }
+                }
+            }
+            if (task.status === "failed") {
+                throw new Error(task.error);
+            }
             setFormData({
                 ...formData,
-                ...res.data,
-                company: res.data.company || "",
+                ...task.result,
+                company: task.result.company || "",
                 application_url: url,
                 status: "Applied",
             });
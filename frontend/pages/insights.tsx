@@ -14,17 +14,17 @@ import {
     ResponsiveContainer,
 } from "recharts";
 
-interface Application {
-    id: string;
-    job_type: string;
-    status: string;
+interface Insights {
+    total: number;
+    by_status: Record<string, number>;
+    by_job_type: Record<string, number>;
 }
 
 export default function InsightsPage() {
     const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL || 'http://localhost:5000';
     const {status, data: session} = useSession();
     const router = useRouter();
-    const [applications, setApplications] = useState<Application[]>([]);
+    const [insights, setInsights] = useState<Insights>({total: 0, by_status: {}, by_job_type: {}});
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
@@ -33,16 +33,16 @@ export default function InsightsPage() {
         }
     }, [status, router]);
 
-    const fetchApplications = useCallback(async () => {
+    const fetchInsights = useCallback(async () => {
         try {
-            const res = await axios.get(`${API_BASE_URL}/api/applications`, {
+            const res = await axios.get(`${API_BASE_URL}/api/insights`, {
                 headers: {
                     "X-User-Email": session?.user?.email || "",
                 },
             } as AxiosRequestConfig);
-            setApplications(res.data);
+            setInsights(res.data);
         } catch (err) {
-            console.error("Failed to fetch applications", err);
+            console.error("Failed to fetch insights", err);
         } finally {
             setLoading(false);
         }
@@ -50,19 +50,12 @@ export default function InsightsPage() {
 
     useEffect(() => {
         if (status === "authenticated" && session?.user?.email) {
-            fetchApplications();
+            fetchInsights();
         }
-    }, [status, session, fetchApplications]);
+    }, [status, session, fetchInsights]);
 
-    const statusCounts = applications.reduce<Record<string, number>>((acc, app) => {
-        acc[app.status] = (acc[app.status] || 0) + 1;
-        return acc;
-    }, {});
-
-    const jobTypeCounts = applications.reduce<Record<string, number>>((acc, app) => {
-        acc[app.job_type || "Unknown"] = (acc[app.job_type || "Unknown"] || 0) + 1;
-        return acc;
-    }, {});
+    const statusCounts = insights.by_status;
+    const jobTypeCounts = insights.by_job_type;
 
     const pieData = Object.entries(statusCounts).map(([status, count]) => ({
         name: status,
@@ -123,7 +116,7 @@ export default function InsightsPage() {
 
                 {/* Summary Stats */}
                 <div className="mt-10 grid grid-cols-2 sm:grid-cols-4 gap-6 text-center">
-                    <Stat label="Total" value={applications.length}/>
+                    <Stat label="Total" value={insights.total}/>
                     <Stat label="Applied" value={statusCounts["Applied"] || 0}/>
                     <Stat label="Interview" value={statusCounts["Interview"] || 0}/>
                     <Stat label="Offer" value={statusCounts["Offer"] || 0}/>
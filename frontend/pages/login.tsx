@@ -21,9 +21,15 @@ export default function LoginPage() {
                     console.log("Sending token to backend:", session.idToken);
 
                     // Call backend to verify and create user
-                    await axios.post(`${API_BASE_URL}/api/verify-google-token`, {
+                    const res = await axios.post(`${API_BASE_URL}/api/verify-google-token`, {
                         token: session.idToken,
                     });
+                    if (res.data.session_token) {
+                        localStorage.setItem("sessionToken", res.data.session_token);
+                        localStorage.setItem("sessionTokenExpiresAt",
+                            String(Date.now() + res.data.expires_in * 1000));
+                        axios.defaults.headers.common["Authorization"] = `Bearer ${res.data.session_token}`;
+                    }
 
                     router.push('/applicationspage'); // Redirect after login
                 } catch (err) {
@@ -12,37 +12,26 @@ interface Resume {
     uploaded_at: string;
 }
 
+// The backend signs at most this many ids per call (MAX_SIGNED_URL_BATCH).
+const SIGNED_URL_BATCH = 200;
+
 export default function ResumePage() {
     const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL || 'http://localhost:5000';
     const {status, data: session} = useSession();
     const router = useRouter();
 
     const [resumes, setResumes] = useState<Resume[]>([]);
+    const [signedUrls, setSignedUrls] = useState<Record<string, string>>({});
     const [uploading, setUploading] = useState(false);
     const [error, setError] = useState<string | null>(null);
 
     const fileInputRef = useRef<HTMLInputElement>(null);
 
-    function ResumeViewer({resume, session}: { resume: Resume; session: Session | null }) {
-        const [signedUrl, setSignedUrl] = useState<string | null>(null);
-
-        useEffect(() => {
-            const getSignedUrl = async () => {
-                try {
-                    const res = await axios.get(`${API_BASE_URL}/api/resumes/${resume.id}/signed-url`, {
-                        headers: {
-                            "X-User-Email": session?.user?.email || "",
-                        },
-                    } as AxiosRequestConfig);
-                    setSignedUrl(res.data.signed_url);
-                } catch (err) {
-                    console.error("Failed to get signed URL", err);
-                }
-            };
-
-            getSignedUrl();
-        }, [resume.id, session?.user?.email]);
-
+    function ResumeViewer({resume, session, signedUrl}: {
+        resume: Resume;
+        session: Session | null;
+        signedUrl: string | null
+    }) {
 
         const handleDelete = async (resumeId: string) => {
             if (!confirm("Are you sure you want to delete this resume?")) return;
@@ -93,6 +82,18 @@ export default function ResumePage() {
                 headers: {"X-User-Email": session?.user?.email || ""},
             } as AxiosRequestConfig);
             setResumes(res.data);
+
+            // Sign every preview URL on the page, SIGNED_URL_BATCH ids per request.
+            const ids: string[] = res.data.map((r: Resume) => r.id);
+            const batches = [];
+            for (let i = 0; i < ids.length; i += SIGNED_URL_BATCH) {
+                batches.push(axios.get(`${API_BASE_URL}/api/resumes/signed-urls`, {
+                    headers: {"X-User-Email": session?.user?.email || ""},
+                    params: {ids: ids.slice(i, i + SIGNED_URL_BATCH).join(",")},
+                } as AxiosRequestConfig));
+            }
+            const signed = await Promise.all(batches);
+            setSignedUrls(Object.assign({}, ...signed.map((urls) => urls.data.signed_urls)));
         } catch (err) {
             console.error(err);
             setError("Failed to load resumes.");
@@ -113,18 +114,24 @@ export default function ResumePage() {
             return;
         }
 
-        const formData = new FormData();
-        formData.append("file", file);
-
         setUploading(true);
         setError(null);
 
         try {
-            await axios.post(`${API_BASE_URL}/api/resumes`, formData, {
-                headers: {
-                    "X-User-Email": session?.user?.email || "",
-                },
-            } as AxiosRequestConfig);
+            try {
+                await uploadDirect(file);
+            } catch (err) {
+                // Direct uploads need S3 CORS and FLASK_SECRET_KEY; fall back to
+                // sending the file through the backend.
+                console.warn("Direct upload failed, falling back", err);
+                const formData = new FormData();
+                formData.append("file", file);
+                await axios.post(`${API_BASE_URL}/api/resumes`, formData, {
+                    headers: {
+                        "X-User-Email": session?.user?.email || "",
+                    },
+                } as AxiosRequestConfig);
+            }
             fetchResumes();
         } catch (err) {
             console.error(err);
@@ -134,6 +141,49 @@ export default function ResumePage() {
         }
     };
 
+    // Upload straight to S3 with presigned requests, then record the resume.
+    // Uses fetch so the app's Authorization header isn't sent to S3.
+    const uploadDirect = async (file: File) => {
+        const headers = {"X-User-Email": session?.user?.email || ""};
+        const {data: upload} = await axios.post(`${API_BASE_URL}/api/resumes/uploads`, {
+            filename: file.name,
+            size: file.size,
+        }, {headers} as AxiosRequestConfig);
+
+        try {
+            let parts: { part_number: number; etag: string | null }[] | undefined;
+            if (upload.method === "POST") {
+                const form = new FormData();
+                Object.entries(upload.fields as Record<string, string>).forEach(([k, v]) => form.append(k, v));
+                form.append("file", file);
+                const res = await fetch(upload.url, {method: "POST", body: form});
+                if (!res.ok) throw new Error(`S3 upload failed: ${res.status}`);
+            } else {
+                parts = [];
+                for (const part of upload.parts as { part_number: number; url: string }[]) {
+                    const start = (part.part_number - 1) * upload.part_size;
+                    const res = await fetch(part.url, {
+                        method: "PUT",
+                        body: file.slice(start, start + upload.part_size),
+                    });
+                    if (!res.ok) throw new Error(`S3 part upload failed: ${res.status}`);
+                    parts.push({part_number: part.part_number, etag: res.headers.get("ETag")});
+                }
+            }
+
+            await axios.post(`${API_BASE_URL}/api/resumes/uploads/complete`, {
+                upload_token: upload.upload_token,
+                parts,
+            }, {headers} as AxiosRequestConfig);
+        } catch (err) {
+            axios.delete(`${API_BASE_URL}/api/resumes/uploads`, {
+                headers,
+                data: {upload_token: upload.upload_token},
+            } as AxiosRequestConfig).catch(() => undefined);
+            throw err;
+        }
+    };
+
     if (status === "loading") return <div className="p-4 text-center">Loading...</div>;
 
     return (
@@ -175,7 +225,8 @@ export default function ResumePage() {
                                     })}
                                     </p>
                                 </div>
-                                <ResumeViewer resume={resume} session={session}/>
+                                <ResumeViewer resume={resume} session={session}
+                                              signedUrl={signedUrls[resume.id] || null}/>
                             </div>
                         ))}
                     </div>